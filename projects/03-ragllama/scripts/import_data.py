@@ -1,8 +1,11 @@
 """Import CSV data to PostgreSQL database"""
 
+import argparse
 import csv
+import io
 import json
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -11,6 +14,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.database.connection import get_engine, Base
 from src.database.models import Company, TalentProfile, ExpTag, CompanyExternalData
+from sqlalchemy import text
 from sqlalchemy.orm import sessionmaker
 
 def parse_datetime(date_str):
@@ -122,8 +126,222 @@ def import_company_external_data(db):
         db.commit()
         print(f"  Completed: {count} external data records imported\n")
 
+# ---------------------------------------------------------------------------
+# Bulk import (COPY + staging table upsert)
+# ---------------------------------------------------------------------------
+
+class CsvCopyStream(io.TextIOBase):
+    """File-like object that streams transformed rows to COPY FROM STDIN
+
+    Rows are serialized lazily in read(), so the whole CSV is never held in
+    memory and no ORM objects are created.
+    """
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._out = io.StringIO()
+        self._writer = csv.writer(self._out, lineterminator='\n')
+        self._buffer = ''
+        self.count = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            try:
+                row = next(self._rows)
+            except StopIteration:
+                break
+            self._writer.writerow(row)
+            self.count += 1
+            if self._out.tell() >= 64 * 1024:
+                self._buffer += self._out.getvalue()
+                self._out.seek(0)
+                self._out.truncate()
+        self._buffer += self._out.getvalue()
+        self._out.seek(0)
+        self._out.truncate()
+
+        if size < 0:
+            chunk, self._buffer = self._buffer, ''
+        else:
+            chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+
+def _iter_csv(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        yield from csv.DictReader(file)
+
+def _company_rows(path):
+    for row in _iter_csv(path):
+        yield (
+            int(row['id']) if row['id'] else None,
+            parse_datetime(row['created_at']),
+            parse_datetime(row['updated_at']),
+            row['name'] or '',
+            row['innoforest_company_code'] or None,
+            row['thevc_company_code'] or None,
+            row['note'] or None,
+            row['business_number'] or None,
+            row['business_category'] or None,
+        )
+
+def _talent_rows(path):
+    for row in _iter_csv(path):
+        yield (
+            row['name'] or '',
+            row['profile_url'] or None,
+            row['summary'] or None,
+            row['positions'] or None,
+        )
+
+def _exp_tag_rows(path):
+    for row in _iter_csv(path):
+        yield (
+            int(row['id']) if row['id'] else None,
+            parse_datetime(row['created_at']),
+            parse_datetime(row['updated_at']),
+            row['name'] or '',
+            row['note'] or None,
+        )
+
+def _external_data_rows(path):
+    for row in _iter_csv(path):
+        result_data = None
+        if row['result_data']:
+            try:
+                result_data = json.loads(row['result_data'])
+            except json.JSONDecodeError:
+                result_data = {"raw": row['result_data']}
+        yield (
+            int(row['id']) if row['id'] else None,
+            parse_datetime(row['created_at']),
+            parse_datetime(row['updated_at']),
+            json.dumps(result_data, ensure_ascii=False) if result_data is not None else None,
+            row['note'] or None,
+            int(row['company_id']) if row['company_id'] else None,
+            int(row['platform_id']) if row['platform_id'] else None,
+        )
+
+# table -> (csv path, row generator, columns, upsert key, columns matching NULL-key rows)
+BULK_SOURCES = [
+    (Company.__table__, 'data/structured/company_info.csv', _company_rows,
+     ['id', 'created_at', 'updated_at', 'name', 'innoforest_company_code',
+      'thevc_company_code', 'note', 'business_number', 'business_category'], 'id'),
+    (TalentProfile.__table__, 'data/structured/talent_profile.csv', _talent_rows,
+     ['name', 'profile_url', 'summary', 'positions'], 'profile_url', ('name', 'summary')),
+    (ExpTag.__table__, 'data/structured/exp_tag.csv', _exp_tag_rows,
+     ['id', 'created_at', 'updated_at', 'name', 'note'], 'id', None),
+    # After companies: rows reference companies.id
+    (CompanyExternalData.__table__, 'data/structured/company_external_data.csv', _external_data_rows,
+     ['id', 'created_at', 'updated_at', 'result_data', 'note', 'company_id', 'platform_id'], 'id', None),
+]
+
+def _upsert_from_stage(cursor, table, stage, columns, key, null_key_columns=None):
+    """Merge staging rows into the target table
+
+    Rows whose key is NULL cannot be matched on it: for 'id' the sequence
+    assigns one. Otherwise they are skipped when a NULL-key row with the same
+    ``null_key_columns`` already exists (all of them are inserted if None).
+    """
+    cols = ', '.join(columns)
+    updates = ', '.join(f"{c} = s.{c}" for c in columns if c != key)
+
+    if key == 'id':
+        excluded = ', '.join(f"{c} = EXCLUDED.{c}" for c in columns if c != key)
+        cursor.execute(
+            f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {stage} WHERE id IS NOT NULL "
+            f"ON CONFLICT (id) DO UPDATE SET {excluded}"
+        )
+        # COPY with explicit ids does not advance the serial sequence
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        )
+        # Rows without an id get one from the (now advanced) sequence
+        rest = ', '.join(c for c in columns if c != 'id')
+        cursor.execute(f"INSERT INTO {table} ({rest}) SELECT {rest} FROM {stage} WHERE id IS NULL")
+        return
+
+    # No unique constraint on the natural key: update matches, insert the rest
+    cursor.execute(
+        f"UPDATE {table} t SET {updates} FROM {stage} s WHERE t.{key} = s.{key}"
+    )
+    cursor.execute(
+        f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {stage} s "
+        f"WHERE s.{key} IS NOT NULL AND NOT EXISTS "
+        f"(SELECT 1 FROM {table} t WHERE t.{key} = s.{key})"
+    )
+    # NULL-key rows: skip ones imported before. Duplicates within the CSV are
+    # all kept, as in the ORM import (NOT EXISTS sees the table before this insert).
+    skip_existing = ''
+    if null_key_columns:
+        match = ' AND '.join(f"t.{c} IS NOT DISTINCT FROM s.{c}" for c in null_key_columns)
+        skip_existing = f" AND NOT EXISTS (SELECT 1 FROM {table} t WHERE t.{key} IS NULL AND {match})"
+    cursor.execute(
+        f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {stage} s "
+        f"WHERE s.{key} IS NULL{skip_existing}"
+    )
+
+def bulk_import(engine):
+    """Stream CSVs into PostgreSQL via COPY, upserting on re-import
+
+    Secondary indexes are dropped for the duration of the load and rebuilt
+    afterwards, which is much cheaper than maintaining them row by row.
+    """
+    tables = [source[0] for source in BULK_SOURCES]
+    indexes = [index for table in tables for index in table.indexes]
+
+    with engine.begin() as conn:
+        for index in indexes:
+            index.drop(conn, checkfirst=True)
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for table, path, row_factory, columns, key, null_key_columns in BULK_SOURCES:
+            print(f"Bulk importing {table.name}...")
+            start = time.perf_counter()
+            stage = f"_stage_{table.name}"
+            cols = ', '.join(columns)
+
+            cursor.execute(
+                f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS "
+                f"SELECT {cols} FROM {table.name} WITH NO DATA"
+            )
+            stream = CsvCopyStream(row_factory(path))
+            options = "FORMAT csv, FORCE_NOT_NULL (name)" if 'name' in columns else "FORMAT csv"
+            cursor.copy_expert(f"COPY {stage} ({cols}) FROM STDIN WITH ({options})", stream)
+            _upsert_from_stage(cursor, table.name, stage, columns, key, null_key_columns)
+            raw.commit()
+
+            elapsed = time.perf_counter() - start
+            rate = stream.count / elapsed if elapsed > 0 else 0.0
+            print(f"  Completed: {stream.count} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)\n")
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+        print("Rebuilding indexes...")
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            for index in indexes:
+                index.create(conn, checkfirst=True)
+        print(f"  Completed: {len(indexes)} indexes in {time.perf_counter() - start:.2f}s\n")
+
 def main():
     """Main import process"""
+    parser = argparse.ArgumentParser(description="Import CSV data to PostgreSQL")
+    parser.add_argument(
+        "--bulk", action="store_true",
+        help="COPY-based bulk import with upsert (all tables)"
+    )
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Database Import Process")
     print("=" * 60 + "\n")
@@ -136,9 +354,19 @@ def main():
         return
 
     print("Creating database tables...")
+    with engine.begin() as conn:
+        # Trigram indexes on talent_profiles need pg_trgm
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
     Base.metadata.create_all(bind=engine)
     print("Tables created successfully\n")
 
+    if args.bulk:
+        bulk_import(engine)
+        print("=" * 60)
+        print("Bulk import finished!")
+        print("=" * 60)
+        return
+
     # Create session
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     db = SessionLocal()
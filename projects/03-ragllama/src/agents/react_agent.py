@@ -43,6 +43,8 @@ from ..tools.web_search_tools import (
     search_startup_funding_news
 )
 
+from ..resources import registry
+
 load_dotenv()
 
 # 시스템 프롬프트 (최적화됨 - 토큰 절약)
@@ -183,15 +185,13 @@ class HeadhunterReactAgent:
         return state.values.get("messages", [])
 
 
-# 전역 인스턴스
-_react_agent_instance = None
-
 def get_react_agent() -> HeadhunterReactAgent:
-    """ReAct 에이전트 싱글톤 인스턴스 반환"""
-    global _react_agent_instance
-    if _react_agent_instance is None:
-        _react_agent_instance = HeadhunterReactAgent()
-    return _react_agent_instance
+    """ReAct 에이전트 싱글톤 인스턴스 반환
+
+    컴파일된 그래프는 모든 세션이 공유하고, 세션별 대화 상태는
+    체크포인터에 thread_id 단위로만 저장됩니다.
+    """
+    return registry.get_or_create("react_agent", HeadhunterReactAgent)
 
 
 # 간단한 사용 예시
@@ -1,7 +1,7 @@
 """SQLAlchemy Models - Real Data Schema"""
 
 from datetime import datetime
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 from .connection import Base
 
@@ -45,6 +45,14 @@ class TalentProfile(Base):
     summary = Column(Text)
     positions = Column(Text)
 
+    # pg_trgm GIN 인덱스 - TalentQuery의 ILIKE '%...%' 검색용
+    __table_args__ = (
+        Index('ix_talent_profiles_positions_trgm', 'positions',
+              postgresql_using='gin', postgresql_ops={'positions': 'gin_trgm_ops'}),
+        Index('ix_talent_profiles_summary_trgm', 'summary',
+              postgresql_using='gin', postgresql_ops={'summary': 'gin_trgm_ops'}),
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
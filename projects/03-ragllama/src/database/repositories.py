@@ -1,18 +1,156 @@
 """Data Access Layer - PostgreSQL Query Interface"""
 
+import functools
+import re
 from typing import List, Dict, Any, Optional
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func
+from sqlalchemy.orm import Session, joinedload, scoped_session
+from sqlalchemy import and_, or_, func, select, true
 from .models import Company, TalentProfile, ExpTag, CompanyExternalData
-from .connection import get_db_session, is_db_available
+from .connection import db_connection, is_db_available
+from ..resources import registry
+
+# 근무 형태 동의어 (summary/positions 텍스트 매칭용)
+WORK_TYPE_KEYWORDS = {
+    '원격': ['원격', '재택', '리모트', 'remote'],
+    '재택': ['재택', '원격', '리모트', 'remote'],
+    '하이브리드': ['하이브리드', 'hybrid'],
+    '상주': ['상주', '출근', 'onsite', 'on-site'],
+}
+
+class TalentQuery:
+    """Composable multi-criteria talent search compiled into one SQL query
+
+    Usage:
+        query = TalentQuery().skills("Python, AWS").location("서울").paginate(20)
+        result = repo.search_talents(query)
+    """
+
+    def __init__(self):
+        self._skills: List[str] = []
+        self._locations: List[str] = []
+        self._work_types: List[str] = []
+        self._industries: List[str] = []
+        self._keywords: List[str] = []
+        self.min_salary: Optional[int] = None
+        self.max_salary: Optional[int] = None
+        self.limit: int = 20
+        self.offset: int = 0
+
+    @staticmethod
+    def _split_terms(text: Optional[str]) -> List[str]:
+        """'Python, React / AWS' -> ['Python', 'React', 'AWS']"""
+        if not text:
+            return []
+        return [t.strip() for t in re.split(r'[,/|]', text) if t.strip()]
+
+    def skills(self, skills: Optional[str]) -> 'TalentQuery':
+        """All skills must appear in positions or summary"""
+        self._skills.extend(self._split_terms(skills))
+        return self
+
+    def location(self, location: Optional[str]) -> 'TalentQuery':
+        """Any of the given locations in summary or positions"""
+        self._locations.extend(self._split_terms(location))
+        return self
+
+    def work_type(self, work_type: Optional[str]) -> 'TalentQuery':
+        """Work type, expanded with WORK_TYPE_KEYWORDS synonyms"""
+        for term in self._split_terms(work_type):
+            self._work_types.extend(WORK_TYPE_KEYWORDS.get(term, [term]))
+        return self
+
+    def industry(self, industry: Optional[str]) -> 'TalentQuery':
+        """Any of the given industries in positions or summary"""
+        self._industries.extend(self._split_terms(industry))
+        return self
+
+    def keyword(self, keyword: Optional[str]) -> 'TalentQuery':
+        """Free-text keyword in name, summary or positions"""
+        self._keywords.extend(self._split_terms(keyword))
+        return self
+
+    def salary_range(self, min_salary: Optional[int] = None, max_salary: Optional[int] = None) -> 'TalentQuery':
+        """Salary range (만원). Recorded only - talent_profiles has no salary column"""
+        self.min_salary = min_salary
+        self.max_salary = max_salary
+        return self
+
+    def paginate(self, limit: int = 20, offset: int = 0) -> 'TalentQuery':
+        self.limit = max(1, limit)
+        self.offset = max(0, offset)
+        return self
+
+    @staticmethod
+    def _text_match(term: str, *columns):
+        # LIKE 와일드카드(%, _)는 사용자 입력에서 리터럴로 취급
+        escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        pattern = f'%{escaped}%'
+        return or_(*[column.ilike(pattern, escape='\\') for column in columns])
+
+    def build_filters(self) -> List[Any]:
+        """Return SQLAlchemy WHERE clauses (AND across criteria)"""
+        text_columns = (TalentProfile.positions, TalentProfile.summary)
+        filters = [self._text_match(skill, *text_columns) for skill in self._skills]
+
+        if self._locations:
+            filters.append(or_(*[self._text_match(loc, *text_columns) for loc in self._locations]))
+        if self._work_types:
+            filters.append(or_(*[self._text_match(wt, *text_columns) for wt in self._work_types]))
+        if self._industries:
+            filters.append(or_(*[self._text_match(ind, *text_columns) for ind in self._industries]))
+        for keyword in self._keywords:
+            filters.append(self._text_match(keyword, TalentProfile.name, *text_columns))
+
+        return filters
+
+    def describe(self) -> List[str]:
+        """Human-readable list of applied conditions"""
+        conditions = []
+        if self._skills:
+            conditions.append(f"스킬: {', '.join(self._skills)}")
+        if self._locations:
+            conditions.append(f"지역: {', '.join(self._locations)}")
+        if self.min_salary is not None or self.max_salary is not None:
+            conditions.append(f"급여: {self.min_salary or ''}~{self.max_salary or ''}만원 (DB 미보유 항목, 미적용)")
+        if self._work_types:
+            conditions.append(f"근무형태: {', '.join(dict.fromkeys(self._work_types))}")
+        if self._industries:
+            conditions.append(f"산업: {', '.join(self._industries)}")
+        if self._keywords:
+            conditions.append(f"키워드: {', '.join(self._keywords)}")
+        return conditions
+
+def _release_session(method):
+    """Remove the thread's scoped session once a query method returns
+
+    Otherwise each (Streamlit script) thread keeps its connection checked out,
+    idle in transaction, until the thread is garbage-collected.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.close()
+    return wrapper
 
 class TalentRepository:
     """Talent and company data repository"""
 
     def __init__(self):
-        self.db: Optional[Session] = get_db_session()
         self.is_available: bool = is_db_available()
-
+        # 엔진은 프로세스 전역, 세션은 스레드별 (Session은 스레드 안전하지 않음)
+        self._sessions: Optional[scoped_session] = (
+            scoped_session(db_connection.SessionLocal)
+            if self.is_available and db_connection.SessionLocal else None
+        )
+
+    @property
+    def db(self) -> Optional[Session]:
+        """현재 스레드의 DB 세션"""
+        return self._sessions() if self._sessions else None
+
+    @_release_session
     def get_all_talents(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
         """Get all talent profiles"""
         if not self.is_available or not self.db:
@@ -29,6 +167,7 @@ class TalentRepository:
             print(f"Error fetching talents: {e}")
             return []
 
+    @_release_session
     def get_talent_by_id(self, talent_id: int) -> Optional[Dict[str, Any]]:
         """Get talent by ID"""
         if not self.is_available or not self.db:
@@ -44,6 +183,7 @@ class TalentRepository:
             print(f"Error fetching talent: {e}")
             return None
 
+    @_release_session
     def search_talents_by_name(self, name: str) -> List[Dict[str, Any]]:
         """Search talents by name"""
         if not self.is_available or not self.db:
@@ -59,6 +199,7 @@ class TalentRepository:
             print(f"Error searching talents: {e}")
             return []
 
+    @_release_session
     def search_talents_by_position(self, position: str) -> List[Dict[str, Any]]:
         """Search talents by position"""
         if not self.is_available or not self.db:
@@ -74,6 +215,48 @@ class TalentRepository:
             print(f"Error searching talents: {e}")
             return []
 
+    @_release_session
+    def search_talents(self, query: TalentQuery, count_only: bool = False) -> Dict[str, Any]:
+        """Run a TalentQuery as a single SQL statement
+
+        The page and the total match count come back in one round trip
+        (COUNT(*) OVER ()). With count_only=True only the count is computed.
+
+        Returns:
+            {'total': int, 'candidates': [...], 'limit': int, 'offset': int}
+        """
+        result = {'total': 0, 'candidates': [], 'limit': query.limit, 'offset': query.offset}
+        if not self.is_available or not self.db:
+            return result
+
+        filters = query.build_filters()
+        try:
+            if count_only:
+                stmt = select(func.count(TalentProfile.id)).where(and_(true(), *filters))
+                result['total'] = self.db.execute(stmt).scalar() or 0
+                return result
+
+            total = func.count().over().label('total')
+            stmt = select(TalentProfile, total)\
+                .where(and_(true(), *filters))\
+                .order_by(TalentProfile.id)\
+                .limit(query.limit)\
+                .offset(query.offset)
+            rows = self.db.execute(stmt).all()
+
+            if rows:
+                result['total'] = rows[0].total
+            elif query.offset:
+                # 페이지가 비어 있어도 전체 건수는 알려준다
+                return {**self.search_talents(query, count_only=True), 'candidates': []}
+            result['candidates'] = [row.TalentProfile.to_dict() for row in rows]
+            return result
+        except Exception as e:
+            print(f"Error searching talents: {e}")
+            self.db.rollback()
+            return result
+
+    @_release_session
     def get_all_companies(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
         """Get all companies"""
         if not self.is_available or not self.db:
@@ -90,6 +273,7 @@ class TalentRepository:
             print(f"Error fetching companies: {e}")
             return []
 
+    @_release_session
     def get_company_by_id(self, company_id: int) -> Optional[Dict[str, Any]]:
         """Get company by ID with external data"""
         if not self.is_available or not self.db:
@@ -111,6 +295,7 @@ class TalentRepository:
             print(f"Error fetching company: {e}")
             return None
 
+    @_release_session
     def search_companies_by_name(self, name: str) -> List[Dict[str, Any]]:
         """Search companies by name"""
         if not self.is_available or not self.db:
@@ -126,6 +311,7 @@ class TalentRepository:
             print(f"Error searching companies: {e}")
             return []
 
+    @_release_session
     def search_companies_by_category(self, category: str) -> List[Dict[str, Any]]:
         """Search companies by business category"""
         if not self.is_available or not self.db:
@@ -141,6 +327,7 @@ class TalentRepository:
             print(f"Error searching companies: {e}")
             return []
 
+    @_release_session
     def get_all_exp_tags(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
         """Get all experience tags"""
         if not self.is_available or not self.db:
@@ -157,6 +344,7 @@ class TalentRepository:
             print(f"Error fetching exp tags: {e}")
             return []
 
+    @_release_session
     def search_exp_tags(self, keyword: str) -> List[Dict[str, Any]]:
         """Search experience tags by keyword"""
         if not self.is_available or not self.db:
@@ -172,6 +360,7 @@ class TalentRepository:
             print(f"Error searching exp tags: {e}")
             return []
 
+    @_release_session
     def get_statistics(self) -> Dict[str, Any]:
         """Get database statistics"""
         if not self.is_available or not self.db:
@@ -206,16 +395,10 @@ class TalentRepository:
             }
 
     def close(self):
-        """Close database session"""
-        if self.db:
-            self.db.close()
-
-# Global repository instance
-_repository_instance = None
+        """Close the current thread's database session"""
+        if self._sessions:
+            self._sessions.remove()
 
 def get_talent_repository() -> TalentRepository:
-    """Get global repository instance"""
-    global _repository_instance
-    if _repository_instance is None:
-        _repository_instance = TalentRepository()
-    return _repository_instance
\ No newline at end of file
+    """Get global repository instance (shared across sessions/threads)"""
+    return registry.get_or_create("talent_repository", TalentRepository)
\ No newline at end of file
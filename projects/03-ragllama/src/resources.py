@@ -0,0 +1,84 @@
+"""Process-wide shared resources
+
+Streamlit은 세션마다 스크립트를 다시 실행하고 여러 스레드에서 동시에
+실행하므로, 무거운 리소스(임베딩 모델, FAISS 인덱스, DB 엔진, 컴파일된
+LangGraph)는 이 레지스트리를 통해 프로세스당 한 번만 생성해서 공유합니다.
+세션별 상태는 에이전트 체크포인터(thread_id)에만 둡니다.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+_MISSING = object()
+
+class ResourceRegistry:
+    """Thread-safe, lazily initialized named singletons"""
+
+    def __init__(self):
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get_or_create(self, name: str, factory: Callable[[], Any]) -> Any:
+        """name에 해당하는 인스턴스 반환, 없으면 factory()로 한 번만 생성"""
+        instance = self._instances.get(name, _MISSING)
+        if instance is not _MISSING:
+            return instance
+
+        with self._lock:
+            lock = self._locks.setdefault(name, threading.Lock())
+
+        # 같은 리소스는 한 스레드만 생성하고, 다른 리소스는 병렬로 생성 가능
+        with lock:
+            instance = self._instances.get(name, _MISSING)
+            if instance is _MISSING:
+                instance = factory()
+                self._instances[name] = instance
+            return instance
+
+    def is_ready(self, name: str) -> bool:
+        return name in self._instances
+
+    def names(self) -> List[str]:
+        return list(self._instances)
+
+
+# 전역 레지스트리
+registry = ResourceRegistry()
+
+_warm_up_thread: Optional[threading.Thread] = None
+_warm_up_lock = threading.Lock()
+
+def _warm_up():
+    """임베더 -> 벡터 스토어 -> DB -> 에이전트 순서로 미리 로드"""
+    from .vector_store.embedder import get_embedder
+    from .vector_store.faiss_store import get_vector_store
+    from .database.repositories import get_talent_repository
+    from .agents.react_agent import get_react_agent
+
+    for name, loader in [
+        ("embedder", get_embedder),
+        ("vector_store", get_vector_store),
+        ("talent_repository", get_talent_repository),
+        ("react_agent", get_react_agent),
+    ]:
+        start = time.perf_counter()
+        try:
+            loader()
+            print(f"리소스 준비 완료: {name} ({time.perf_counter() - start:.2f}초)")
+        except Exception as e:
+            print(f"리소스 준비 실패: {name}: {e}")
+
+def warm_up(background: bool = True) -> Optional[threading.Thread]:
+    """공유 리소스 사전 로드 (프로세스당 한 번만 실행)"""
+    global _warm_up_thread
+    with _warm_up_lock:
+        if _warm_up_thread is not None:
+            return _warm_up_thread
+        _warm_up_thread = threading.Thread(target=_warm_up, name="resource-warm-up", daemon=True)
+        _warm_up_thread.start()
+
+    if not background:
+        _warm_up_thread.join()
+    return _warm_up_thread
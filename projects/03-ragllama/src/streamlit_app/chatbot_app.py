@@ -11,6 +11,7 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 sys.path.append(project_root)
 
 from src.agents.react_agent import get_react_agent
+from src.resources import warm_up
 from langchain_core.messages import HumanMessage, AIMessage
 from src.ui.pdf_parser import parse_pdf_jd, extract_company_name_with_details
 
@@ -134,10 +135,14 @@ if 'jd_text' not in st.session_state:
 if 'company_name' not in st.session_state:
     st.session_state.company_name = ""
 
-if 'agent' not in st.session_state:
+# 공유 리소스(임베더, 벡터 스토어, DB, 에이전트)는 프로세스당 한 번만 로드
+warm_up()
+
+# 에이전트는 모든 세션이 공유하고, 세션별 대화 상태는 thread_id로 체크포인터에만 저장
+if 'agent_ready' not in st.session_state:
     with st.spinner('AI 에이전트를 초기화하는 중...'):
         try:
-            st.session_state.agent = get_react_agent()
+            get_react_agent()
             st.session_state.agent_ready = True
         except Exception as e:
             st.session_state.agent_ready = False
@@ -227,69 +232,39 @@ with st.sidebar:
                                 # 회사 정보 수집 및 벡터화
                                 with st.spinner(f"🔍 {company_name} 회사 정보를 수집하고 벡터 DB에 저장하는 중..."):
                                     try:
-                                        from src.tools.web_search_tools import search_company_comprehensive_info
-                                        from src.vector_store.faiss_store import get_vector_store
-                                        
-                                        # 검색 키워드 정의
-                                        search_keywords = [
-                                            f"{company_name} 회사 역사",
-                                            f"{company_name} 회사 소개", 
-                                            f"{company_name} 채용 후기",
-                                            f"{company_name} 직원 인터뷰",
-                                            f"{company_name} 기술 스택",
-                                            f"{company_name} 개발 환경",
-                                            f"{company_name} 복리후생",
-                                            f"{company_name} 연봉",
-                                            f"{company_name} 뉴스",
-                                            f"{company_name} 보도자료"
-                                        ]
+                                        from src.tools.web_search_tools import company_search_keywords, iter_company_search_results
+                                        from src.vector_store.ingestion import get_ingestion_worker
                                         
                                         # 진행 상태 표시용 컨테이너
                                         progress_container = st.container()
-                                        
-                                        # 각 키워드별 검색 진행
-                                        all_search_results = []
-                                        total_count = 0
-                                        
-                                        for i, keyword in enumerate(search_keywords):
-                                            # 검색 중 상태 표시
+                                        with progress_container:
+                                            st.info(f"🟢 {company_name} 관련 키워드 {len(company_search_keywords(company_name))}개를 동시에 검색하는 중...")
+
+                                        # 키워드 검색은 병렬로 수행하고, 완료되는 순서대로 진행 상태 표시
+                                        results_by_keyword = {}
+                                        for keyword, formatted_results, error in iter_company_search_results(
+                                            company_name, max_results_per_keyword=30
+                                        ):
                                             with progress_container:
-                                                st.info(f"🟢 {keyword}을 검색하는 중...")
-                                            
-                                            try:
-                                                # 개별 키워드 검색
-                                                search_params = {
-                                                    "query": keyword,
-                                                    "max_results": 30,
-                                                    "search_depth": "advanced"
-                                                }
-                                                
-                                                from src.tools.web_search_tools import _tavily_search_and_format
-                                                search_result = _tavily_search_and_format(search_params)
-                                                formatted_results = search_result.get("results", [])
-                                                
-                                                if formatted_results:
-                                                    all_search_results.append({
-                                                        "keyword": keyword,
-                                                        "results": formatted_results
-                                                    })
-                                                    total_count += len(formatted_results)
-                                                
-                                                # 검색 완료 상태 표시
-                                                with progress_container:
+                                                if error is not None:
+                                                    st.error(f"❌ {keyword} 검색 실패: {str(error)}")
+                                                else:
                                                     st.success(f"🔵 {keyword} 검색 완료 ({len(formatted_results)}건)")
-                                                    
-                                            except Exception as e:
-                                                with progress_container:
-                                                    st.error(f"❌ {keyword} 검색 실패: {str(e)}")
-                                                continue
-                                        
+                                            if formatted_results:
+                                                results_by_keyword[keyword] = formatted_results
+
+                                        all_search_results = [
+                                            {"keyword": keyword, "results": results_by_keyword[keyword]}
+                                            for keyword in company_search_keywords(company_name)
+                                            if keyword in results_by_keyword
+                                        ]
+                                        total_count = sum(len(item["results"]) for item in all_search_results)
+
                                         if all_search_results:
-                                            # 벡터 스토어에 추가
-                                            vector_store = get_vector_store()
-                                            vector_store.add_company_info(company_name, all_search_results)
+                                            # 벡터 스토어 인덱싱은 백그라운드 워커에서 처리 (UI는 대기하지 않음)
+                                            get_ingestion_worker().submit(company_name, all_search_results)
                                             
-                                            st.success(f"📚 {company_name} 회사 정보 {total_count}건을 벡터 DB에 저장했습니다.")
+                                            st.success(f"📚 {company_name} 회사 정보 {total_count}건을 수집했습니다. 벡터 DB 저장은 백그라운드에서 진행됩니다.")
                                             
                                             # 수집된 회사 목록에 추가
                                             if not hasattr(st.session_state, 'collected_companies'):
@@ -416,69 +391,39 @@ with st.sidebar:
                             # 회사 정보 수집 및 벡터화
                             with st.spinner(f"🔍 {company_name} 회사 정보를 수집하고 벡터 DB에 저장하는 중..."):
                                 try:
-                                    from src.tools.web_search_tools import search_company_comprehensive_info
-                                    from src.vector_store.faiss_store import get_vector_store
-                                    
-                                    # 검색 키워드 정의
-                                    search_keywords = [
-                                        f"{company_name} 회사 역사",
-                                        f"{company_name} 회사 소개", 
-                                        f"{company_name} 채용 후기",
-                                        f"{company_name} 직원 인터뷰",
-                                        f"{company_name} 기술 스택",
-                                        f"{company_name} 개발 환경",
-                                        f"{company_name} 복리후생",
-                                        f"{company_name} 연봉",
-                                        f"{company_name} 뉴스",
-                                        f"{company_name} 보도자료"
-                                    ]
+                                    from src.tools.web_search_tools import company_search_keywords, iter_company_search_results
+                                    from src.vector_store.ingestion import get_ingestion_worker
                                     
                                     # 진행 상태 표시용 컨테이너
                                     progress_container = st.container()
-                                    
-                                    # 각 키워드별 검색 진행
-                                    all_search_results = []
-                                    total_count = 0
-                                    
-                                    for i, keyword in enumerate(search_keywords):
-                                        # 검색 중 상태 표시
+                                    with progress_container:
+                                        st.info(f"🟢 {company_name} 관련 키워드 {len(company_search_keywords(company_name))}개를 동시에 검색하는 중...")
+
+                                    # 키워드 검색은 병렬로 수행하고, 완료되는 순서대로 진행 상태 표시
+                                    results_by_keyword = {}
+                                    for keyword, formatted_results, error in iter_company_search_results(
+                                        company_name, max_results_per_keyword=30
+                                    ):
                                         with progress_container:
-                                            st.info(f"🟢 {keyword}을 검색하는 중...")
-                                        
-                                        try:
-                                            # 개별 키워드 검색
-                                            search_params = {
-                                                "query": keyword,
-                                                "max_results": 30,
-                                                "search_depth": "advanced"
-                                            }
-                                            
-                                            from src.tools.web_search_tools import _tavily_search_and_format
-                                            search_result = _tavily_search_and_format(search_params)
-                                            formatted_results = search_result.get("results", [])
-                                            
-                                            if formatted_results:
-                                                all_search_results.append({
-                                                    "keyword": keyword,
-                                                    "results": formatted_results
-                                                })
-                                                total_count += len(formatted_results)
-                                            
-                                            # 검색 완료 상태 표시
-                                            with progress_container:
+                                            if error is not None:
+                                                st.error(f"❌ {keyword} 검색 실패: {str(error)}")
+                                            else:
                                                 st.success(f"🔵 {keyword} 검색 완료 ({len(formatted_results)}건)")
-                                                
-                                        except Exception as e:
-                                            with progress_container:
-                                                st.error(f"❌ {keyword} 검색 실패: {str(e)}")
-                                            continue
-                                    
+                                        if formatted_results:
+                                            results_by_keyword[keyword] = formatted_results
+
+                                    all_search_results = [
+                                        {"keyword": keyword, "results": results_by_keyword[keyword]}
+                                        for keyword in company_search_keywords(company_name)
+                                        if keyword in results_by_keyword
+                                    ]
+                                    total_count = sum(len(item["results"]) for item in all_search_results)
+
                                     if all_search_results:
-                                        # 벡터 스토어에 추가
-                                        vector_store = get_vector_store()
-                                        vector_store.add_company_info(company_name, all_search_results)
+                                        # 벡터 스토어 인덱싱은 백그라운드 워커에서 처리 (UI는 대기하지 않음)
+                                        get_ingestion_worker().submit(company_name, all_search_results)
                                         
-                                        st.success(f"📚 {company_name} 회사 정보 {total_count}건을 벡터 DB에 저장했습니다.")
+                                        st.success(f"📚 {company_name} 회사 정보 {total_count}건을 수집했습니다. 벡터 DB 저장은 백그라운드에서 진행됩니다.")
                                         
                                         # 수집된 회사 목록에 추가
                                         if not hasattr(st.session_state, 'collected_companies'):
@@ -623,7 +568,7 @@ if prompt := st.chat_input("메시지를 입력하세요...", key="chat_input"):
         try:
             # 스트리밍 응답
             with st.spinner("생각 중..."):
-                for chunk in st.session_state.agent.stream(
+                for chunk in get_react_agent().stream(
                     prompt,
                     thread_id=st.session_state.thread_id
                 ):
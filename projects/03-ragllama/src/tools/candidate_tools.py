@@ -2,7 +2,7 @@
 
 from typing import List, Dict, Any, Optional
 from langchain_core.tools import tool
-from ..database.repositories import get_talent_repository
+from ..database.repositories import get_talent_repository, TalentQuery
 
 # 저장소 인스턴스
 talent_repo = get_talent_repository()
@@ -14,14 +14,13 @@ def search_candidates_by_skills(
 ) -> Dict[str, Any]:
     """기술 스킬로 후보자 검색 (예: Python, React, AWS)"""
     try:
-        # positions 필드에서 스킬 검색
-        talents = talent_repo.search_talents_by_position(skills)
+        result = talent_repo.search_talents(TalentQuery().skills(skills).paginate(limit))
 
         return {
             "success": True,
-            "count": len(talents),
-            "candidates": talents[:limit],
-            "message": f"'{skills}' 스킬을 가진 {len(talents)}명의 후보자를 찾았습니다."
+            "count": result["total"],
+            "candidates": result["candidates"],
+            "message": f"'{skills}' 스킬을 가진 {result['total']}명의 후보자를 찾았습니다."
         }
     except Exception as e:
         return {
@@ -37,14 +36,13 @@ def search_candidates_by_location(
 ) -> Dict[str, Any]:
     """지역으로 후보자 검색 (예: 서울, 강남, 부산)"""
     try:
-        # summary 필드에서 지역 정보 검색
-        talents = talent_repo.search_talents_by_name(location)  # 임시로 이름 검색 사용
+        result = talent_repo.search_talents(TalentQuery().location(location).paginate(limit))
 
         return {
             "success": True,
-            "count": len(talents),
-            "candidates": talents[:limit],
-            "message": f"'{location}' 지역의 {len(talents)}명의 후보자를 찾았습니다."
+            "count": result["total"],
+            "candidates": result["candidates"],
+            "message": f"'{location}' 지역의 {result['total']}명의 후보자를 찾았습니다."
         }
     except Exception as e:
         return {
@@ -61,18 +59,17 @@ def search_candidates_by_salary_range(
 ) -> Dict[str, Any]:
     """급여 범위로 후보자 검색 (만원 단위, 예: 5000~8000)"""
     try:
-        # 전체 인재 목록 가져오기 (실제로는 DB 쿼리 개선 필요)
-        talents = talent_repo.get_all_talents(limit=100)
-
-        # 급여 정보는 현재 DB에 없으므로 전체 반환
-        filtered_talents = talents[:limit]
+        # 급여 정보는 현재 DB에 없으므로 조건은 기록만 하고 적용하지 않음
+        result = talent_repo.search_talents(
+            TalentQuery().salary_range(min_salary, max_salary).paginate(limit)
+        )
 
         return {
             "success": True,
-            "count": len(filtered_talents),
-            "candidates": filtered_talents,
+            "count": result["total"],
+            "candidates": result["candidates"],
             "salary_range": f"{min_salary}~{max_salary}만원",
-            "message": f"{min_salary}~{max_salary}만원 범위의 {len(filtered_talents)}명의 후보자를 찾았습니다."
+            "message": f"{min_salary}~{max_salary}만원 범위의 {result['total']}명의 후보자를 찾았습니다. (급여 정보는 DB에 없어 필터가 적용되지 않았습니다)"
         }
     except Exception as e:
         return {
@@ -88,15 +85,14 @@ def search_candidates_by_work_type(
 ) -> Dict[str, Any]:
     """근무 형태로 후보자 검색 (예: 원격, 재택, 하이브리드)"""
     try:
-        # summary에서 근무 형태 정보 검색
-        talents = talent_repo.get_all_talents(limit=limit)
+        result = talent_repo.search_talents(TalentQuery().work_type(work_type).paginate(limit))
 
         return {
             "success": True,
-            "count": len(talents),
-            "candidates": talents,
+            "count": result["total"],
+            "candidates": result["candidates"],
             "work_type": work_type,
-            "message": f"'{work_type}' 근무 형태를 선호하는 {len(talents)}명의 후보자를 찾았습니다."
+            "message": f"'{work_type}' 근무 형태를 선호하는 {result['total']}명의 후보자를 찾았습니다."
         }
     except Exception as e:
         return {
@@ -112,14 +108,14 @@ def search_candidates_by_industry(
 ) -> Dict[str, Any]:
     """산업 분야로 후보자 검색 (예: Fintech, E-commerce, AI/ML)"""
     try:
-        talents = talent_repo.search_talents_by_position(industry)
+        result = talent_repo.search_talents(TalentQuery().industry(industry).paginate(limit))
 
         return {
             "success": True,
-            "count": len(talents),
-            "candidates": talents[:limit],
+            "count": result["total"],
+            "candidates": result["candidates"],
             "industry": industry,
-            "message": f"'{industry}' 산업 경험이 있는 {len(talents)}명의 후보자를 찾았습니다."
+            "message": f"'{industry}' 산업 경험이 있는 {result['total']}명의 후보자를 찾았습니다."
         }
     except Exception as e:
         return {
@@ -135,7 +131,9 @@ def search_candidates_by_availability(
 ) -> Dict[str, Any]:
     """입사 가능 시기로 후보자 검색 (예: 즉시, 1개월 이내)"""
     try:
-        talents = talent_repo.get_all_talents(limit=limit)
+        # 입사 가능 시기는 DB에 없으므로 전체 목록의 첫 페이지 반환
+        result = talent_repo.search_talents(TalentQuery().paginate(limit))
+        talents = result["candidates"]
 
         return {
             "success": True,
@@ -158,34 +156,37 @@ def complex_candidate_search(
     min_salary: Optional[int] = None,
     max_salary: Optional[int] = None,
     work_type: Optional[str] = None,
-    limit: int = 20
+    industry: Optional[str] = None,
+    keyword: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+    count_only: bool = False
 ) -> Dict[str, Any]:
-    """복합 조건으로 후보자 검색 (스킬, 지역, 급여, 근무형태 등 동시 적용)"""
+    """복합 조건으로 후보자 검색 (스킬, 지역, 급여, 근무형태, 산업, 키워드를 한 번에 적용).
+    여러 조건은 이 도구 한 번의 호출로 처리하세요. offset으로 다음 페이지, count_only=True로 인원수만 조회."""
     try:
-        # 조건 수집
-        conditions = []
-        if skills:
-            conditions.append(f"스킬: {skills}")
-        if location:
-            conditions.append(f"지역: {location}")
-        if min_salary and max_salary:
-            conditions.append(f"급여: {min_salary}~{max_salary}만원")
-        if work_type:
-            conditions.append(f"근무형태: {work_type}")
+        query = TalentQuery()\
+            .skills(skills)\
+            .location(location)\
+            .salary_range(min_salary, max_salary)\
+            .work_type(work_type)\
+            .industry(industry)\
+            .keyword(keyword)\
+            .paginate(limit, offset)
+        conditions = query.describe()
+        result = talent_repo.search_talents(query, count_only=count_only)
 
-        # 스킬 기반 검색 우선
-        if skills:
-            talents = talent_repo.search_talents_by_position(skills)
-        else:
-            talents = talent_repo.get_all_talents(limit=100)
-
-        return {
+        response = {
             "success": True,
-            "count": len(talents[:limit]),
-            "candidates": talents[:limit],
+            "count": result["total"],
             "search_conditions": conditions,
-            "message": f"{', '.join(conditions)} 조건으로 {len(talents[:limit])}명의 후보자를 찾았습니다."
+            "message": f"{', '.join(conditions) or '전체'} 조건으로 {result['total']}명의 후보자를 찾았습니다."
         }
+        if not count_only:
+            response["candidates"] = result["candidates"]
+            response["offset"] = offset
+            response["has_more"] = offset + len(result["candidates"]) < result["total"]
+        return response
     except Exception as e:
         return {
             "success": False,
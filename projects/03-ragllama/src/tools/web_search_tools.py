@@ -3,10 +3,21 @@
 이 모듈은 Tavily API를 활용한 채용/개발자 트렌드 검색 도구를 제공합니다.
 LangChain의 @tool 데코레이터를 사용하여 LLM 에이전트가 활용할 수 있는
 구조화된 도구로 구현되었습니다.
+
+모든 Tavily 호출은 _tavily_search_and_format을 거치며, 결과는 디스크의
+TTL 캐시(SQLite)에 저장되어 동일한 검색 파라미터로 재호출 시 재사용됩니다.
 """
 
+import contextlib
+import hashlib
+import json
 import os
-from typing import List, Dict, Any, Optional
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 from langchain_core.tools import tool
 from tavily import TavilyClient
 from dotenv import load_dotenv
@@ -16,8 +27,146 @@ load_dotenv()
 # Tavily 클라이언트 초기화
 tavily_client = TavilyClient(api_key=os.getenv('TAVILY_API_KEY'))
 
+# 회사 정보 수집용 검색 키워드 템플릿
+COMPANY_SEARCH_KEYWORDS = [
+    "{company} 회사 역사",
+    "{company} 회사 소개",
+    "{company} 채용 후기",
+    "{company} 직원 인터뷰",
+    "{company} 기술 스택",
+    "{company} 개발 환경",
+    "{company} 복리후생",
+    "{company} 연봉",
+    "{company} 뉴스",
+    "{company} 보도자료"
+]
+
+# 동시 Tavily 요청 상한
+TAVILY_MAX_CONCURRENCY = int(os.getenv('TAVILY_MAX_CONCURRENCY', '10'))
+
+
+class TavilySearchCache:
+    """SQLite 기반 Tavily 검색 결과 TTL 캐시 (프로세스/세션 간 공유)"""
+
+    def __init__(self, db_path: str, ttl_seconds: int = 86400):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache ("
+                "key TEXT PRIMARY KEY, created_at REAL NOT NULL, value TEXT NOT NULL)"
+            )
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # sqlite3.Connection의 with 블록은 커밋만 하므로 연결은 직접 닫는다
+        with contextlib.closing(sqlite3.connect(str(self.db_path), timeout=30)) as conn:
+            with conn:
+                yield conn
+
+    @staticmethod
+    def make_key(search_params: Dict[str, Any]) -> str:
+        """(query, search_depth, max_results, 기타 옵션) -> 캐시 키"""
+        normalized = {
+            "query": search_params.get("query", "").strip(),
+            "search_depth": search_params.get("search_depth", "basic"),
+            "max_results": search_params.get("max_results", 5),
+        }
+        for name, value in search_params.items():
+            if name not in normalized and value is not None:
+                normalized[name] = sorted(value) if isinstance(value, list) else value
+        payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT created_at, value FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if time.time() - row[0] > self.ttl_seconds:
+                conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                return None
+            return json.loads(row[1])
+
+    def set(self, key: str, value: Dict[str, Any]):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, created_at, value) VALUES (?, ?, ?)",
+                (key, time.time(), json.dumps(value, ensure_ascii=False))
+            )
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM search_cache")
+
+
+class OfflineTavilyClient:
+    """네트워크 없이 동작하는 Tavily 대체 클라이언트 (오프라인 테스트용)
+
+    TavilyClient.search와 같은 형식의 결정적(deterministic) 결과를 반환합니다.
+    set_tavily_client(OfflineTavilyClient())로 교체해서 사용합니다.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls: List[Dict[str, Any]] = []
+
+    def search(self, query: str, max_results: int = 5, **kwargs) -> Dict[str, Any]:
+        self.calls.append({"query": query, "max_results": max_results, **kwargs})
+        if self.latency:
+            time.sleep(self.latency)
+        digest = hashlib.md5(query.encode('utf-8')).hexdigest()[:8]
+        results = [
+            {
+                "title": f"{query} - 결과 {i + 1}",
+                "content": f"'{query}'에 대한 오프라인 검색 결과 {i + 1}",
+                "url": f"https://offline.local/{digest}/{i + 1}",
+                "score": round(1.0 - i * 0.1, 2)
+            }
+            for i in range(max_results)
+        ]
+        response = {"query": query, "results": results}
+        if kwargs.get("include_answer"):
+            response["answer"] = f"'{query}'에 대한 오프라인 요약 답변"
+        return response
+
+
+def set_tavily_client(client) -> None:
+    """Tavily 클라이언트 교체 (예: OfflineTavilyClient)"""
+    global tavily_client
+    tavily_client = client
+
+
+# TAVILY_OFFLINE=1 이면 네트워크 없이 오프라인 클라이언트 사용
+if os.getenv('TAVILY_OFFLINE', '').lower() in ('1', 'true'):
+    set_tavily_client(OfflineTavilyClient())
+
+_search_cache: Optional[TavilySearchCache] = None
+_search_cache_lock = threading.Lock()
+
+def get_search_cache() -> TavilySearchCache:
+    """전역 Tavily 검색 캐시 반환"""
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = TavilySearchCache(
+                db_path=os.getenv('TAVILY_CACHE_PATH', './cache/tavily_cache.sqlite'),
+                ttl_seconds=int(os.getenv('TAVILY_CACHE_TTL', '86400'))
+            )
+    return _search_cache
+
 def _tavily_search_and_format(search_params: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Tavily 검색을 수행하고 결과를 공통 형식으로 포맷합니다."""
+    """Tavily 검색을 수행하고 결과를 공통 형식으로 포맷합니다. (TTL 캐시 적용)"""
+    cache = get_search_cache()
+    cache_key = cache.make_key(search_params)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     results = tavily_client.search(**search_params)
     
     formatted_results = []
@@ -35,9 +184,67 @@ def _tavily_search_and_format(search_params: Dict[str, Any]) -> List[Dict[str, A
 
     # 'answer' 키가 있는 경우 결과에 포함
     if 'answer' in results and results['answer']:
-        return {"answer": results['answer'], "results": formatted_results}
-        
-    return {"results": formatted_results}
+        formatted = {"answer": results['answer'], "results": formatted_results}
+    else:
+        formatted = {"results": formatted_results}
+
+    cache.set(cache_key, formatted)
+    return formatted
+
+def company_search_keywords(company_name: str) -> List[str]:
+    """회사명으로 회사 정보 수집용 검색 키워드 목록 생성"""
+    return [template.format(company=company_name) for template in COMPANY_SEARCH_KEYWORDS]
+
+def iter_company_search_results(
+    company_name: str,
+    max_results_per_keyword: int = 3,
+    search_depth: str = "advanced",
+    max_workers: int = TAVILY_MAX_CONCURRENCY
+) -> Iterator[Tuple[str, List[Dict[str, Any]], Optional[Exception]]]:
+    """회사 키워드 검색을 병렬로 수행하고 완료되는 순서대로 반환
+
+    Yields:
+        (keyword, results, error) - 실패한 키워드는 results=[], error=예외
+    """
+    keywords = company_search_keywords(company_name)
+
+    def _search(keyword: str) -> List[Dict[str, Any]]:
+        search_params = {
+            "query": keyword,
+            "max_results": max_results_per_keyword,
+            "search_depth": search_depth
+        }
+        return _tavily_search_and_format(search_params).get("results", [])
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(keywords)))) as executor:
+        futures = {executor.submit(_search, keyword): keyword for keyword in keywords}
+        for future in as_completed(futures):
+            keyword = futures[future]
+            try:
+                yield keyword, future.result(), None
+            except Exception as e:
+                yield keyword, [], e
+
+def collect_company_search_results(
+    company_name: str,
+    max_results_per_keyword: int = 3,
+    search_depth: str = "advanced"
+) -> List[Dict[str, Any]]:
+    """회사 키워드 병렬 검색 결과를 키워드 순서대로 정렬해 반환"""
+    by_keyword = {}
+    for keyword, results, error in iter_company_search_results(
+        company_name, max_results_per_keyword, search_depth
+    ):
+        if error is not None:
+            print(f"키워드 '{keyword}' 검색 실패: {error}")
+        elif results:
+            by_keyword[keyword] = results
+
+    return [
+        {"keyword": keyword, "results": by_keyword[keyword]}
+        for keyword in company_search_keywords(company_name)
+        if keyword in by_keyword
+    ]
 
 @tool(parse_docstring=True)
 def web_search_latest_trends(
@@ -377,44 +584,9 @@ def search_company_comprehensive_info(
         ...     print(f"{result['keyword']}: {len(result['results'])}건")
     """
     try:
-        # 회사별 검색 키워드 정의
-        search_keywords = [
-            f"{company_name} 회사 역사",
-            f"{company_name} 회사 소개", 
-            f"{company_name} 채용 후기",
-            f"{company_name} 직원 인터뷰",
-            f"{company_name} 기술 스택",
-            f"{company_name} 개발 환경",
-            f"{company_name} 복리후생",
-            f"{company_name} 연봉",
-            f"{company_name} 뉴스",
-            f"{company_name} 보도자료"
-        ]
-        
-        all_search_results = []
-        total_count = 0
-        
-        for keyword in search_keywords:
-            try:
-                search_params = {
-                    "query": keyword,
-                    "max_results": max_results_per_keyword,
-                    "search_depth": "advanced"
-                }
-                
-                search_result = _tavily_search_and_format(search_params)
-                formatted_results = search_result.get("results", [])
-                
-                if formatted_results:
-                    all_search_results.append({
-                        "keyword": keyword,
-                        "results": formatted_results
-                    })
-                    total_count += len(formatted_results)
-                    
-            except Exception as e:
-                print(f"키워드 '{keyword}' 검색 실패: {e}")
-                continue
+        # 키워드별 검색을 병렬로 수행 (결과는 TTL 캐시 공유)
+        all_search_results = collect_company_search_results(company_name, max_results_per_keyword)
+        total_count = sum(len(item["results"]) for item in all_search_results)
         
         return {
             "success": True,
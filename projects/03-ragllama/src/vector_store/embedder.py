@@ -4,6 +4,7 @@ import os
 from typing import List
 from sentence_transformers import SentenceTransformer
 import numpy as np
+from ..resources import registry
 
 class KoreanEmbedder:
     """한국어 임베딩 모델 (무료)"""
@@ -85,25 +86,20 @@ class KoreanEmbedder:
         return self.model.get_sentence_embedding_dimension()
 
 
-# 전역 임베더 인스턴스
-_embedder_instance = None
-
 def get_embedder(model_name: str = None, device: str = None) -> KoreanEmbedder:
     """
-    전역 임베더 인스턴스 반환
+    전역 임베더 인스턴스 반환 (프로세스당 1회 로드, 스레드 안전)
 
     Args:
         model_name: 모델 이름 (기본값: 환경변수 또는 jhgan/ko-sroberta-multitask)
         device: 디바이스 (기본값: 환경변수 또는 cpu)
     """
-    global _embedder_instance
-
-    if _embedder_instance is None:
-        if model_name is None:
-            model_name = os.getenv('EMBEDDING_MODEL', 'jhgan/ko-sroberta-multitask')
-        if device is None:
-            device = os.getenv('EMBEDDING_DEVICE', 'cpu')
-
-        _embedder_instance = KoreanEmbedder(model_name=model_name, device=device)
-
-    return _embedder_instance
\ No newline at end of file
+    if model_name is None:
+        model_name = os.getenv('EMBEDDING_MODEL', 'jhgan/ko-sroberta-multitask')
+    if device is None:
+        device = os.getenv('EMBEDDING_DEVICE', 'cpu')
+
+    return registry.get_or_create(
+        "embedder",
+        lambda: KoreanEmbedder(model_name=model_name, device=device)
+    )
\ No newline at end of file
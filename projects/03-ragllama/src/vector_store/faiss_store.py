@@ -1,12 +1,15 @@
 """FAISS Vector Store for Knowledge Base"""
 
+import hashlib
 import os
 import pickle
+import threading
 from typing import List, Dict, Any, Optional
 import numpy as np
 import faiss
 from pathlib import Path
 from .embedder import get_embedder
+from ..resources import registry
 
 class FAISSVectorStore:
     """FAISS 기반 벡터 스토어"""
@@ -22,6 +25,10 @@ class FAISSVectorStore:
         self.index = None
         self.documents = []  # 문서 메타데이터
         self.categories = {}  # 카테고리별 문서 인덱스
+        self._doc_keys = set()  # 중복 제거용 URL/내용 해시
+
+        # 인덱스와 메타데이터를 함께 갱신/조회하기 위한 락
+        self._lock = threading.RLock()
 
         self._load_or_create_index()
 
@@ -37,6 +44,7 @@ class FAISSVectorStore:
                     data = pickle.load(f)
                     self.documents = data['documents']
                     self.categories = data['categories']
+                self._doc_keys = {self.document_key(doc['text'], doc) for doc in self.documents}
                 print(f"벡터 스토어 로드 완료: {len(self.documents)}개 문서")
             except Exception as e:
                 print(f"벡터 스토어 로드 실패: {e}, 새로 생성합니다")
@@ -49,36 +57,69 @@ class FAISSVectorStore:
         self.index = faiss.IndexFlatL2(self.embedding_dim)
         self.documents = []
         self.categories = {}
+        self._doc_keys = set()
         print(f"새 벡터 인덱스 생성 완료 (차원: {self.embedding_dim})")
 
-    def add_documents(self, texts: List[str], metadata: List[Dict[str, Any]] = None):
-        """문서 추가"""
+    @staticmethod
+    def document_key(text: str, meta: Optional[Dict[str, Any]] = None) -> str:
+        """중복 판별 키 (URL 우선, 없으면 내용 해시)"""
+        url = (meta or {}).get('url')
+        if url:
+            return f"url:{url}"
+        return "sha1:" + hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def filter_new_documents(self, texts: List[str], metadata: List[Dict[str, Any]]):
+        """이미 인덱싱된(또는 입력 내 중복) 문서를 제외한 (texts, metadata) 반환"""
+        new_texts, new_metadata, seen = [], [], set()
+        with self._lock:
+            for text, meta in zip(texts, metadata):
+                key = self.document_key(text, meta)
+                if key in self._doc_keys or key in seen:
+                    continue
+                seen.add(key)
+                new_texts.append(text)
+                new_metadata.append(meta)
+        return new_texts, new_metadata
+
+    def add_documents(self, texts: List[str], metadata: List[Dict[str, Any]] = None,
+                      embeddings: Optional[np.ndarray] = None):
+        """문서 추가
+
+        임베딩은 락 밖에서 계산하고, 인덱스/메타데이터 반영은 락 안에서 한 번에
+        수행하므로 검색 쪽에서는 새 문서가 원자적으로 보입니다.
+        """
         if metadata is None:
             metadata = [{"text": text} for text in texts]
 
         # 임베딩 생성
-        embeddings = self.embedder.embed_texts(texts)
-
-        # FAISS 인덱스에 추가
-        self.index.add(embeddings.astype('float32'))
-
-        # 메타데이터 저장
-        for i, meta in enumerate(metadata):
-            doc_id = len(self.documents)
-            meta['id'] = doc_id
-            meta['text'] = texts[i]
-            self.documents.append(meta)
-
-            # 카테고리 인덱싱
-            category = meta.get('category', 'general')
-            if category not in self.categories:
-                self.categories[category] = []
-            self.categories[category].append(doc_id)
-
-        print(f"{len(texts)}개 문서 추가 완료 (총 {len(self.documents)}개)")
-
-    def add_company_info(self, company_name: str, search_results: List[Dict[str, Any]]):
-        """회사 정보를 벡터 스토어에 추가"""
+        if embeddings is None:
+            embeddings = self.embedder.embed_texts(texts)
+
+        with self._lock:
+            # FAISS 인덱스에 추가
+            self.index.add(embeddings.astype('float32'))
+
+            # 메타데이터 저장
+            for i, meta in enumerate(metadata):
+                doc_id = len(self.documents)
+                meta['id'] = doc_id
+                meta['text'] = texts[i]
+                self.documents.append(meta)
+                self._doc_keys.add(self.document_key(texts[i], meta))
+
+                # 카테고리 인덱싱
+                category = meta.get('category', 'general')
+                if category not in self.categories:
+                    self.categories[category] = []
+                self.categories[category].append(doc_id)
+
+            total = len(self.documents)
+
+        print(f"{len(texts)}개 문서 추가 완료 (총 {total}개)")
+
+    @staticmethod
+    def build_company_documents(company_name: str, search_results: List[Dict[str, Any]]):
+        """회사 검색 결과 -> (texts, metadata)"""
         texts = []
         metadata = []
         
@@ -107,6 +148,13 @@ class FAISSVectorStore:
                     meta['published_date'] = result['published_date']
                     
                 metadata.append(meta)
+
+        return texts, metadata
+
+    def add_company_info(self, company_name: str, search_results: List[Dict[str, Any]]):
+        """회사 정보를 벡터 스토어에 추가 (동기). UI에서는 ingestion 워커 사용"""
+        texts, metadata = self.build_company_documents(company_name, search_results)
+        texts, metadata = self.filter_new_documents(texts, metadata)
         
         if texts:
             self.add_documents(texts, metadata)
@@ -122,16 +170,17 @@ class FAISSVectorStore:
         # 쿼리 임베딩
         query_embedding = self.embedder.embed_text(query).astype('float32').reshape(1, -1)
 
-        # 검색
-        distances, indices = self.index.search(query_embedding, top_k)
+        with self._lock:
+            # 검색
+            distances, indices = self.index.search(query_embedding, top_k)
 
-        # 결과 포맷팅
-        results = []
-        for i, idx in enumerate(indices[0]):
-            if idx < len(self.documents):
-                doc = self.documents[idx].copy()
-                doc['score'] = float(1 / (1 + distances[0][i]))  # 거리를 점수로 변환
-                results.append(doc)
+            # 결과 포맷팅
+            results = []
+            for i, idx in enumerate(indices[0]):
+                if 0 <= idx < len(self.documents):
+                    doc = self.documents[idx].copy()
+                    doc['score'] = float(1 / (1 + distances[0][i]))  # 거리를 점수로 변환
+                    results.append(doc)
 
         return results
 
@@ -156,39 +205,40 @@ class FAISSVectorStore:
         return filtered_results
 
     def save(self):
-        """인덱스 저장"""
+        """인덱스 저장 (임시 파일에 쓴 뒤 교체)"""
         index_path = self.store_path / "faiss.index"
         metadata_path = self.store_path / "metadata.pkl"
 
-        faiss.write_index(self.index, str(index_path))
+        with self._lock:
+            faiss.write_index(self.index, str(index_path) + ".tmp")
+
+            with open(str(metadata_path) + ".tmp", 'wb') as f:
+                pickle.dump({
+                    'documents': self.documents,
+                    'categories': self.categories
+                }, f)
 
-        with open(metadata_path, 'wb') as f:
-            pickle.dump({
-                'documents': self.documents,
-                'categories': self.categories
-            }, f)
+        os.replace(str(index_path) + ".tmp", index_path)
+        os.replace(str(metadata_path) + ".tmp", metadata_path)
 
         print(f"벡터 스토어 저장 완료: {index_path}")
 
     def get_stats(self) -> Dict[str, Any]:
         """통계 반환"""
-        return {
-            'total_documents': len(self.documents),
-            'categories': {cat: len(docs) for cat, docs in self.categories.items()},
-            'embedding_dim': self.embedding_dim
-        }
+        with self._lock:
+            return {
+                'total_documents': len(self.documents),
+                'categories': {cat: len(docs) for cat, docs in self.categories.items()},
+                'embedding_dim': self.embedding_dim
+            }
 
 
-# 전역 벡터 스토어 인스턴스
-_vector_store_instance = None
-
 def get_vector_store(store_path: str = None) -> FAISSVectorStore:
-    """전역 벡터 스토어 반환"""
-    global _vector_store_instance
-
-    if _vector_store_instance is None:
-        if store_path is None:
-            store_path = os.getenv('VECTOR_STORE_PATH', './vector_store')
-        _vector_store_instance = FAISSVectorStore(store_path=store_path)
-
-    return _vector_store_instance
\ No newline at end of file
+    """전역 벡터 스토어 반환 (프로세스당 1회 로드, 스레드 안전)"""
+    if store_path is None:
+        store_path = os.getenv('VECTOR_STORE_PATH', './vector_store')
+
+    return registry.get_or_create(
+        "vector_store",
+        lambda: FAISSVectorStore(store_path=store_path)
+    )
\ No newline at end of file
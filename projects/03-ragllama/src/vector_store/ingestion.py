@@ -0,0 +1,150 @@
+"""Background ingestion worker for company info
+
+Streamlit 요청 스레드에서는 submit()만 호출하고, 임베딩/인덱스 추가/저장은
+백그라운드 스레드에서 처리합니다.
+"""
+
+import queue
+import threading
+import time
+from typing import List, Dict, Any, Optional, Callable
+from .faiss_store import FAISSVectorStore, get_vector_store
+
+class CompanyIngestionWorker:
+    """큐 기반 회사 정보 인덱싱 워커
+
+    - 여러 요청을 모아 배치 단위로 임베딩
+    - URL/내용 해시로 중복 제거
+    - 인덱스 반영은 FAISSVectorStore.add_documents에서 원자적으로 수행
+    - 큐가 비어 있는 동안 save_delay초가 지나면 디스크에 저장
+    """
+
+    def __init__(
+        self,
+        store_factory: Callable[[], FAISSVectorStore] = get_vector_store,
+        batch_size: int = 64,
+        save_delay: float = 5.0
+    ):
+        self.store_factory = store_factory
+        self.batch_size = batch_size
+        self.save_delay = save_delay
+
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+
+    def submit(self, company_name: str, search_results: List[Dict[str, Any]]):
+        """회사 검색 결과를 인덱싱 큐에 추가 (즉시 반환)"""
+        self._status[company_name] = {'state': 'queued', 'added': 0, 'skipped': 0}
+        self._queue.put((company_name, search_results))
+        self._ensure_started()
+
+    def status(self, company_name: str) -> Optional[Dict[str, Any]]:
+        """회사별 인덱싱 상태 (queued / indexing / done / failed)"""
+        return self._status.get(company_name)
+
+    def pending(self) -> int:
+        """대기 중인 요청 수"""
+        return self._queue.qsize()
+
+    def wait(self):
+        """큐의 모든 요청이 처리될 때까지 대기 (스크립트/테스트용)"""
+        self._queue.join()
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="company-ingestion", daemon=True
+                )
+                self._thread.start()
+
+    def _drain(self, first: tuple) -> List[tuple]:
+        """첫 요청과 함께 이미 대기 중인 요청을 모아서 반환"""
+        items = [first]
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                return items
+
+    def _run(self):
+        store = None
+        while True:
+            try:
+                first = self._queue.get(timeout=self.save_delay)
+            except queue.Empty:
+                if self._dirty and store is not None:
+                    self._save(store)
+                continue
+
+            items = self._drain(first)
+            try:
+                if store is None:
+                    store = self.store_factory()
+                self._ingest(store, items)
+            except Exception as e:
+                print(f"회사 정보 인덱싱 실패: {e}")
+                for company_name, _ in items:
+                    self._status[company_name] = {'state': 'failed', 'error': str(e)}
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+    def _ingest(self, store: FAISSVectorStore, items: List[tuple]):
+        texts: List[str] = []
+        metadata: List[Dict[str, Any]] = []
+        submitted: Dict[str, int] = {}
+
+        for company_name, search_results in items:
+            self._status[company_name] = {'state': 'indexing', 'added': 0, 'skipped': 0}
+            company_texts, company_meta = store.build_company_documents(company_name, search_results)
+            texts.extend(company_texts)
+            metadata.extend(company_meta)
+            submitted[company_name] = submitted.get(company_name, 0) + len(company_texts)
+
+        texts, metadata = store.filter_new_documents(texts, metadata)
+        added: Dict[str, int] = {}
+
+        start = time.perf_counter()
+        for i in range(0, len(texts), self.batch_size):
+            batch_texts = texts[i:i + self.batch_size]
+            batch_meta = metadata[i:i + self.batch_size]
+            embeddings = store.embedder.embed_texts(batch_texts, show_progress=False)
+            store.add_documents(batch_texts, batch_meta, embeddings=embeddings)
+            for meta in batch_meta:
+                added[meta['company_name']] = added.get(meta['company_name'], 0) + 1
+            self._dirty = True
+
+        for company_name, count in submitted.items():
+            self._status[company_name] = {
+                'state': 'done',
+                'added': added.get(company_name, 0),
+                'skipped': count - added.get(company_name, 0)
+            }
+
+        if texts:
+            elapsed = time.perf_counter() - start
+            print(f"백그라운드 인덱싱 완료: {len(texts)}건 ({elapsed:.2f}초)")
+
+    def _save(self, store: FAISSVectorStore):
+        try:
+            store.save()
+            self._dirty = False
+        except Exception as e:
+            print(f"벡터 스토어 저장 실패: {e}")
+
+
+# 전역 워커 인스턴스
+_ingestion_worker = None
+_ingestion_worker_lock = threading.Lock()
+
+def get_ingestion_worker() -> CompanyIngestionWorker:
+    """전역 회사 정보 인덱싱 워커 반환"""
+    global _ingestion_worker
+    with _ingestion_worker_lock:
+        if _ingestion_worker is None:
+            _ingestion_worker = CompanyIngestionWorker()
+    return _ingestion_worker
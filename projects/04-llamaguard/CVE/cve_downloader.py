@@ -6,13 +6,21 @@ Enhanced with CVSS/CWE filtering, recent-first sorting, and reference scraping.
 """
 
 import json
+import asyncio
 import requests
 import time
-import re
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Dict, Optional
-from urllib.parse import urlparse
+from typing import List, Dict, Optional, Iterator, Tuple
+
+from reference_scraper import (
+    AsyncReferenceScraper,
+    HostRateLimiter,
+    ReferenceCache,
+    extract_reference_content,
+    reference_fetch_url,
+    USER_AGENT,
+)
 
 
 # Common CWE ID to name mappings
@@ -74,8 +82,15 @@ class CVEDownloader:
 
     BASE_URL = "https://services.nvd.nist.gov/rest/json/cves/2.0"
 
+    # NVD API v2.0 rejects date ranges longer than 120 days
+    MAX_RANGE_DAYS = 120
+    NVD_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.000Z"
+
     def __init__(self, output_file: str = "cve_database.txt", api_key: str = None,
-                 scrape_references: bool = True):
+                 scrape_references: bool = True, base_url: str = None,
+                 session: requests.Session = None,
+                 cache_path: str = "reference_cache.sqlite",
+                 max_connections: int = 16, per_host_interval: float = 1.0):
         """
         Initialize CVE downloader.
 
@@ -83,16 +98,28 @@ class CVEDownloader:
             output_file: Path to output text file
             api_key: Optional NVD API key for higher rate limits
             scrape_references: Whether to scrape references for code examples
+            base_url: Override the NVD endpoint (e.g. a local stub server)
+            session: Optional requests session used for NVD calls
+            cache_path: On-disk cache for scraped references
+            max_connections: Connection pool size for concurrent scraping
+            per_host_interval: Minimum seconds between requests to one reference host
         """
         self.output_file = output_file
         self.api_key = api_key
         self.scrape_references = scrape_references
+        self.base_url = base_url or self.BASE_URL
+        self.session = session or requests.Session()
         self.headers = {}
         if api_key:
             self.headers["apiKey"] = api_key
 
-        # Cache for scraped content to avoid duplicate requests
-        self.reference_cache = {}
+        # Persistent cache for scraped content (survives between runs)
+        self.reference_cache = ReferenceCache(cache_path) if scrape_references else None
+        self.scraper = AsyncReferenceScraper(
+            self.reference_cache,
+            max_connections=max_connections,
+            per_host_interval=per_host_interval
+        ) if scrape_references else None
 
     def get_cwe_name(self, cwe_id: str) -> str:
         """
@@ -136,6 +163,106 @@ class CVEDownloader:
 
         return has_cvss and has_cwe
 
+    def _iter_pages(self, date_params: Dict[str, str], start_index: int = 0,
+                    results_per_page: int = 2000, raise_errors: bool = False) -> Iterator[List[Dict]]:
+        """
+        Yield the "vulnerabilities" list of each NVD result page for a date window.
+
+        Args:
+            date_params: pubStartDate/pubEndDate or lastModStartDate/lastModEndDate
+            start_index: Starting index for pagination
+            results_per_page: Number of results per page (max 2000)
+            raise_errors: Re-raise request errors instead of stopping quietly
+        """
+        current_index = start_index
+
+        while True:
+            params = dict(date_params)
+            params["startIndex"] = current_index
+            params["resultsPerPage"] = results_per_page
+
+            try:
+                response = self.session.get(
+                    self.base_url,
+                    headers=self.headers,
+                    params=params,
+                    timeout=30
+                )
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                print(f"Error downloading CVEs: {e}")
+                print(f"Response: {response.text if 'response' in locals() else 'No response'}")
+                if raise_errors:
+                    raise
+                return
+
+            data = response.json()
+            vulnerabilities = data.get("vulnerabilities", [])
+
+            if not vulnerabilities:
+                return
+
+            yield vulnerabilities
+
+            # Check if there are more results
+            total_results = data.get("totalResults", 0)
+            if current_index + results_per_page >= total_results:
+                return
+
+            current_index += results_per_page
+
+            # Rate limiting: wait between requests
+            # With API key: 50 requests per 30 seconds
+            # Without API key: 5 requests per 30 seconds
+            sleep_time = 0.6 if self.api_key else 6
+            time.sleep(sleep_time)
+
+    def iter_filtered_cves(self,
+                           start_index: int = 0,
+                           results_per_page: int = 2000,
+                           max_results: int = None,
+                           days_back: int = 120) -> Iterator[List[Dict]]:
+        """
+        Yield CVEs with CVSS and CWE page by page, as NVD returns them.
+
+        Args:
+            start_index: Starting index for pagination
+            results_per_page: Number of results per page (max 2000)
+            max_results: Maximum number of CVEs to download (None for all)
+            days_back: Number of days back to search (max 120 per NVD API limit)
+        """
+        end_date = datetime.now()
+        total_days = min(days_back, self.MAX_RANGE_DAYS)  # Cap at 120 days
+        start_date = end_date - timedelta(days=total_days)
+
+        print(f"Starting CVE download from NVD...")
+        print(f"Filtering for CVEs with CVSS scores and CWE categories")
+        print(f"Date range: {start_date.date()} to {end_date.date()}")
+
+        date_params = {
+            "pubStartDate": start_date.strftime("%Y-%m-%dT00:00:00.000Z"),
+            "pubEndDate": end_date.strftime("%Y-%m-%dT23:59:59.999Z")
+        }
+
+        total = 0
+        for vulnerabilities in self._iter_pages(date_params, start_index, results_per_page):
+            # Filter for CVEs with both CVSS and CWE
+            filtered = [v for v in vulnerabilities if self.has_cvss_and_cwe(v)]
+
+            # Respect max_results limit
+            if max_results:
+                remaining = max_results - total
+                filtered = filtered[:remaining]
+
+            total += len(filtered)
+            print(f"Downloaded {len(vulnerabilities)} CVEs, {len(filtered)} match filters (Total: {total})...")
+            yield filtered
+
+            # Stop if we've reached the limit
+            if max_results and total >= max_results:
+                print(f"Reached max_results limit of {max_results}")
+                return
+
     def download_cves(self,
                       start_index: int = 0,
                       results_per_page: int = 2000,
@@ -155,86 +282,145 @@ class CVEDownloader:
             List of CVE dictionaries with CVSS and CWE
         """
         all_cves = []
+        for filtered in self.iter_filtered_cves(start_index, results_per_page, max_results, days_back):
+            all_cves.extend(filtered)
 
-        # NVD API v2.0 has a 120-day maximum range limit
-        # Split into 120-day chunks if needed
-        max_days_per_request = 120
-        end_date = datetime.now()
-        total_days = min(days_back, 120)  # Cap at 120 days
-        start_date = end_date - timedelta(days=total_days)
+        # Sort by publication date (most recent first)
+        all_cves.sort(key=lambda x: x.get("cve", {}).get("published", ""), reverse=True)
 
-        print(f"Starting CVE download from NVD...")
-        print(f"Filtering for CVEs with CVSS scores and CWE categories")
-        print(f"Date range: {start_date.date()} to {end_date.date()}")
+        print(f"Total CVEs with CVSS and CWE: {len(all_cves)}")
+        return all_cves
 
-        current_index = start_index
+    async def _download_and_scrape(self, max_results: int = None,
+                                   days_back: int = 120) -> Tuple[List[Dict], Dict[str, Optional[str]]]:
+        """
+        Pipeline NVD paging with reference scraping.
 
-        while True:
-            if max_results and len(all_cves) >= max_results:
-                break
+        NVD pages are fetched in a worker thread (the API rate limit sleeps
+        there); as soon as a page arrives, its references are scraped
+        concurrently while the next page is being requested.
+        """
+        all_cves = []
+        scrape_tasks = []
+        pages = self.iter_filtered_cves(max_results=max_results, days_back=days_back)
+        limiter = HostRateLimiter(self.scraper.per_host_interval)
+
+        async with self.scraper.client() as client:
+            while True:
+                page = await asyncio.to_thread(next, pages, None)
+                if page is None:
+                    break
+                all_cves.extend(page)
+                scrape_tasks.append(asyncio.create_task(
+                    self.scraper.scrape_many(self.reference_urls(page), client=client, limiter=limiter)
+                ))
 
-            params = {
-                "startIndex": current_index,
-                "resultsPerPage": results_per_page,
-                "pubStartDate": start_date.strftime("%Y-%m-%dT00:00:00.000Z"),
-                "pubEndDate": end_date.strftime("%Y-%m-%dT23:59:59.999Z")
-            }
+            scraped: Dict[str, Optional[str]] = {}
+            for result in await asyncio.gather(*scrape_tasks):
+                scraped.update(result)
 
-            try:
-                response = requests.get(
-                    self.BASE_URL,
-                    headers=self.headers,
-                    params=params,
-                    timeout=30
-                )
-                response.raise_for_status()
+        # Sort by publication date (most recent first)
+        all_cves.sort(key=lambda x: x.get("cve", {}).get("published", ""), reverse=True)
 
-                data = response.json()
-                vulnerabilities = data.get("vulnerabilities", [])
+        print(f"Total CVEs with CVSS and CWE: {len(all_cves)}")
+        print(f"Scraped {len(scraped)} references")
+        return all_cves, scraped
+
+    @staticmethod
+    def reference_urls(cve_list: List[Dict], per_cve: int = 5) -> List[str]:
+        """Reference URLs considered for code examples (first per_cve of each CVE)."""
+        urls = []
+        for cve_data in cve_list:
+            for ref in cve_data.get("cve", {}).get("references", [])[:per_cve]:
+                if ref.get("url"):
+                    urls.append(ref["url"])
+        return urls
+
+    def prefetch_references(self, cve_list: List[Dict]) -> Dict[str, Optional[str]]:
+        """
+        Scrape references of many CVEs concurrently.
 
-                if not vulnerabilities:
-                    break
+        Returns:
+            Dict mapping url to extracted content, for format_cve_text(scraped=...)
+        """
+        if not self.scrape_references or not cve_list:
+            return {}
+        return asyncio.run(self.scraper.scrape_many(self.reference_urls(cve_list)))
 
-                # Filter for CVEs with both CVSS and CWE
-                filtered = [v for v in vulnerabilities if self.has_cvss_and_cwe(v)]
+    def download_modified_cves(self, since: datetime, until: datetime = None,
+                               results_per_page: int = 2000) -> List[Dict]:
+        """
+        Download CVEs added or changed in NVD between since and until
+        (lastModStartDate/lastModEndDate), split into 120-day windows.
 
-                # Respect max_results limit
-                if max_results:
-                    remaining = max_results - len(all_cves)
-                    filtered = filtered[:remaining]
+        Unlike download_cves, CVEs are returned unfiltered so the caller can
+        also see entries that were rejected or lost their CVSS/CWE data.
 
-                all_cves.extend(filtered)
+        Args:
+            since: Watermark (UTC) of the previous sync
+            until: End of the window (UTC, default: now)
+            results_per_page: Number of results per page (max 2000)
 
-                print(f"Downloaded {len(vulnerabilities)} CVEs, {len(filtered)} match filters (Total: {len(all_cves)})...")
+        Returns:
+            List of CVE dictionaries
 
-                # Stop if we've reached the limit
-                if max_results and len(all_cves) >= max_results:
-                    print(f"Reached max_results limit of {max_results}")
-                    break
+        Raises:
+            requests.exceptions.RequestException: If any page fails, so the
+                caller does not advance its watermark past missing data
+        """
+        until = until or datetime.now(timezone.utc)
+        changed = []
 
-                # Check if there are more results
-                total_results = data.get("totalResults", 0)
-                if current_index + results_per_page >= total_results:
-                    break
+        print(f"Fetching CVEs modified between {since.isoformat()} and {until.isoformat()}...")
 
-                current_index += results_per_page
+        window_start = since
+        while window_start < until:
+            window_end = min(window_start + timedelta(days=self.MAX_RANGE_DAYS), until)
+            date_params = {
+                "lastModStartDate": window_start.strftime(self.NVD_DATE_FORMAT),
+                "lastModEndDate": window_end.strftime(self.NVD_DATE_FORMAT),
+            }
+            pages = self._iter_pages(date_params, results_per_page=results_per_page, raise_errors=True)
+            for vulnerabilities in pages:
+                changed.extend(vulnerabilities)
+                print(f"Downloaded {len(vulnerabilities)} modified CVEs (Total: {len(changed)})...")
+            window_start = window_end
 
-                # Rate limiting: wait between requests
-                # With API key: 50 requests per 30 seconds
-                # Without API key: 5 requests per 30 seconds
-                sleep_time = 0.6 if self.api_key else 6
-                time.sleep(sleep_time)
+        return changed
 
-            except requests.exceptions.RequestException as e:
-                print(f"Error downloading CVEs: {e}")
-                print(f"Response: {response.text if 'response' in locals() else 'No response'}")
-                break
+    def _fetch_reference(self, url: str) -> Optional[str]:
+        """
+        Fetch and extract one reference synchronously, through the disk cache.
+        """
+        fetch_url = reference_fetch_url(url)
+        if fetch_url is None or self.reference_cache is None:
+            return None
 
-        # Sort by publication date (most recent first)
-        all_cves.sort(key=lambda x: x.get("cve", {}).get("published", ""), reverse=True)
+        cached = self.reference_cache.get(url)
+        if cached is not None and cached[3]:
+            return cached[0]
 
-        print(f"Total CVEs with CVSS and CWE: {len(all_cves)}")
-        return all_cves
+        headers = {'User-Agent': USER_AGENT}
+        if cached is not None:
+            headers.update(self.reference_cache.conditional_headers(cached[1], cached[2]))
+
+        try:
+            response = requests.get(fetch_url, timeout=10, headers=headers)
+            if response.status_code == 304 and cached is not None:
+                self.reference_cache.touch(url)
+                return cached[0]
+            response.raise_for_status()
+
+            content = extract_reference_content(url, response.text)
+            self.reference_cache.put(
+                url, content, response.headers.get('ETag'), response.headers.get('Last-Modified')
+            )
+            time.sleep(self.scraper.per_host_interval)  # Be nice to the host
+            return content
+
+        except Exception as e:
+            print(f"  Warning: Could not scrape {url}: {e}")
+            return cached[0] if cached else None
 
     def scrape_github_commit(self, url: str) -> Optional[str]:
         """
@@ -246,31 +432,9 @@ class CVEDownloader:
         Returns:
             Code diff text or None
         """
-        if url in self.reference_cache:
-            return self.reference_cache[url]
-
-        try:
-            # Convert to patch format for easier parsing
-            if '/commit/' in url:
-                patch_url = url + '.patch'
-            else:
-                return None
-
-            response = requests.get(patch_url, timeout=10)
-            response.raise_for_status()
-
-            content = response.text
-            # Limit size to avoid huge diffs
-            if len(content) > 50000:
-                content = content[:50000] + "\n... [truncated]"
-
-            self.reference_cache[url] = content
-            time.sleep(1)  # Be nice to GitHub
-            return content
-
-        except Exception as e:
-            print(f"  Warning: Could not scrape {url}: {e}")
+        if '/commit/' not in url:
             return None
+        return self._fetch_reference(url)
 
     def scrape_reference_content(self, url: str) -> Optional[str]:
         """
@@ -284,56 +448,16 @@ class CVEDownloader:
         """
         if not self.scrape_references:
             return None
+        return self._fetch_reference(url)
 
-        parsed = urlparse(url)
-        hostname = parsed.hostname or ""
-
-        # GitHub commits and pull requests
-        if 'github.com' in hostname and ('/commit/' in url or '/pull/' in url):
-            return self.scrape_github_commit(url)
-
-        # For other URLs, try to extract code blocks from HTML
-        if url in self.reference_cache:
-            return self.reference_cache[url]
-
-        try:
-            response = requests.get(url, timeout=10, headers={
-                'User-Agent': 'Mozilla/5.0 (Security Research Bot)'
-            })
-            response.raise_for_status()
-
-            content = response.text
-
-            # Look for code blocks in common formats
-            code_blocks = []
-
-            # Markdown code blocks
-            md_blocks = re.findall(r'```[\w]*\n(.*?)```', content, re.DOTALL)
-            code_blocks.extend(md_blocks)
-
-            # HTML pre/code tags
-            html_blocks = re.findall(r'<(?:pre|code)>(.*?)</(?:pre|code)>', content, re.DOTALL)
-            code_blocks.extend(html_blocks)
-
-            if code_blocks:
-                result = "\n\n".join(code_blocks[:3])  # Limit to first 3 blocks
-                if len(result) > 10000:
-                    result = result[:10000] + "\n... [truncated]"
-                self.reference_cache[url] = result
-                time.sleep(1)  # Rate limiting
-                return result
-
-        except Exception as e:
-            print(f"  Warning: Could not scrape {url}: {e}")
-
-        return None
-
-    def format_cve_text(self, cve_data: Dict) -> str:
+    def format_cve_text(self, cve_data: Dict, scraped: Dict[str, Optional[str]] = None) -> str:
         """
         Format CVE data as plain text with enhanced CVSS, CWE, and code examples.
 
         Args:
             cve_data: CVE data dictionary
+            scraped: Prefetched reference content (url -> content); other
+                references are scraped on demand
 
         Returns:
             Formatted text string
@@ -420,9 +544,11 @@ class CVEDownloader:
 
             for ref in references[:5]:  # Try first 5 references
                 url = ref.get("url", "")
-                print(f"  Scraping {url}...")
-
-                code_content = self.scrape_reference_content(url)
+                if scraped is not None and url in scraped:
+                    code_content = scraped[url]
+                else:
+                    print(f"  Scraping {url}...")
+                    code_content = self.scrape_reference_content(url)
                 if code_content:
                     text += f"\n--- Code from {url} ---\n"
                     text += code_content + "\n"
@@ -436,12 +562,13 @@ class CVEDownloader:
 
         return text
 
-    def save_to_file(self, cve_list: List[Dict]):
+    def save_to_file(self, cve_list: List[Dict], scraped: Dict[str, Optional[str]] = None):
         """
         Save CVE data to plain text file.
 
         Args:
             cve_list: List of CVE dictionaries
+            scraped: Prefetched reference content (see format_cve_text)
         """
         print(f"Saving to {self.output_file}...")
 
@@ -454,7 +581,7 @@ class CVEDownloader:
 
             # Write each CVE
             for cve_data in cve_list:
-                text = self.format_cve_text(cve_data)
+                text = self.format_cve_text(cve_data, scraped)
                 f.write(text)
 
         print(f"Successfully saved {len(cve_list)} CVEs to {self.output_file}")
@@ -467,9 +594,13 @@ class CVEDownloader:
             max_results: Maximum number of CVEs to download (None for all)
             days_back: Number of days back to search (max 120 per NVD API limit)
         """
-        cves = self.download_cves(max_results=max_results, days_back=days_back)
+        if self.scrape_references:
+            cves, scraped = asyncio.run(self._download_and_scrape(max_results=max_results, days_back=days_back))
+        else:
+            cves, scraped = self.download_cves(max_results=max_results, days_back=days_back), None
+
         if cves:
-            self.save_to_file(cves)
+            self.save_to_file(cves, scraped)
         else:
             print("No CVEs downloaded")
 
@@ -505,12 +636,25 @@ if __name__ == "__main__":
         action="store_true",
         help="Disable reference scraping for code examples"
     )
+    parser.add_argument(
+        "--cache", "-c",
+        default="reference_cache.sqlite",
+        help="On-disk reference cache (default: reference_cache.sqlite)"
+    )
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=16,
+        help="Concurrent connections for reference scraping (default: 16)"
+    )
 
     args = parser.parse_args()
 
     downloader = CVEDownloader(
         output_file=args.output,
         api_key=args.api_key,
-        scrape_references=not args.no_scrape
+        scrape_references=not args.no_scrape,
+        cache_path=args.cache,
+        max_connections=args.max_connections
     )
     downloader.run(max_results=args.max_results, days_back=args.days_back)
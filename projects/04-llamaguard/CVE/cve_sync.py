@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+CVE Incremental Sync
+Keeps the CVE vector database up to date without rebuilding it.
+
+Each run asks NVD only for CVEs whose lastModified is after the stored
+watermark, upserts them into a SQLite store, and re-embeds just the new or
+changed entries into the ID-mapped FAISS index.
+"""
+
+import json
+import sqlite3
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from cve_downloader import CVEDownloader
+from cve_vectordb import CVEVectorDB, CVEEntry
+
+
+class CVEStore:
+    """Structured CVE store (SQLite) holding raw NVD records and formatted text."""
+
+    def __init__(self, db_path: str = "cve_store.sqlite"):
+        """
+        Open (or create) the store.
+
+        Args:
+            db_path: Path to SQLite file
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cves ("
+            " cve_id TEXT PRIMARY KEY,"
+            " published TEXT,"
+            " last_modified TEXT,"
+            " text_hash TEXT NOT NULL,"
+            " text TEXT NOT NULL,"
+            " raw TEXT NOT NULL)"
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT)")
+        self.conn.commit()
+
+    def get_watermark(self) -> Optional[datetime]:
+        """lastModified watermark of the previous successful sync (UTC)."""
+        row = self.conn.execute("SELECT value FROM sync_state WHERE key = 'last_modified'").fetchone()
+        if row is None:
+            return None
+        return datetime.fromisoformat(row[0])
+
+    def set_watermark(self, value: datetime):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO sync_state (key, value) VALUES ('last_modified', ?)",
+            (value.isoformat(),)
+        )
+        self.conn.commit()
+
+    def get_text_hash(self, cve_id: str) -> Optional[str]:
+        row = self.conn.execute("SELECT text_hash FROM cves WHERE cve_id = ?", (cve_id,)).fetchone()
+        return row[0] if row else None
+
+    def upsert(self, cve_id: str, published: str, last_modified: str, text: str, raw: Dict) -> bool:
+        """
+        Insert or update one CVE.
+
+        Returns:
+            True if the formatted text is new or changed (needs re-embedding)
+        """
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        changed = self.get_text_hash(cve_id) != text_hash
+        self.conn.execute(
+            "INSERT OR REPLACE INTO cves (cve_id, published, last_modified, text_hash, text, raw) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (cve_id, published, last_modified, text_hash, text, json.dumps(raw, ensure_ascii=False))
+        )
+        return changed
+
+    def delete(self, cve_id: str) -> bool:
+        """
+        Remove one CVE.
+
+        Returns:
+            True if the CVE was in the store
+        """
+        return self.conn.execute("DELETE FROM cves WHERE cve_id = ?", (cve_id,)).rowcount > 0
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM cves").fetchone()[0]
+
+    def export_text(self, output_file: str):
+        """
+        Write the whole store in the cve_database.txt format (most recent first).
+        """
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write("CVE Database Export\n")
+            f.write(f"Generated: {datetime.now().isoformat()}\n")
+            f.write(f"Total CVEs: {self.count()}\n")
+            f.write("=" * 80 + "\n\n")
+            for (text,) in self.conn.execute("SELECT text FROM cves ORDER BY published DESC"):
+                f.write(text)
+
+    def close(self):
+        self.conn.close()
+
+
+class CVESync:
+    """Incremental NVD -> store -> vector index synchronization."""
+
+    def __init__(self, downloader: CVEDownloader, store: CVEStore, vector_db: CVEVectorDB,
+                 index_path: str = None, data_path: str = None, initial_days_back: int = 120):
+        """
+        Args:
+            downloader: NVD client (base_url/session may point at a local stub)
+            store: Structured CVE store
+            vector_db: Loaded (or empty) vector database to update in place
+            index_path: Where to save the FAISS index after changes (None: don't save)
+            data_path: Where to save the CVE entries after changes
+            initial_days_back: Window for the first sync when no watermark exists
+        """
+        self.downloader = downloader
+        self.store = store
+        self.vector_db = vector_db
+        self.index_path = index_path
+        self.data_path = data_path
+        self.initial_days_back = initial_days_back
+
+    def sync(self, until: datetime = None) -> Dict[str, int]:
+        """
+        Pull CVEs modified since the watermark and apply them.
+
+        Store rows and the watermark are committed only after the index was
+        updated (and saved), so an interrupted run is simply repeated next time.
+
+        Returns:
+            Counts of fetched / skipped / unparsed / unchanged / added /
+            replaced / removed CVEs. Skipped CVEs lack CVSS or CWE; ones that
+            were indexed before (modified since) are removed.
+        """
+        start = time.perf_counter()
+        until = until or datetime.now(timezone.utc)
+        since = self.store.get_watermark() or (until - timedelta(days=self.initial_days_back))
+
+        vulnerabilities = self.downloader.download_modified_cves(since, until)
+        relevant = [v for v in vulnerabilities if self.downloader.has_cvss_and_cwe(v)]
+        scraped = self.downloader.prefetch_references(relevant)
+
+        changed_entries: List[CVEEntry] = []
+        dropped_ids: List[str] = []
+        skipped = 0
+        unparsed = 0
+        try:
+            for cve_data in vulnerabilities:
+                cve = cve_data.get("cve", {})
+                # Same CVSS + CWE requirement as the full download
+                if not self.downloader.has_cvss_and_cwe(cve_data):
+                    skipped += 1
+                    # A CVE that lost its CVSS/CWE must not stay searchable
+                    if cve.get("id"):
+                        self.store.delete(cve["id"])
+                        dropped_ids.append(cve["id"])
+                    continue
+
+                text = self.downloader.format_cve_text(cve_data, scraped)
+                if self.store.upsert(cve.get("id", "N/A"), cve.get("published", ""),
+                                     cve.get("lastModified", ""), text, cve_data):
+                    entry = self.vector_db.parse_entry(text)
+                    if entry:
+                        changed_entries.append(entry)
+                    else:
+                        unparsed += 1
+
+            added, replaced = self.vector_db.upsert_entries(changed_entries)
+            removed = self.vector_db.remove_entries(dropped_ids)
+            if (added or replaced or removed) and self.index_path and self.data_path:
+                self.vector_db.save(self.index_path, self.data_path)
+        except Exception:
+            self.store.rollback()
+            raise
+
+        self.store.commit()
+        self.store.set_watermark(until)
+
+        stats = {
+            "fetched": len(vulnerabilities),
+            "skipped": skipped,
+            "unparsed": unparsed,
+            "unchanged": len(vulnerabilities) - skipped - unparsed - len(changed_entries),
+            "added": added,
+            "replaced": replaced,
+            "removed": removed,
+        }
+        print(f"Sync complete in {time.perf_counter() - start:.1f}s: {stats}")
+        return stats
+
+
+def load_or_create_vector_db(index_path: str, data_path: str) -> CVEVectorDB:
+    """Load an existing vector database, or start an empty one."""
+    db = CVEVectorDB()
+    if Path(index_path).exists() and Path(data_path).exists():
+        db.load(index_path, data_path)
+    return db
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Incrementally sync the CVE database from NVD")
+    parser.add_argument(
+        "--store", "-s",
+        default="cve_store.sqlite",
+        help="Structured CVE store (default: cve_store.sqlite)"
+    )
+    parser.add_argument(
+        "--index", "-i",
+        default="cve_index.faiss",
+        help="FAISS index file (default: cve_index.faiss)"
+    )
+    parser.add_argument(
+        "--data", "-d",
+        default="cve_corpus.jsonl",
+        help="CVE corpus file (default: cve_corpus.jsonl)"
+    )
+    parser.add_argument(
+        "--api-key", "-k",
+        help="NVD API key for higher rate limits"
+    )
+    parser.add_argument(
+        "--base-url",
+        help="NVD API endpoint override (e.g. a local stub server)"
+    )
+    parser.add_argument(
+        "--days-back",
+        type=int,
+        default=120,
+        help="Window for the first sync when no watermark exists (default: 120)"
+    )
+    parser.add_argument(
+        "--export",
+        help="Also write the full store to this text file (cve_database.txt format)"
+    )
+    parser.add_argument(
+        "--no-scrape",
+        action="store_true",
+        help="Disable reference scraping for code examples"
+    )
+    parser.add_argument(
+        "--cache", "-c",
+        default="reference_cache.sqlite",
+        help="On-disk reference cache (default: reference_cache.sqlite)"
+    )
+
+    args = parser.parse_args()
+
+    downloader = CVEDownloader(
+        api_key=args.api_key,
+        scrape_references=not args.no_scrape,
+        base_url=args.base_url,
+        cache_path=args.cache
+    )
+    store = CVEStore(args.store)
+    vector_db = load_or_create_vector_db(args.index, args.data)
+
+    CVESync(
+        downloader, store, vector_db,
+        index_path=args.index, data_path=args.data,
+        initial_days_back=args.days_back
+    ).sync()
+
+    if args.export:
+        store.export_text(args.export)
+        print(f"Exported {store.count()} CVEs to {args.export}")
+
+    store.close()
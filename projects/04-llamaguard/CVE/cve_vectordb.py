@@ -4,14 +4,38 @@ CVE Vector Database
 Creates and manages a FAISS-based vector database for CVE data with RAG capabilities.
 """
 
+import os
+import re
+import json
+import mmap
 import numpy as np
 import faiss
 import pickle
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator, Union
 from dataclasses import dataclass
 
 
+# "  - CWE-89: Improper Neutralization of ..." lines under "CWE Categories:"
+CWE_LINE_PATTERN = re.compile(r'(CWE-\d+):?[ \t]*([^,\n]*)')
+CVSS_SCORE_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(?:\((\w+)\))?')
+
+SEVERITY_BANDS = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW', 'NONE')
+
+
+def severity_band(score: float) -> str:
+    """Map a CVSS v3 base score to its qualitative severity band."""
+    if score >= 9.0:
+        return 'CRITICAL'
+    if score >= 7.0:
+        return 'HIGH'
+    if score >= 4.0:
+        return 'MEDIUM'
+    if score > 0.0:
+        return 'LOW'
+    return 'NONE'
+
+
 @dataclass
 class CVEEntry:
     """Represents a single CVE entry."""
@@ -20,6 +44,155 @@ class CVEEntry:
     metadata: Dict
 
 
+def index_row(entry: CVEEntry) -> Dict:
+    """Fields the lookup indexes need for one entry (kept in the corpus id table)."""
+    CVEVectorDB._fill_cwe_metadata(entry.text, entry.metadata)
+    return {
+        'cve_id': entry.cve_id,
+        'cwe_ids': entry.metadata['cwe_ids'],
+        'cvss': entry.metadata.get('cvss', ''),
+        'published': entry.metadata.get('published', ''),
+    }
+
+
+class CVECorpus:
+    """
+    Memory-mapped JSONL corpus of CVE entries.
+
+    For path "cve_corpus.jsonl" three files are used:
+        cve_corpus.jsonl           one JSON object (cve_id, text, metadata) per row
+        cve_corpus.jsonl.offsets   int64 (start, end) byte range per row
+        cve_corpus.jsonl.ids.json  row table: cve ids plus CWE / CVSS / published columns
+
+    Opening a corpus reads only the offsets and the row table; entry text is
+    decoded lazily by row. Rows appended, replaced or dropped after opening
+    are kept in memory until the corpus is written again.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path + '.ids.json', 'r', encoding='utf-8') as f:
+            self._table = json.load(f)
+
+        self._offsets = np.fromfile(path + '.offsets', dtype='int64').reshape(-1, 2)
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+        self._disk_rows = len(self._offsets)
+        self._changed: Dict[int, CVEEntry] = {}
+
+    @staticmethod
+    def write(path: str, entries: Iterable[CVEEntry]):
+        """
+        Write entries as a corpus at path (atomically replacing existing files).
+
+        Unchanged rows of a CVECorpus source are copied as raw bytes.
+        """
+        table = {'cve_id': [], 'cwe_ids': [], 'cvss': [], 'published': []}
+        offsets = []
+
+        corpus = entries if isinstance(entries, CVECorpus) else None
+        if corpus is None:
+            entries = list(entries)
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            for position in range(len(entries)):
+                raw = corpus.raw_row(position) if corpus is not None else None
+                if raw is None:
+                    entry = entries[position]
+                    row = index_row(entry)
+                    raw = (json.dumps(
+                        {'cve_id': entry.cve_id, 'text': entry.text, 'metadata': entry.metadata},
+                        ensure_ascii=False
+                    ) + "\n").encode('utf-8')
+                else:
+                    row = corpus.index_row(position)
+
+                start = f.tell()
+                f.write(raw)
+                offsets.append((start, f.tell()))
+                for key in table:
+                    table[key].append(row[key])
+
+        np.array(offsets, dtype='int64').reshape(-1, 2).tofile(path + '.offsets.tmp')
+        with open(path + '.ids.json.tmp', 'w', encoding='utf-8') as f:
+            json.dump(table, f, ensure_ascii=False)
+
+        os.replace(tmp_path, path)
+        os.replace(path + '.offsets.tmp', path + '.offsets')
+        os.replace(path + '.ids.json.tmp', path + '.ids.json')
+
+    def __len__(self) -> int:
+        return len(self._table['cve_id'])
+
+    def __getitem__(self, position: int) -> CVEEntry:
+        if position < 0:
+            position += len(self)
+        if position in self._changed:
+            return self._changed[position]
+        if not 0 <= position < self._disk_rows:
+            raise IndexError(position)
+
+        data = json.loads(self.raw_row(position))
+        return CVEEntry(cve_id=data['cve_id'], text=data['text'], metadata=data['metadata'])
+
+    def __setitem__(self, position: int, entry: CVEEntry):
+        self._changed[position] = entry
+        self._set_index_row(position, index_row(entry))
+
+    def __iter__(self) -> Iterator[CVEEntry]:
+        for position in range(len(self)):
+            yield self[position]
+
+    def append(self, entry: CVEEntry):
+        position = len(self)
+        for key in self._table:
+            self._table[key].append(None)
+        self[position] = entry
+
+    def keep_rows(self, positions: Iterable[int]):
+        """
+        Keep only the rows at positions (ascending), renumbering them from 0.
+
+        Only offsets and the row table are rewritten; no entry is decoded.
+        """
+        positions = [int(p) for p in positions]
+        offsets = np.zeros((len(positions), 2), dtype='int64')
+        changed: Dict[int, CVEEntry] = {}
+        for new, old in enumerate(positions):
+            if old in self._changed:
+                # Appended rows only live in _changed
+                changed[new] = self._changed[old]
+            else:
+                offsets[new] = self._offsets[old]
+
+        self._offsets = offsets
+        self._disk_rows = len(positions)
+        self._changed = changed
+        self._table = {key: [column[p] for p in positions] for key, column in self._table.items()}
+
+    def raw_row(self, position: int) -> Optional[bytes]:
+        """Serialized row as stored on disk, or None if changed since opening."""
+        if position in self._changed:
+            return None
+        start, end = self._offsets[position]
+        return self._mmap[start:end]
+
+    def index_row(self, position: int) -> Dict:
+        return {key: column[position] for key, column in self._table.items()}
+
+    def _set_index_row(self, position: int, row: Dict):
+        for key in self._table:
+            self._table[key][position] = row[key]
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+
 class CVEVectorDB:
     """Vector database for CVE data using FAISS."""
 
@@ -35,6 +208,13 @@ class CVEVectorDB:
         self.cve_entries: List[CVEEntry] = []
         self.embedder = None
 
+        # Lookup indexes (rebuilt by _build_lookup_indexes)
+        self._id_index: Dict[str, int] = {}
+        self._cwe_index: Dict[str, np.ndarray] = {}
+        self._severity_index: Dict[str, np.ndarray] = {}
+        self._cvss = np.empty(0, dtype='float32')
+        self._published = np.empty(0, dtype='datetime64[s]')
+
     def _init_embedder(self):
         """Initialize the embedding model."""
         if self.embedder is None:
@@ -58,25 +238,43 @@ class CVEVectorDB:
         """
         print(f"Loading CVE data from {file_path}...")
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Split by separator
-        entries = content.split("=" * 80)
-
-        # Skip header (first entry)
-        for entry in entries[1:]:
-            entry = entry.strip()
-            if not entry:
-                continue
-
+        for entry in self._iter_text_entries(file_path):
             # Parse entry
             cve_entry = self._parse_cve_entry(entry)
             if cve_entry:
                 self.cve_entries.append(cve_entry)
 
+        self._build_lookup_indexes()
         print(f"Loaded {len(self.cve_entries)} CVE entries")
 
+    @staticmethod
+    def _iter_text_entries(file_path: str) -> Iterator[str]:
+        """Stream entries of a text dump, split on separator lines (header skipped)."""
+        separator = "=" * 80
+        lines: List[str] = []
+        seen_header = False
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.rstrip("\n") != separator:
+                    lines.append(line)
+                    continue
+                entry = "".join(lines).strip()
+                lines = []
+                if seen_header and entry:
+                    yield entry
+                seen_header = True
+
+        entry = "".join(lines).strip()
+        if seen_header and entry:
+            yield entry
+
+    def parse_entry(self, text: str) -> Optional[CVEEntry]:
+        """
+        Parse one entry as produced by CVEDownloader.format_cve_text.
+        """
+        return self._parse_cve_entry(text.replace("=" * 80, "").strip())
+
     def _parse_cve_entry(self, text: str) -> Optional[CVEEntry]:
         """
         Parse a single CVE entry from text.
@@ -114,8 +312,77 @@ class CVEVectorDB:
                 elif key == "Description":
                     metadata['description'] = value
 
+        self._fill_cwe_metadata(text, metadata)
         return CVEEntry(cve_id=cve_id, text=text, metadata=metadata)
 
+    @staticmethod
+    def _fill_cwe_metadata(text: str, metadata: Dict):
+        """
+        Populate cwe_ids / cwe_names / cwe from the "CWE Categories" block.
+
+        The export lists CWEs on indented lines below the header, so the
+        single-line "CWE:" key above never matches for it.
+        """
+        if 'cwe_ids' in metadata:
+            return
+
+        cwe_ids, cwe_names, labels = [], [], []
+        for cwe_id, name in CWE_LINE_PATTERN.findall(text):
+            if cwe_id in cwe_ids:
+                continue
+            name = name.strip()
+            cwe_ids.append(cwe_id)
+            if name:
+                cwe_names.append(name)
+            labels.append(f"{cwe_id}: {name}" if name else cwe_id)
+
+        metadata['cwe_ids'] = cwe_ids
+        metadata['cwe_names'] = cwe_names
+        if not metadata.get('cwe'):
+            metadata['cwe'] = ", ".join(labels[:3])
+
+    def _build_lookup_indexes(self):
+        """
+        Build the CVE id hash index and CWE / severity / CVSS / published
+        indexes over cve_entries. Positions match FAISS vector ids.
+        """
+        count = len(self.cve_entries)
+        self._id_index = {}
+        cwe_positions: Dict[str, List[int]] = {}
+        severity_positions: Dict[str, List[int]] = {}
+        cvss = np.full(count, np.nan, dtype='float32')
+        published = np.full(count, np.datetime64('NaT'), dtype='datetime64[s]')
+
+        # A corpus already holds these columns, so its entries are not decoded
+        if isinstance(self.cve_entries, CVECorpus):
+            rows = (self.cve_entries.index_row(i) for i in range(count))
+        else:
+            rows = (index_row(entry) for entry in self.cve_entries)
+
+        for position, row in enumerate(rows):
+            # Keep the first occurrence, as the old linear scan did
+            self._id_index.setdefault(row['cve_id'], position)
+
+            for cwe_id in row['cwe_ids']:
+                cwe_positions.setdefault(cwe_id, []).append(position)
+
+            match = CVSS_SCORE_PATTERN.match(row['cvss'] or '')
+            if match:
+                cvss[position] = float(match.group(1))
+                band = (match.group(2) or severity_band(cvss[position])).upper()
+                severity_positions.setdefault(band, []).append(position)
+
+            if row['published']:
+                try:
+                    published[position] = np.datetime64(row['published'][:19], 's')
+                except ValueError:
+                    pass
+
+        self._cwe_index = {k: np.array(v, dtype='int64') for k, v in cwe_positions.items()}
+        self._severity_index = {k: np.array(v, dtype='int64') for k, v in severity_positions.items()}
+        self._cvss = cvss
+        self._published = published
+
     def build_index(self, use_gpu: bool = False):
         """
         Build FAISS index from loaded CVE entries.
@@ -130,9 +397,32 @@ class CVEVectorDB:
 
         print("Generating embeddings...")
         texts = [entry.text for entry in self.cve_entries]
+        embeddings = self._embed_texts(texts)
+        print(f"Generated embeddings with shape: {embeddings.shape}")
+
+        # Create FAISS index
+        print("Building FAISS index...")
+        if use_gpu:
+            # Use GPU index
+            res = faiss.StandardGpuResources()
+            self.index = faiss.GpuIndexFlatIP(res, self.embedding_dim)
+        else:
+            # Use CPU index with inner product (cosine similarity).
+            # Vector ids are positions in cve_entries so entries can be replaced in place.
+            self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(self.embedding_dim))
+
+        # Normalize embeddings for cosine similarity
+        faiss.normalize_L2(embeddings)
 
-        # Generate embeddings in batches
-        batch_size = 32
+        # Add to index
+        if use_gpu:
+            self.index.add(embeddings)
+        else:
+            self.index.add_with_ids(embeddings, np.arange(len(embeddings), dtype='int64'))
+        print(f"Index built with {self.index.ntotal} vectors")
+
+    def _embed_texts(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """Encode texts in batches (not normalized)."""
         embeddings = []
 
         for i in range(0, len(texts), batch_size):
@@ -144,33 +434,169 @@ class CVEVectorDB:
             )
             embeddings.append(batch_embeddings)
 
-        embeddings = np.vstack(embeddings).astype('float32')
-        print(f"Generated embeddings with shape: {embeddings.shape}")
+        return np.vstack(embeddings).astype('float32')
 
-        # Create FAISS index
-        print("Building FAISS index...")
-        if use_gpu:
-            # Use GPU index
-            res = faiss.StandardGpuResources()
-            self.index = faiss.GpuIndexFlatIP(res, self.embedding_dim)
-        else:
-            # Use CPU index with inner product (cosine similarity)
-            self.index = faiss.IndexFlatIP(self.embedding_dim)
+    def _ensure_id_map(self):
+        """
+        Make sure the index supports add/replace by id.
 
-        # Normalize embeddings for cosine similarity
+        Indexes saved before ids were introduced (plain IndexFlatIP) are
+        converted by copying their stored vectors, without re-embedding.
+        """
+        if isinstance(self.index, faiss.IndexIDMap2):
+            return
+
+        id_index = faiss.IndexIDMap2(faiss.IndexFlatIP(self.embedding_dim))
+        if self.index is not None and self.index.ntotal > 0:
+            vectors = self.index.reconstruct_n(0, self.index.ntotal)
+            id_index.add_with_ids(vectors, np.arange(self.index.ntotal, dtype='int64'))
+        self.index = id_index
+
+    def upsert_entries(self, entries: List[CVEEntry]) -> Tuple[int, int]:
+        """
+        Add new CVE entries and replace changed ones, embedding only those entries.
+
+        Args:
+            entries: New or modified CVE entries (matched by cve_id)
+
+        Returns:
+            (added, replaced) counts
+        """
+        # Last occurrence wins if the same CVE is passed twice
+        unique = list({entry.cve_id: entry for entry in entries}.values())
+        if not unique:
+            return 0, 0
+
+        self._init_embedder()
+        self._ensure_id_map()
+
+        embeddings = self._embed_texts([entry.text for entry in unique])
         faiss.normalize_L2(embeddings)
 
-        # Add to index
-        self.index.add(embeddings)
-        print(f"Index built with {self.index.ntotal} vectors")
+        added, replaced = 0, 0
+        positions = []
+        for entry in unique:
+            position = self._id_index.get(entry.cve_id)
+            if position is None:
+                position = len(self.cve_entries)
+                self.cve_entries.append(entry)
+                self._id_index[entry.cve_id] = position
+                added += 1
+            else:
+                self.cve_entries[position] = entry
+                replaced += 1
+            positions.append(position)
+
+        ids = np.array(positions, dtype='int64')
+        self.index.remove_ids(ids)
+        self.index.add_with_ids(embeddings, ids)
+
+        self._build_lookup_indexes()
+        print(f"Upserted {len(unique)} CVE entries ({added} added, {replaced} replaced)")
+        return added, replaced
+
+    def remove_entries(self, cve_ids: Iterable[str]) -> int:
+        """
+        Drop CVE entries and their vectors, e.g. when a CVE no longer qualifies.
+
+        Remaining entries are compacted so positions keep matching vector ids;
+        stored vectors are reused, nothing is re-embedded.
+
+        Args:
+            cve_ids: CVE ids to remove (unknown ids are ignored)
 
-    def search(self, query: str, top_k: int = 5) -> List[Tuple[CVEEntry, float]]:
+        Returns:
+            Number of entries removed
+        """
+        drop = {self._id_index[cve_id] for cve_id in set(cve_ids) if cve_id in self._id_index}
+        if not drop:
+            return 0
+
+        self._ensure_id_map()
+        keep = np.array([p for p in range(len(self.cve_entries)) if p not in drop], dtype='int64')
+        remap = np.full(len(self.cve_entries), -1, dtype='int64')
+        remap[keep] = np.arange(len(keep), dtype='int64')
+
+        ids = faiss.vector_to_array(self.index.id_map)
+        vectors = self.index.index.reconstruct_n(0, self.index.ntotal)
+        new_ids = remap[ids]
+        kept = new_ids >= 0
+
+        index = faiss.IndexIDMap2(faiss.IndexFlatIP(self.embedding_dim))
+        if kept.any():
+            index.add_with_ids(vectors[kept], new_ids[kept])
+        self.index = index
+        if isinstance(self.cve_entries, CVECorpus):
+            self.cve_entries.keep_rows(keep)
+        else:
+            self.cve_entries = [self.cve_entries[int(p)] for p in keep]
+
+        self._build_lookup_indexes()
+        print(f"Removed {len(drop)} CVE entries")
+        return len(drop)
+
+    def filter_ids(
+        self,
+        cwe: Optional[Union[str, Iterable[str]]] = None,
+        severity: Optional[Union[str, Iterable[str]]] = None,
+        min_cvss: Optional[float] = None,
+        max_cvss: Optional[float] = None,
+        published_after: Optional[str] = None,
+        published_before: Optional[str] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Resolve metadata filters to the matching vector ids.
+
+        Multiple CWEs or severity bands are OR-ed; different filters are AND-ed.
+
+        Returns:
+            Sorted int64 id array, or None when no filter was given
+        """
+        mask = None
+
+        def narrow(condition: np.ndarray):
+            nonlocal mask
+            mask = condition if mask is None else (mask & condition)
+
+        def from_index(index: Dict[str, np.ndarray], keys: Iterable[str]) -> np.ndarray:
+            condition = np.zeros(len(self.cve_entries), dtype=bool)
+            for key in keys:
+                positions = index.get(key)
+                if positions is not None:
+                    condition[positions] = True
+            return condition
+
+        if cwe:
+            cwes = [cwe] if isinstance(cwe, str) else list(cwe)
+            narrow(from_index(self._cwe_index, [c.strip().upper() for c in cwes]))
+        if severity:
+            bands = [severity] if isinstance(severity, str) else list(severity)
+            narrow(from_index(self._severity_index, [b.strip().upper() for b in bands]))
+
+        # NaN / NaT compare False, so entries without the field are excluded
+        if min_cvss is not None:
+            narrow(self._cvss >= min_cvss)
+        if max_cvss is not None:
+            narrow(self._cvss <= max_cvss)
+        if published_after:
+            narrow(self._published >= np.datetime64(published_after[:19], 's'))
+        if published_before:
+            narrow(self._published <= np.datetime64(published_before[:19], 's'))
+
+        if mask is None:
+            return None
+        return np.flatnonzero(mask).astype('int64')
+
+    def search(self, query: str, top_k: int = 5, **filters) -> List[Tuple[CVEEntry, float]]:
         """
         Search for similar CVEs using natural language query.
 
         Args:
             query: Search query
             top_k: Number of results to return
+            **filters: Optional filters (see filter_ids), e.g.
+                cwe="CWE-89", min_cvss=7.0. Evaluated inside the FAISS
+                search through an ID selector, so only matching CVEs are scored.
 
         Returns:
             List of (CVEEntry, score) tuples
@@ -190,24 +616,45 @@ class CVEVectorDB:
         # Normalize for cosine similarity
         faiss.normalize_L2(query_embedding)
 
+        allowed_ids = self.filter_ids(**filters)
+        if allowed_ids is not None and len(allowed_ids) == 0:
+            return []
+
         # Search
-        scores, indices = self.index.search(query_embedding, top_k)
+        if allowed_ids is None:
+            scores, indices = self.index.search(query_embedding, top_k)
+        else:
+            scores, indices = self._search_subset(query_embedding, top_k, allowed_ids)
 
-        # Return results
+        # Return results (FAISS pads with -1 when fewer than top_k match)
         results = []
         for idx, score in zip(indices[0], scores[0]):
-            if idx < len(self.cve_entries):
+            if 0 <= idx < len(self.cve_entries):
                 results.append((self.cve_entries[idx], float(score)))
 
         return results
 
+    def _search_subset(self, query_embedding: np.ndarray, top_k: int, allowed_ids: np.ndarray):
+        """Search restricted to allowed_ids."""
+        top_k = min(top_k, len(allowed_ids))
+        try:
+            selector = faiss.IDSelectorBatch(allowed_ids)
+            params = faiss.SearchParameters(sel=selector)
+            return self.index.search(query_embedding, top_k, params=params)
+        except (AttributeError, TypeError, RuntimeError):
+            # GPU indexes / older FAISS builds: score the subset directly
+            vectors = np.vstack([self.index.reconstruct(int(i)) for i in allowed_ids])
+            scores = vectors @ query_embedding[0]
+            order = np.argsort(-scores)[:top_k]
+            return scores[order][None, :], allowed_ids[order][None, :]
+
     def save(self, index_path: str, data_path: str):
         """
         Save index and data to disk.
 
         Args:
             index_path: Path to save FAISS index
-            data_path: Path to save CVE entries
+            data_path: Path to save CVE entries (.jsonl corpus, or legacy .pkl)
         """
         if self.index is None:
             raise ValueError("No index to save")
@@ -216,8 +663,15 @@ class CVEVectorDB:
         faiss.write_index(self.index, index_path)
 
         print(f"Saving data to {data_path}...")
-        with open(data_path, 'wb') as f:
-            pickle.dump(self.cve_entries, f)
+        if data_path.endswith('.pkl'):
+            with open(data_path, 'wb') as f:
+                pickle.dump(list(self.cve_entries), f)
+        else:
+            CVECorpus.write(data_path, self.cve_entries)
+            # Re-open so later reads hit the new files
+            if isinstance(self.cve_entries, CVECorpus):
+                self.cve_entries.close()
+            self.cve_entries = CVECorpus(data_path)
 
         print("Save complete")
 
@@ -227,7 +681,8 @@ class CVEVectorDB:
 
         Args:
             index_path: Path to FAISS index
-            data_path: Path to CVE entries
+            data_path: Path to CVE entries. A .jsonl corpus is memory-mapped and
+                read lazily; a legacy .pkl is unpickled in full.
             use_gpu: Whether to use GPU
         """
         print(f"Loading index from {index_path}...")
@@ -238,9 +693,13 @@ class CVEVectorDB:
             self.index = faiss.index_cpu_to_gpu(res, 0, self.index)
 
         print(f"Loading data from {data_path}...")
-        with open(data_path, 'rb') as f:
-            self.cve_entries = pickle.load(f)
+        if data_path.endswith('.pkl'):
+            with open(data_path, 'rb') as f:
+                self.cve_entries = pickle.load(f)
+        else:
+            self.cve_entries = CVECorpus(data_path)
 
+        self._build_lookup_indexes()
         print(f"Loaded {len(self.cve_entries)} CVE entries")
 
     def get_cve_by_id(self, cve_id: str) -> Optional[CVEEntry]:
@@ -253,10 +712,17 @@ class CVEVectorDB:
         Returns:
             CVEEntry or None if not found
         """
-        for entry in self.cve_entries:
-            if entry.cve_id == cve_id:
-                return entry
-        return None
+        position = self._id_index.get(cve_id)
+        if position is None:
+            return None
+        return self.cve_entries[position]
+
+    def get_cves_by_cwe(self, cwe_id: str) -> List[CVEEntry]:
+        """
+        Get all CVE entries tagged with a CWE (e.g., CWE-89).
+        """
+        positions = self._cwe_index.get(cwe_id.strip().upper(), [])
+        return [self.cve_entries[i] for i in positions]
 
 
 if __name__ == "__main__":
@@ -275,8 +741,12 @@ if __name__ == "__main__":
     )
     parser.add_argument(
         "--data-output", "-d",
-        default="cve_data.pkl",
-        help="Output CVE data file (default: cve_data.pkl)"
+        default="cve_corpus.jsonl",
+        help="Output CVE corpus (default: cve_corpus.jsonl; a .pkl path writes the legacy pickle)"
+    )
+    parser.add_argument(
+        "--from-pickle",
+        help="Convert an existing cve_data.pkl (with --index-output as its index) instead of re-embedding"
     )
     parser.add_argument(
         "--gpu",
@@ -286,10 +756,14 @@ if __name__ == "__main__":
 
     args = parser.parse_args()
 
-    # Create and build vector database
     db = CVEVectorDB()
-    db.load_from_text_file(args.input)
-    db.build_index(use_gpu=args.gpu)
+    if args.from_pickle:
+        # Reuse the existing vectors; only the entry storage changes
+        db.load(args.index_output, args.from_pickle)
+    else:
+        # Create and build vector database
+        db.load_from_text_file(args.input)
+        db.build_index(use_gpu=args.gpu)
     db.save(args.index_output, args.data_output)
 
     print("\nVector database created successfully!")
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+CVE Reference Scraper
+Fetches code examples from CVE reference URLs concurrently.
+
+- Bounded connection pool shared by all hosts
+- Per-host rate limit (one request per min_interval seconds per host)
+- On-disk cache (SQLite) with ETag / Last-Modified revalidation, so
+  re-runs only transfer references that actually changed
+"""
+
+import re
+import time
+import sqlite3
+import asyncio
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+
+USER_AGENT = 'Mozilla/5.0 (Security Research Bot)'
+
+# Size limits for stored content
+MAX_PATCH_CHARS = 50000
+MAX_CODE_CHARS = 10000
+
+
+def reference_fetch_url(url: str) -> Optional[str]:
+    """
+    URL to request for a reference, or None if it is not worth fetching.
+
+    GitHub commits are fetched in .patch form; GitHub pull requests are skipped.
+    """
+    hostname = urlparse(url).hostname or ""
+    if 'github.com' in hostname and ('/commit/' in url or '/pull/' in url):
+        return url + '.patch' if '/commit/' in url else None
+    return url
+
+
+def extract_reference_content(url: str, body: str) -> Optional[str]:
+    """
+    Extract code from a fetched reference body.
+
+    Args:
+        url: Original reference URL
+        body: Response text of reference_fetch_url(url)
+
+    Returns:
+        Patch text / code blocks, or None if nothing useful was found
+    """
+    if '/commit/' in url and 'github.com' in (urlparse(url).hostname or ""):
+        # Limit size to avoid huge diffs
+        if len(body) > MAX_PATCH_CHARS:
+            body = body[:MAX_PATCH_CHARS] + "\n... [truncated]"
+        return body
+
+    # Look for code blocks in common formats
+    code_blocks = []
+
+    # Markdown code blocks
+    code_blocks.extend(re.findall(r'```[\w]*\n(.*?)```', body, re.DOTALL))
+
+    # HTML pre/code tags
+    code_blocks.extend(re.findall(r'<(?:pre|code)>(.*?)</(?:pre|code)>', body, re.DOTALL))
+
+    if not code_blocks:
+        return None
+
+    result = "\n\n".join(code_blocks[:3])  # Limit to first 3 blocks
+    if len(result) > MAX_CODE_CHARS:
+        result = result[:MAX_CODE_CHARS] + "\n... [truncated]"
+    return result
+
+
+class ReferenceCache:
+    """
+    Persistent reference cache.
+
+    Stores the extracted content (None when the page had no code) together
+    with the validators needed for conditional requests.
+    """
+
+    def __init__(self, db_path: str = "reference_cache.sqlite", max_age: float = 7 * 24 * 3600):
+        """
+        Args:
+            db_path: Path to SQLite file
+            max_age: Seconds an entry is served without revalidation
+        """
+        self.db_path = db_path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS reference_cache ("
+            " url TEXT PRIMARY KEY,"
+            " content TEXT,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " fetched_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    def get(self, url: str) -> Optional[Tuple[Optional[str], Optional[str], Optional[str], bool]]:
+        """
+        Returns:
+            (content, etag, last_modified, is_fresh) or None if never fetched
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT content, etag, last_modified, fetched_at FROM reference_cache WHERE url = ?",
+                (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        content, etag, last_modified, fetched_at = row
+        return content, etag, last_modified, (time.time() - fetched_at) < self.max_age
+
+    def put(self, url: str, content: Optional[str], etag: Optional[str], last_modified: Optional[str]):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO reference_cache (url, content, etag, last_modified, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, content, etag, last_modified, time.time())
+            )
+            self.conn.commit()
+
+    def touch(self, url: str):
+        """Mark a cached entry as revalidated (304 Not Modified)."""
+        with self._lock:
+            self.conn.execute(
+                "UPDATE reference_cache SET fetched_at = ? WHERE url = ?", (time.time(), url)
+            )
+            self.conn.commit()
+
+    def conditional_headers(self, etag: Optional[str], last_modified: Optional[str]) -> Dict[str, str]:
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def close(self):
+        self.conn.close()
+
+
+class HostRateLimiter:
+    """Spaces requests to the same host at least min_interval seconds apart."""
+
+    def __init__(self, min_interval: float = 1.0):
+        self.min_interval = min_interval
+        self._next_slot: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def wait(self, host: str):
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next_slot.get(host, 0.0) - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_slot[host] = loop.time() + self.min_interval
+
+
+class AsyncReferenceScraper:
+    """Concurrent reference fetcher backed by ReferenceCache."""
+
+    def __init__(self, cache: ReferenceCache, max_connections: int = 16,
+                 per_host_interval: float = 1.0, timeout: float = 10.0):
+        """
+        Args:
+            cache: Persistent reference cache
+            max_connections: Size of the shared connection pool
+            per_host_interval: Minimum seconds between requests to one host
+            timeout: Per-request timeout in seconds
+        """
+        self.cache = cache
+        self.max_connections = max_connections
+        self.per_host_interval = per_host_interval
+        self.timeout = timeout
+
+    def client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client; use as `async with scraper.client() as client:`."""
+        return httpx.AsyncClient(
+            headers={'User-Agent': USER_AGENT},
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_connections),
+            timeout=self.timeout,
+            follow_redirects=True,
+        )
+
+    async def fetch(self, client: httpx.AsyncClient, limiter: HostRateLimiter, url: str) -> Optional[str]:
+        """Fetch one reference, honoring the cache and the per-host rate limit."""
+        fetch_url = reference_fetch_url(url)
+        if fetch_url is None:
+            return None
+
+        cached = self.cache.get(url)
+        if cached is not None and cached[3]:
+            return cached[0]
+
+        headers = self.cache.conditional_headers(cached[1], cached[2]) if cached else {}
+        await limiter.wait(urlparse(fetch_url).hostname or "")
+
+        try:
+            response = await client.get(fetch_url, headers=headers)
+            if response.status_code == 304 and cached is not None:
+                self.cache.touch(url)
+                return cached[0]
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            print(f"  Warning: Could not scrape {url}: {e}")
+            return cached[0] if cached else None
+
+        content = extract_reference_content(url, response.text)
+        self.cache.put(url, content, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return content
+
+    async def scrape_many(self, urls: Iterable[str], client: httpx.AsyncClient = None,
+                          limiter: HostRateLimiter = None) -> Dict[str, Optional[str]]:
+        """
+        Fetch many references concurrently.
+
+        Args:
+            urls: Reference URLs (duplicates are fetched once)
+            client: Shared client (default: a new pooled client for this call)
+            limiter: Shared rate limiter (default: a new one for this call)
+
+        Returns:
+            Dict mapping url to extracted content (None if nothing found)
+        """
+        urls = list(dict.fromkeys(urls))
+        limiter = limiter or HostRateLimiter(self.per_host_interval)
+
+        async def run(active_client):
+            results = await asyncio.gather(*(self.fetch(active_client, limiter, url) for url in urls))
+            return dict(zip(urls, results))
+
+        if client is not None:
+            return await run(client)
+        async with self.client() as own_client:
+            return await run(own_client)
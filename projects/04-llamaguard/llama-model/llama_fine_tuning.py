@@ -16,6 +16,7 @@ from sklearn.model_selection import train_test_split
 from trl import SFTTrainer, SFTConfig
 import random
 import numpy as np
+from streaming_dataset import build_token_shards, build_packed_dataset, collate_packed
 
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 SEED = 42
@@ -110,13 +111,20 @@ model_name = "./llama-3.2-1B-Instruct"  # 로컬 모델 경로
 output_dir = "./llama-3.2-1B-Instruct-vuln-lora"  # 학습 결과 저장
 lora_adapter_dir = f"{output_dir}/lora-adapter"
 os.makedirs(output_dir, exist_ok=True)
+data_file = "./data/Code_Vuln_DPO/secure_programming_dpo_flat.json"
+
+# 스트리밍 모드: 워커 프로세스에서 토크나이즈한 샤드를 디스크 캐시(토크나이저+데이터 해시)에 저장하고
+# 패딩 없이 시퀀스 패킹해서 흘려보냄 (전체 데이터셋을 메모리에 올리지 않음)
+STREAMING = os.environ.get("LLAMA_STREAMING", "0") == "1"
+TOKEN_CACHE_DIR = os.environ.get("LLAMA_TOKEN_CACHE", "./token_cache")
+DATALOADER_WORKERS = int(os.environ.get("LLAMA_DATALOADER_WORKERS", "2"))
 
 # =========================
 # 데이터셋 로드 및 SFT용 전처리 (secure_programming_dpo_test.json)
 # =========================
-print("1) 데이터셋 로드: secure_programming_dpo.json ...")
-dataset = load_dataset('json', data_files="./data/Code_Vuln_DPO/secure_programming_dpo.json")
-dataset = load_dataset('json', data_files="./data/Code_Vuln_DPO/secure_programming_dpo_flat.json")
+if not STREAMING:
+    print("1) 데이터셋 로드: secure_programming_dpo.json ...")
+    dataset = load_dataset('json', data_files=data_file)
 
 # 2. Train/Test 분할 (80:20)
 # split_dataset = dataset['train'].train_test_split(test_size=0.1, seed=42)
@@ -171,8 +179,9 @@ def formatting_func(examples):
 #     return {"text": prompt + "\n\nAnalysis:\n" + response}
 
 
-train_dataset = dataset["train"].map(formatting_func, batched=True)
-print(f"총 샘플 수: {len(train_dataset)}")
+if not STREAMING:
+    train_dataset = dataset["train"].map(formatting_func, batched=True)
+    print(f"총 샘플 수: {len(train_dataset)}")
 
 # =========================
 # 모델/토크나이저 로드 (QLoRA)
@@ -216,13 +225,19 @@ peft_config = LoraConfig(
 # 데이터 서브샘플링
 # =========================
 MAX_TRAIN_SAMPLES = 5000
-if len(train_dataset) > MAX_TRAIN_SAMPLES:
+if not STREAMING and len(train_dataset) > MAX_TRAIN_SAMPLES:
     train_dataset = train_dataset.shuffle(seed=42).select(range(MAX_TRAIN_SAMPLES))
 
 MAX_SEQ_LENGTH = 1024
 if hasattr(tokenizer, "model_max_length"):
     MAX_SEQ_LENGTH = min(MAX_SEQ_LENGTH, tokenizer.model_max_length)
 
+if STREAMING:
+    # 스트리밍은 길이를 모르므로 max_steps 로만 학습량을 정함
+    print("1) 스트리밍 데이터셋 준비 (토큰 샤드 캐시 + 패킹) ...")
+    manifest = build_token_shards(model_name, data_file, cache_root=TOKEN_CACHE_DIR)
+    train_dataset = build_packed_dataset(manifest, MAX_SEQ_LENGTH, shuffle_buffer=1000, seed=SEED)
+
 # =========================
 # 학습 설정
 # =========================
@@ -247,13 +262,14 @@ training_arguments = SFTConfig(
     learning_rate=2e-4,
     warmup_ratio=0.03,
     # dataloader_num_workers=2,           # for ubunut/
-    dataloader_num_workers=0,           # for windows
+    dataloader_num_workers=DATALOADER_WORKERS if STREAMING else 0,  # 비스트리밍은 windows 호환을 위해 0
     remove_unused_columns=False,
     # packing=True,                       # for ubuntu
     packing=False,                      # for windows
     # max_length=MAX_SEQ_LENGTH,
     # max_seq_length=MAX_SEQ_LENGTH,
     dataset_text_field="text",
+    dataset_kwargs={"skip_prepare_dataset": True} if STREAMING else None,  # 이미 토크나이즈/패킹됨
     seed=SEED,
     data_seed=SEED,
 )
@@ -270,6 +286,8 @@ trainer = SFTTrainer(
     eval_dataset=eval_ds,      # ← None으로 지정
     peft_config=peft_config,
     args=training_arguments,
+    # 패킹 블록: pad = eos 콜레이터는 문서 사이 EOS 를 -100 으로 가리므로 labels = input_ids
+    data_collator=collate_packed if STREAMING else None,
     callbacks=[metrics_cb, time_cb],
 )
 trainer.train()
@@ -0,0 +1,280 @@
+import os
+import json
+import time
+import hashlib
+import argparse
+import multiprocessing as mp
+from collections import deque
+
+import numpy as np
+from datasets import IterableDataset, load_dataset
+from transformers import AutoTokenizer, default_data_collator
+
+# 샤드 포맷이 바뀌면 올려서 기존 캐시를 무효화
+SHARD_FORMAT_VERSION = 1
+
+
+def format_example(code, desc):
+    # llama_fine_tuning.formatting_func 와 동일한 학습 텍스트
+    return f"Analyze the security vulnerabilities in the following code.\n\n{code}\n\nAnalysis:\n{desc}"
+
+
+# =========================
+# 캐시 키 (토크나이저 + 데이터 해시)
+# =========================
+def tokenizer_fingerprint(tokenizer):
+    h = hashlib.sha256()
+    if getattr(tokenizer, "is_fast", False):
+        h.update(tokenizer.backend_tokenizer.to_str().encode("utf-8"))
+    else:
+        h.update(json.dumps(sorted(tokenizer.get_vocab().items())).encode("utf-8"))
+    h.update(f"{tokenizer.bos_token_id}:{tokenizer.eos_token_id}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def data_fingerprint(data_files):
+    h = hashlib.sha256()
+    for path in sorted(data_files):
+        h.update(os.path.basename(path).encode("utf-8"))
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    return h.hexdigest()
+
+
+def shard_cache_dir(cache_root, tokenizer, data_files):
+    key = hashlib.sha256(
+        f"{SHARD_FORMAT_VERSION}:{tokenizer_fingerprint(tokenizer)}:{data_fingerprint(data_files)}".encode("utf-8")
+    ).hexdigest()[:16]
+    return os.path.join(cache_root, key)
+
+
+# =========================
+# 워커 프로세스 토크나이즈
+# =========================
+_worker_tokenizer = None
+
+
+def _init_worker(tokenizer_path):
+    global _worker_tokenizer
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    _worker_tokenizer = AutoTokenizer.from_pretrained(tokenizer_path, use_fast=True)
+
+
+def _tokenize_shard(args):
+    # 샘플마다 EOS를 붙여 하나의 토큰 배열로 이어 붙인 뒤 .npy 로 저장
+    shard_path, texts = args
+    encoded = _worker_tokenizer(texts, add_special_tokens=True).input_ids
+    eos = _worker_tokenizer.eos_token_id
+    lengths = np.array([len(ids) + 1 for ids in encoded], dtype=np.int32)
+    tokens = np.empty(int(lengths.sum()), dtype=np.uint32)
+    pos = 0
+    for ids in encoded:
+        tokens[pos:pos + len(ids)] = ids
+        tokens[pos + len(ids)] = eos
+        pos += len(ids) + 1
+
+    for path, array in ((shard_path + ".npy", tokens), (shard_path + ".len.npy", lengths)):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+    return os.path.basename(shard_path), len(texts), len(tokens)
+
+
+def _iter_text_chunks(data_files, shard_size, code_field, desc_field):
+    records = load_dataset("json", data_files=data_files, split="train", streaming=True)
+    chunk = []
+    for record in records:
+        chunk.append(format_example(record[code_field], record[desc_field]))
+        if len(chunk) == shard_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def build_token_shards(tokenizer_path, data_files, cache_root="./token_cache",
+                       shard_size=2048, num_proc=None, code_field="code", desc_field="desc"):
+    """
+    data_files 를 토크나이즈해 cache_root/<해시>/ 아래 샤드로 저장하고 manifest 를 돌려준다.
+    토크나이저와 데이터가 같으면 기존 샤드를 그대로 재사용한다.
+    """
+    if isinstance(data_files, str):
+        data_files = [data_files]
+    tokenizer = AutoTokenizer.from_pretrained(tokenizer_path, use_fast=True)
+    cache_dir = shard_cache_dir(cache_root, tokenizer, data_files)
+    manifest_path = os.path.join(cache_dir, "manifest.json")
+
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        print(f"[토큰 캐시 사용] {cache_dir} ({manifest['samples']} samples, {manifest['tokens']} tokens)")
+        return manifest
+
+    os.makedirs(cache_dir, exist_ok=True)
+    num_proc = num_proc or os.cpu_count() or 1
+    print(f"[토크나이즈] {data_files} -> {cache_dir} (workers={num_proc})")
+
+    t0 = time.perf_counter()
+    shards = []
+    # 메모리 상한: 처리 중인 청크는 워커 수의 2배까지만
+    ctx = mp.get_context("spawn")
+    with ctx.Pool(num_proc, initializer=_init_worker, initargs=(tokenizer_path,)) as pool:
+        pending = deque()
+        for idx, texts in enumerate(_iter_text_chunks(data_files, shard_size, code_field, desc_field)):
+            shard_path = os.path.join(cache_dir, f"shard_{idx:05d}")
+            pending.append(pool.apply_async(_tokenize_shard, ((shard_path, texts),)))
+            while len(pending) >= num_proc * 2:
+                shards.append(pending.popleft().get())
+        while pending:
+            shards.append(pending.popleft().get())
+    elapsed = time.perf_counter() - t0
+
+    manifest = {
+        "version": SHARD_FORMAT_VERSION,
+        "cache_dir": cache_dir,
+        "data_files": list(data_files),
+        "tokenizer": tokenizer_path,
+        "shards": [{"name": name, "samples": n, "tokens": t} for name, n, t in shards],
+        "samples": sum(n for _, n, _ in shards),
+        "tokens": sum(t for _, _, t in shards),
+        "tokenize_seconds": elapsed,
+    }
+    # manifest 가 있어야 완성된 캐시로 취급
+    with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+    print(f"[토크나이즈 완료] {manifest['samples']} samples, {manifest['tokens']} tokens, "
+          f"{elapsed:.1f}s ({manifest['samples'] / max(elapsed, 1e-9):.0f} samples/sec)")
+    return manifest
+
+
+# =========================
+# 시퀀스 패킹 스트리밍
+# =========================
+def iter_packed_blocks(shard_paths, seq_len):
+    """
+    샤드 토큰을 순서대로 이어 seq_len 길이 블록으로 잘라 낸다 (패딩 없음).
+    마지막에 남는 seq_len 미만 토큰은 버린다.
+    """
+    carry = np.empty(0, dtype=np.uint32)
+    for path in shard_paths:
+        tokens = np.load(path, mmap_mode="r")
+        start = 0
+        if len(carry):
+            need = seq_len - len(carry)
+            if len(tokens) < need:
+                carry = np.concatenate([carry, tokens])
+                continue
+            yield {"input_ids": np.concatenate([carry, tokens[:need]]).astype(np.int64).tolist()}
+            start = need
+        n_full = (len(tokens) - start) // seq_len
+        for i in range(n_full):
+            block = tokens[start + i * seq_len:start + (i + 1) * seq_len]
+            yield {"input_ids": block.astype(np.int64).tolist()}
+        carry = np.array(tokens[start + n_full * seq_len:])
+
+
+def build_packed_dataset(manifest, seq_len, shuffle_buffer=0, seed=42):
+    """
+    manifest 의 샤드로 패킹된 IterableDataset 을 만든다.
+    shard_paths 가 gen_kwargs 리스트라서 DataLoader 워커마다 샤드가 나뉘어 배정된다.
+    """
+    shard_paths = [os.path.join(manifest["cache_dir"], s["name"] + ".npy") for s in manifest["shards"]]
+    dataset = IterableDataset.from_generator(
+        iter_packed_blocks, gen_kwargs={"shard_paths": shard_paths, "seq_len": seq_len}
+    )
+    if shuffle_buffer:
+        dataset = dataset.shuffle(seed=seed, buffer_size=shuffle_buffer)
+    return dataset
+
+
+def collate_packed(features):
+    """
+    패킹 블록용 collate: 패딩이 없으므로 labels = input_ids.
+    pad = eos 인 LM 콜레이터는 문서 사이 EOS 를 -100 으로 가려 버린다.
+    """
+    batch = default_data_collator(features)
+    batch["labels"] = batch["input_ids"].clone()
+    return batch
+
+
+def padding_waste(manifest, seq_len):
+    # 샘플별 max_length 패딩(잘림 포함)과 비교한 낭비율
+    real = 0
+    count = 0
+    for shard in manifest["shards"]:
+        lengths = np.load(os.path.join(manifest["cache_dir"], shard["name"] + ".len.npy"))
+        real += int(np.minimum(lengths, seq_len).sum())
+        count += len(lengths)
+    return 1.0 - real / (count * seq_len) if count else 0.0
+
+
+# =========================
+# CPU 스모크 벤치마크
+# =========================
+def parse_args():
+    p = argparse.ArgumentParser(description="스트리밍/패킹 데이터셋 벤치마크 (CPU)")
+    p.add_argument("--model", type=str, default="hf-internal-testing/tiny-random-LlamaForCausalLM",
+                   help="토크나이저/모델 경로 (기본: 작은 랜덤 Llama)")
+    p.add_argument("--data", type=str, nargs="+", default=["./data/Code_Vuln_DPO/secure_programming_dpo_flat.json"])
+    p.add_argument("--cache_dir", type=str, default="./token_cache")
+    p.add_argument("--seq_len", type=int, default=1024)
+    p.add_argument("--shard_size", type=int, default=2048)
+    p.add_argument("--num_proc", type=int, default=None, help="토크나이즈 워커 수")
+    p.add_argument("--workers", type=int, default=2, help="DataLoader 워커 수")
+    p.add_argument("--batch_size", type=int, default=4)
+    p.add_argument("--train_steps", type=int, default=0, help="0보다 크면 CPU에서 짧게 학습")
+    return p.parse_args()
+
+
+def main():
+    import torch
+    from torch.utils.data import DataLoader
+    from transformers import AutoModelForCausalLM, Trainer, TrainingArguments
+
+    args = parse_args()
+    manifest = build_token_shards(args.model, args.data, cache_root=args.cache_dir,
+                                  shard_size=args.shard_size, num_proc=args.num_proc)
+    print(f"패딩 낭비율 (샘플별 {args.seq_len} 패딩 대비): {padding_waste(manifest, args.seq_len):.1%}")
+
+    dataset = build_packed_dataset(manifest, args.seq_len)
+
+    # 데이터 경로만 측정
+    loader = DataLoader(dataset.with_format("torch"), batch_size=args.batch_size,
+                        num_workers=args.workers, collate_fn=collate_packed)
+    t0 = time.perf_counter()
+    blocks = 0
+    for batch in loader:
+        blocks += batch["input_ids"].shape[0]
+    elapsed = time.perf_counter() - t0
+    print(f"[DataLoader] {blocks} packed blocks in {elapsed:.2f}s "
+          f"({blocks / max(elapsed, 1e-9):.1f} samples/sec, "
+          f"{blocks * args.seq_len / max(elapsed, 1e-9):.0f} tokens/sec)")
+
+    if args.train_steps > 0:
+        model = AutoModelForCausalLM.from_pretrained(args.model, dtype=torch.float32)
+        trainer = Trainer(
+            model=model,
+            args=TrainingArguments(
+                output_dir=os.path.join(args.cache_dir, "smoke-run"),
+                per_device_train_batch_size=args.batch_size,
+                max_steps=args.train_steps,
+                logging_steps=max(1, args.train_steps // 5),
+                save_strategy="no",
+                report_to="none",
+                use_cpu=True,
+                dataloader_num_workers=args.workers,
+            ),
+            train_dataset=dataset,
+            data_collator=collate_packed,
+        )
+        metrics = trainer.train().metrics
+        print(f"[CPU 스모크 학습] {metrics.get('train_samples_per_second', 0):.2f} samples/sec, "
+              f"{metrics.get('train_runtime', 0):.1f}s")
+
+
+if __name__ == "__main__":
+    main()
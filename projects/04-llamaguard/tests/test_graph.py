@@ -0,0 +1,68 @@
+# 04-llamaguard/tests/test_graph.py
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("langgraph")
+pytest.importorskip("torch")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "workflow"))
+
+import graph  # noqa: E402
+import nodes  # noqa: E402
+
+
+class EchoBackend:
+    """Inference backend stub: the analysis names the code it was given."""
+
+    def __init__(self):
+        self.codes = []
+
+    def analyze(self, code, max_new_tokens=512):
+        self.codes.append(code)
+        return f"No issues detected in: {code}"
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    stub = EchoBackend()
+    monkeypatch.setattr(nodes, "_get_inference_backend", lambda: stub)
+    monkeypatch.setattr(nodes, "get_result_cache", lambda: None)
+    return stub
+
+
+def test_run_analysis_starts_from_fresh_state(backend):
+    graph.run_analysis("print(1)")
+    second = graph.run_analysis("os.system(input())")
+
+    assert backend.codes == ["print(1)", "os.system(input())"]
+    assert "os.system(input())" in second["report"]
+    assert "print(1)" not in second["report"]
+
+
+def test_same_thread_does_not_reuse_previous_analysis(backend):
+    graph.run_analysis("print(1)", thread_id="shared")
+    second = graph.run_analysis("os.system(input())", thread_id="shared")
+
+    assert backend.codes == ["print(1)", "os.system(input())"]
+    assert "print(1)" not in second["report"]
+
+
+def test_run_analysis_async_starts_from_fresh_state(backend, monkeypatch):
+    import asyncio
+    speculated = []
+    monkeypatch.setattr(nodes.config, "SPECULATIVE_RAG_ENABLED", True)
+    monkeypatch.setattr(nodes, "_retrieve_cves", lambda query: (speculated.append(query), ([], []))[1])
+    # The first snippet is reported as vulnerable, so it runs RAG and CVSS scoring
+    monkeypatch.setattr(backend, "analyze", lambda code, max_new_tokens=512: (
+        backend.codes.append(code),
+        f"Command injection in: {code}" if code.startswith("a_") else f"No issues detected in: {code}",
+    )[1])
+
+    first = asyncio.run(graph.run_analysis_async("a_first()"))
+    second = asyncio.run(graph.run_analysis_async("b_totally_different()"))
+
+    assert backend.codes == ["a_first()", "b_totally_different()"]
+    assert "final_severity" in first and "final_severity" not in second
+    assert "b_totally_different()" in second["initial_analysis"]
+    assert any("b_totally_different()" in query for query in speculated)
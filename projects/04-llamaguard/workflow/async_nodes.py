@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+async_nodes.py
+
+Async node implementations for the LlamaGuard async graph (graph.build_async_graph).
+
+Blocking work (LLaMA generation, FAISS search, report generation) runs in
+worker threads; patch generation for several matched vulnerabilities is
+issued concurrently through the pooled AsyncOpenAI client.
+"""
+
+import re
+import asyncio
+from typing import Dict, Any, List
+
+from config import config
+from state import AgentState
+from services.patch_service import process_input_async
+from nodes import (
+    initial_analysis_node,
+    speculative_rag_node,
+    rag_node,
+    report_generation_node,
+    detect_language,
+    severity_branch,
+)
+
+
+async def async_initial_analysis_node(state: AgentState) -> Dict[str, Any]:
+    """initial_analysis_node in a worker thread (runs next to speculative RAG)."""
+    return await asyncio.to_thread(initial_analysis_node, state)
+
+
+async def async_speculative_rag_node(state: AgentState) -> Dict[str, Any]:
+    """
+    speculative_rag_node in a worker thread. No-op when disabled or when the
+    analysis is already given (the caller may pass its own speculative results).
+    """
+    if not config.SPECULATIVE_RAG_ENABLED or state.get("precomputed_analysis"):
+        return {}
+    return await asyncio.to_thread(speculative_rag_node, state)
+
+
+def join_node(state: AgentState) -> Dict[str, Any]:
+    """Wait for analysis and speculative retrieval before detection_branch."""
+    return {}
+
+
+def speculation_matches_analysis(analysis: str, speculative_matches: List[str]) -> bool:
+    """
+    Whether speculatively retrieved CVEs agree with the LLaMA analysis.
+
+    The vulnerability types named in the analysis (config.VULN_PATTERNS) must
+    appear among the CWE names of the speculative hits. If the analysis names
+    no known type, any non-empty speculative result is accepted.
+    """
+    if not speculative_matches:
+        return False
+
+    analysis_types = [
+        name for pattern, name in config.VULN_PATTERNS
+        if re.search(pattern, analysis, re.IGNORECASE)
+    ]
+    if not analysis_types:
+        return True
+
+    matched_text = " ".join(speculative_matches).lower()
+    return any(name.lower() in matched_text for name in analysis_types)
+
+
+async def async_rag_node(state: AgentState) -> Dict[str, Any]:
+    """
+    Use the speculative retrieval when it agrees with the analysis,
+    otherwise fall back to rag_node (query = initial analysis).
+    """
+    print("\n--- RAG NODE (async) ---")
+
+    speculative_vulns = state.get("speculative_vulnerabilities", []) or []
+    speculative_matches = state.get("speculative_matches", []) or []
+
+    if speculation_matches_analysis(state.get("initial_analysis", ""), speculative_matches):
+        print(f"Using speculative retrieval: {len(speculative_vulns)} CVEs, {speculative_matches}")
+        return {
+            "retrieved_vulnerabilities": speculative_vulns,
+            "matched_vulnerabilities": speculative_matches,
+        }
+
+    print("Speculative retrieval rejected, searching with the analysis")
+    return await asyncio.to_thread(rag_node, state)
+
+
+async def async_vulnerability_fix_node(state: AgentState) -> Dict[str, Any]:
+    """
+    Generate one patch per matched vulnerability concurrently.
+
+    Updates:
+        - patches: [{"vuln", "code_snippet", "decision"}] per matched vulnerability
+        - fixed_code: Patch for the primary (first) vulnerability
+    """
+    print("\n--- VULNERABILITY FIX NODE (async) ---")
+
+    input_code = state.get("input_code", "") or ""
+    matched = state.get("matched_vulnerabilities", []) or ["UNKNOWN_VULNERABILITY"]
+    final_severity = state.get("final_severity", "0")
+    language = state.get("language") or detect_language(input_code)
+
+    try:
+        normalized_score = float(final_severity) / 10.0
+    except ValueError:
+        normalized_score = 0.0
+
+    print(f"Processing {len(matched)} vulnerabilities concurrently: {matched}")
+
+    results = await asyncio.gather(
+        *(process_input_async(input_code, vuln, normalized_score, language) for vuln in matched),
+        return_exceptions=True,
+    )
+
+    patches = []
+    for vuln, result in zip(matched, results):
+        if isinstance(result, Exception):
+            print(f"ERROR: patch generation failed for {vuln}: {result}")
+            patches.append({"vuln": vuln, "code_snippet": "", "decision": "error"})
+            continue
+        snippet = result.get("patched_code", {}).get("code_snippet", "")
+        patches.append({"vuln": vuln, "code_snippet": snippet, "decision": result.get("decision", "patched")})
+        print(f"  {vuln}: {len(snippet)} chars")
+
+    return {
+        "patches": patches,
+        "fixed_code": patches[0]["code_snippet"] if patches else "",
+    }
+
+
+async def async_report_generation_node(state: AgentState) -> Dict[str, Any]:
+    """report_generation_node in a worker thread (runs next to patch generation)."""
+    return await asyncio.to_thread(report_generation_node, state)
+
+
+def async_severity_branch(state: AgentState):
+    """
+    severity_branch for the async graph: on high severity, patch generation
+    and report generation run in parallel (the report does not read fixed_code).
+    """
+    route = severity_branch(state)
+    if route == "vulnerability_fix_node":
+        return ["vulnerability_fix_node", "report_generation_node"]
+    return route
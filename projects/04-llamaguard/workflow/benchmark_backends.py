@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+benchmark_backends.py
+
+Compare LLaMA inference backends on a fixed vulnerable-code sample set.
+
+For each backend the script reports load time, generated tokens/sec,
+samples/sec and detection accuracy (severity "clean" = safe, anything
+else = vulnerable, classified with the same keywords as the workflow).
+Accuracy and agreement are reported relative to the first backend.
+
+Usage:
+    python workflow/benchmark_backends.py --backends hf cpu --limit 20
+    LLAMAGUARD_CPU_QUANT=int4 python workflow/benchmark_backends.py --backends hf cpu
+"""
+
+import os
+import json
+import time
+import argparse
+from typing import Dict, List
+
+from config import config
+from nodes import is_vulnerable_analysis
+from services.inference_backend import BACKENDS, load_backend
+
+
+DEFAULT_SAMPLES = os.path.join(config.CVE_DIR, "security_test_dataset.json")
+
+
+def load_samples(path: str, limit: int = None) -> List[Dict]:
+    with open(path, "r", encoding=config.DEFAULT_ENCODING) as f:
+        samples = json.load(f)
+    return samples[:limit] if limit else samples
+
+
+def benchmark_backend(name: str, samples: List[Dict], max_new_tokens: int) -> Dict[str, object]:
+    """Run every sample through one backend and collect timings and verdicts."""
+    start = time.perf_counter()
+    backend = load_backend(name)
+    load_seconds = time.perf_counter() - start
+
+    verdicts, outputs = [], []
+    tokens = 0
+    generate_seconds = 0.0
+    for i, sample in enumerate(samples, 1):
+        start = time.perf_counter()
+        analysis = backend.analyze(sample["code"], max_new_tokens=max_new_tokens)
+        generate_seconds += time.perf_counter() - start
+
+        tokens += backend.count_tokens(analysis)
+        outputs.append(analysis)
+        verdicts.append(is_vulnerable_analysis(analysis))
+        print(f"  [{name}] {i}/{len(samples)} {sample.get('filename', '')}")
+
+    expected = [sample.get("severity") != "clean" for sample in samples]
+    correct = sum(v == e for v, e in zip(verdicts, expected))
+
+    return {
+        "backend": name,
+        "load_seconds": load_seconds,
+        "generate_seconds": generate_seconds,
+        "tokens": tokens,
+        "tokens_per_second": tokens / generate_seconds if generate_seconds > 0 else 0.0,
+        "samples_per_second": len(samples) / generate_seconds if generate_seconds > 0 else 0.0,
+        "accuracy": correct / len(samples) if samples else 0.0,
+        "verdicts": verdicts,
+        "outputs": outputs,
+    }
+
+
+def format_results(results: List[Dict[str, object]], sample_count: int) -> str:
+    baseline = results[0]
+    report = f"# Inference backend benchmark ({sample_count} samples)\n\n"
+    report += "| Backend | Load (s) | Tokens/sec | Samples/sec | Accuracy | Δ Accuracy | Agreement |\n"
+    report += "|---|---|---|---|---|---|---|\n"
+    for result in results:
+        agreement = sum(
+            a == b for a, b in zip(result["verdicts"], baseline["verdicts"])
+        ) / sample_count if sample_count else 0.0
+        report += (
+            f"| {result['backend']} | {result['load_seconds']:.1f} "
+            f"| {result['tokens_per_second']:.1f} | {result['samples_per_second']:.2f} "
+            f"| {result['accuracy']:.1%} | {result['accuracy'] - baseline['accuracy']:+.1%} "
+            f"| {agreement:.1%} |\n"
+        )
+    return report
+
+
+def main():
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark LlamaGuard inference backends")
+    parser.add_argument("--backends", nargs="+", default=["hf", "cpu"], choices=list(BACKENDS),
+                        help="Backends to compare; the first one is the accuracy baseline")
+    parser.add_argument("--samples", type=str, default=DEFAULT_SAMPLES, help="Sample set (JSON list)")
+    parser.add_argument("--limit", type=int, default=None, help="Use only the first N samples")
+    parser.add_argument("--max_new_tokens", type=int, default=config.MAX_NEW_TOKENS)
+    parser.add_argument("--json", type=str, default=None, help="Path to save raw results as JSON")
+    args = parser.parse_args()
+
+    samples = load_samples(args.samples, args.limit)
+    print(f"Loaded {len(samples)} samples from {args.samples}")
+
+    results = []
+    for name in args.backends:
+        print(f"\n=== Backend: {name} ===")
+        results.append(benchmark_backend(name, samples, args.max_new_tokens))
+
+    print("\n" + "=" * 80)
+    print(format_results(results, len(samples)))
+
+    if args.json:
+        with open(args.json, "w", encoding=config.DEFAULT_ENCODING) as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Results saved to: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,7 +25,10 @@ class Config:
     # CVE database paths
     CVE_DIR = os.path.join(PROJECT_DIR, "CVE")
     CVE_INDEX_PATH = os.path.join(CVE_DIR, "cve_index.faiss")
-    CVE_DATA_PATH = os.path.join(CVE_DIR, "cve_data.pkl")
+    # Memory-mapped corpus (cve_vectordb.py --from-pickle converts the legacy pickle)
+    CVE_CORPUS_PATH = os.path.join(CVE_DIR, "cve_corpus.jsonl")
+    CVE_DATA_PATH = (CVE_CORPUS_PATH if os.path.exists(CVE_CORPUS_PATH)
+                     else os.path.join(CVE_DIR, "cve_data.pkl"))
 
     # ============================================================================
     # MODEL SETTINGS
@@ -38,6 +41,20 @@ class Config:
     DO_SAMPLE = False   # False for deterministic output
     TOP_P = None
 
+    # Inference backend: "hf" (transformers, device_map=auto), "cpu" (quantized
+    # int8/int4 on CPU), "onnx" (ONNX Runtime) or "llamacpp" (GGUF)
+    INFERENCE_BACKEND = os.environ.get('LLAMAGUARD_BACKEND', 'hf')
+    CPU_QUANTIZATION = os.environ.get('LLAMAGUARD_CPU_QUANT', 'int8')  # int8 | int4 | none
+    CPU_THREADS = int(os.environ.get('LLAMAGUARD_CPU_THREADS', '0'))  # 0 = torch default
+    ONNX_MODEL_PATH = os.path.join(MODEL_DIR, "merged-vuln-detector-onnx")
+    GGUF_MODEL_PATH = os.environ.get(
+        'LLAMAGUARD_GGUF_PATH', os.path.join(MODEL_DIR, "merged-vuln-detector.Q4_K_M.gguf")
+    )
+    LLAMACPP_N_CTX = 4096
+
+    # Bump when build_prompt() changes so cached analyses are not reused
+    ANALYSIS_PROMPT_VERSION = "v1"
+
     # ============================================================================
     # CVE & RAG SETTINGS
     # ============================================================================
@@ -45,6 +62,10 @@ class Config:
     # Number of similar CVEs to retrieve
     CVE_TOP_K = 5
 
+    # Async graph: retrieve CVEs from the code while LLaMA is still generating
+    SPECULATIVE_RAG_ENABLED = True
+    SPECULATIVE_QUERY_CHARS = 1500
+
     # Maximum CVE text length for state storage (characters)
     CVE_TEXT_TRUNCATE_LENGTH = 200
 
@@ -106,6 +127,9 @@ class Config:
     UPSTAGE_TEMPERATURE = 0.0
     UPSTAGE_MAX_TOKENS = 1200
 
+    # Concurrent Solar requests (pooled connections) in the async graph
+    PATCH_MAX_CONCURRENCY = 4
+
     # ============================================================================
     # LANGUAGE DETECTION
     # ============================================================================
@@ -118,6 +142,61 @@ class Config:
         'python': ['def ', 'import ', 'class '],  # default
     }
 
+    # File extension -> language (checked before LANG_PATTERNS when a path is known)
+    LANG_EXTENSIONS = {
+        '.py': 'python',
+        '.js': 'javascript', '.jsx': 'javascript', '.mjs': 'javascript',
+        '.ts': 'javascript', '.tsx': 'javascript',
+        '.java': 'java',
+        '.php': 'php',
+    }
+
+    # ============================================================================
+    # RESULT CACHE
+    # ============================================================================
+
+    # On-disk cache of LLaMA analyses and Solar patches (SQLite)
+    RESULT_CACHE_ENABLED = os.environ.get('LLAMAGUARD_CACHE', '1') != '0'
+    RESULT_CACHE_PATH = os.environ.get(
+        'LLAMAGUARD_CACHE_PATH', os.path.join(PROJECT_DIR, '.cache', 'results.sqlite')
+    )
+    RESULT_CACHE_MAX_MB = int(os.environ.get('LLAMAGUARD_CACHE_MAX_MB', '256'))
+
+    # ============================================================================
+    # REPOSITORY SCAN SETTINGS
+    # ============================================================================
+
+    # Prompts per batched model.generate call
+    SCAN_BATCH_SIZE = 8
+
+    # Directories never descended into
+    SCAN_SKIP_DIRS = {
+        '.git', '.hg', '.svn', 'node_modules', '__pycache__', '.venv', 'venv',
+        'env', 'build', 'dist', '.tox', '.mypy_cache', '.pytest_cache',
+    }
+
+    # Files larger than this are skipped (bytes)
+    SCAN_MAX_FILE_BYTES = 512 * 1024
+
+    # Units shorter than this (non-blank lines) are not analyzed
+    SCAN_MIN_UNIT_LINES = 3
+
+    # ============================================================================
+    # SCAN SERVICE (server.py)
+    # ============================================================================
+
+    SERVER_HOST = os.environ.get('LLAMAGUARD_HOST', '127.0.0.1')
+    SERVER_PORT = int(os.environ.get('LLAMAGUARD_PORT', '8000'))
+
+    # Concurrent requests are merged into one analyze_batch call of at most
+    # SERVER_MAX_BATCH_SIZE prompts, waiting up to SERVER_MAX_BATCH_WAIT_MS for more
+    SERVER_MAX_BATCH_SIZE = int(os.environ.get('LLAMAGUARD_MAX_BATCH', '8'))
+    SERVER_MAX_BATCH_WAIT_MS = int(os.environ.get('LLAMAGUARD_BATCH_WAIT_MS', '50'))
+
+    # Finished jobs kept for polling; latency samples used for p50/p99
+    SERVER_MAX_JOBS = 1000
+    SERVER_LATENCY_WINDOW = 1000
+
     # ============================================================================
     # WORKFLOW SETTINGS
     # ============================================================================
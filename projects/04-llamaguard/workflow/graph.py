@@ -7,8 +7,11 @@ LangGraph workflow construction and execution for LlamaGuard vulnerability analy
 
 import sys
 import os
+import asyncio
 import argparse
-from langgraph.graph import StateGraph, END
+import uuid
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import InMemorySaver
 
 from state import AgentState
@@ -38,12 +41,25 @@ from nodes import (
     detection_branch,
     severity_branch,
 )
+from async_nodes import (
+    async_initial_analysis_node,
+    async_speculative_rag_node,
+    join_node,
+    async_rag_node,
+    async_vulnerability_fix_node,
+    async_report_generation_node,
+    async_severity_branch,
+)
 
 
-def build_graph():
+def build_graph(checkpointer: bool = True):
     """
     Build the LangGraph StateGraph for vulnerability analysis workflow.
 
+    Args:
+        checkpointer: Attach an InMemorySaver (keeps state per thread_id).
+            One-shot callers such as batch scans should pass False.
+
     Workflow:
         START
           ↓
@@ -107,19 +123,180 @@ def build_graph():
     workflow.add_edge("report_generation_node", END)
 
     # Compile graph
-    memory = InMemorySaver()
+    memory = InMemorySaver() if checkpointer else None
     graph = workflow.compile(checkpointer=memory)
 
     return graph
 
 
-def run_analysis(input_code: str, thread_id: str = "default"):
+_graph = None
+_stateless_graph = None
+
+
+def get_graph(checkpointer: bool = True):
+    """
+    Return the compiled workflow graph, building it once per process.
+
+    Args:
+        checkpointer: False returns a variant compiled without a checkpointer
+    """
+    global _graph, _stateless_graph
+    if not checkpointer:
+        if _stateless_graph is None:
+            _stateless_graph = build_graph(checkpointer=False)
+        return _stateless_graph
+    if _graph is None:
+        _graph = build_graph()
+    return _graph
+
+
+def build_async_graph(checkpointer: bool = True):
+    """
+    Build the async variant of the workflow (use with ainvoke / astream).
+
+    Args:
+        checkpointer: Attach an InMemorySaver (keeps state per thread_id).
+            Long-running callers that read results from the stream should pass False.
+
+    Workflow:
+        START
+          ├─ initial_analysis_node      (LLaMA, worker thread)
+          └─ speculative_rag_node       (CVE search on a code-derived query)
+          ↓
+        join_node
+          ↓
+        detection_branch
+          ├─ False → report_generation_node → END
+          └─ True → rag_node (speculative hits if they agree with the analysis)
+                      ↓
+                    cvss_calculation_node
+                      ↓
+                    async_severity_branch
+                      ├─ False → report_generation_node → END
+                      └─ True → vulnerability_fix_node (concurrent patches) → END
+                                report_generation_node                    → END
+    """
+    workflow = StateGraph(AgentState)
+
+    workflow.add_node("initial_analysis_node", async_initial_analysis_node)
+    workflow.add_node("speculative_rag_node", async_speculative_rag_node)
+    workflow.add_node("join_node", join_node)
+    workflow.add_node("rag_node", async_rag_node)
+    workflow.add_node("cvss_calculation_node", cvss_calculation_node)
+    workflow.add_node("vulnerability_fix_node", async_vulnerability_fix_node)
+    workflow.add_node("report_generation_node", async_report_generation_node)
+
+    # Analysis and speculative retrieval run in the same superstep
+    workflow.add_edge(START, "initial_analysis_node")
+    workflow.add_edge(START, "speculative_rag_node")
+    workflow.add_edge(["initial_analysis_node", "speculative_rag_node"], "join_node")
+
+    workflow.add_conditional_edges(
+        "join_node",
+        detection_branch,
+        {
+            "rag_node": "rag_node",
+            "report_generation_node": "report_generation_node",
+        }
+    )
+
+    workflow.add_edge("rag_node", "cvss_calculation_node")
+
+    # High severity fans out to fix + report (the report does not use fixed_code)
+    workflow.add_conditional_edges(
+        "cvss_calculation_node",
+        async_severity_branch,
+        ["vulnerability_fix_node", "report_generation_node"],
+    )
+
+    workflow.add_edge("vulnerability_fix_node", END)
+    workflow.add_edge("report_generation_node", END)
+
+    memory = InMemorySaver() if checkpointer else None
+    return workflow.compile(checkpointer=memory)
+
+
+_async_graph = None
+_stateless_async_graph = None
+
+
+def get_async_graph(checkpointer: bool = True):
+    """
+    Return the compiled async workflow graph, building it once per process.
+
+    Args:
+        checkpointer: False returns a variant compiled without a checkpointer
+    """
+    global _async_graph, _stateless_async_graph
+    if not checkpointer:
+        if _stateless_async_graph is None:
+            _stateless_async_graph = build_async_graph(checkpointer=False)
+        return _stateless_async_graph
+    if _async_graph is None:
+        _async_graph = build_async_graph()
+    return _async_graph
+
+
+async def astream_analysis(input_code: str, thread_id: Optional[str] = None, checkpointer: bool = True,
+                           **initial_state: Any) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Run the async workflow and yield (node_name, node_output) as each node finishes.
+
+    Args:
+        input_code: Source code to analyze
+        thread_id: Thread ID for checkpointing (default: a new one per run)
+        checkpointer: False runs on the graph without a checkpointer; the
+            final state is then only available from the yielded outputs
+        **initial_state: Extra state fields (e.g. language, precomputed_analysis)
+    """
+    graph = get_async_graph(checkpointer)
+    config = {"configurable": {"thread_id": thread_id or uuid.uuid4().hex}}
+    state = {"input_code": input_code, "precomputed_analysis": "", **initial_state}
+
+    async for update in graph.astream(state, config, stream_mode="updates"):
+        for node_name, node_output in update.items():
+            yield node_name, node_output or {}
+
+
+async def run_analysis_async(input_code: str, thread_id: Optional[str] = None):
+    """
+    Async counterpart of run_analysis().
+
+    Args:
+        input_code: Source code to analyze
+        thread_id: Thread ID for checkpointing (default: a new one per run)
+
+    Returns:
+        Final state dictionary with analysis results
+    """
+    print("\n" + "=" * 80)
+    print("LlamaGuard Vulnerability Analysis (async)")
+    print("=" * 80)
+
+    # The final state is read back from this run's checkpoint
+    thread_id = thread_id or uuid.uuid4().hex
+
+    async for node_name, _ in astream_analysis(input_code, thread_id):
+        print(f"\n[{node_name}] completed")
+
+    graph = get_async_graph()
+    final_state = (await graph.aget_state({"configurable": {"thread_id": thread_id}})).values
+
+    print("\n" + "=" * 80)
+    print("Analysis Complete")
+    print("=" * 80)
+
+    return final_state
+
+
+def run_analysis(input_code: str, thread_id: Optional[str] = None):
     """
     Run vulnerability analysis on the provided code.
 
     Args:
         input_code: Source code to analyze
-        thread_id: Thread ID for checkpointing (default: "default")
+        thread_id: Thread ID for checkpointing (default: a new one per run, so
+            state of earlier runs on the shared graph is never merged in)
 
     Returns:
         Final state dictionary with analysis results
@@ -128,16 +305,17 @@ def run_analysis(input_code: str, thread_id: str = "default"):
     print("LlamaGuard Vulnerability Analysis")
     print("=" * 80)
 
-    # Build graph
-    graph = build_graph()
+    # Compiled graph is reused across calls
+    graph = get_graph()
 
     # Initial state
     initial_state = {
         "input_code": input_code,
+        "precomputed_analysis": "",
     }
 
     # Run graph
-    config = {"configurable": {"thread_id": thread_id}}
+    config = {"configurable": {"thread_id": thread_id or uuid.uuid4().hex}}
     final_state = None
 
     for state in graph.stream(initial_state, config):
@@ -159,6 +337,8 @@ def main():
     parser.add_argument("--code", type=str, help="Code to analyze (direct input)")
     parser.add_argument("--code_file", type=str, help="Path to code file to analyze")
     parser.add_argument("--output", type=str, default=None, help="Path to save report")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Use the async graph (speculative RAG, concurrent patches)")
     args = parser.parse_args()
 
     # Get input code
@@ -180,7 +360,10 @@ def main():
         print("[Input] Using default example (SQL Injection)")
 
     # Run analysis
-    final_state = run_analysis(code)
+    if args.use_async:
+        final_state = asyncio.run(run_analysis_async(code))
+    else:
+        final_state = run_analysis(code)
 
     # Print report
     if final_state and "report" in final_state:
@@ -8,7 +8,7 @@ LangGraph workflow nodes for LlamaGuard vulnerability analysis system.
 import os
 import sys
 import re
-from typing import Dict, Any, Literal
+from typing import Dict, Any, List, Literal, Tuple
 
 # Add parent directory to path
 parent_dir = os.path.join(os.path.dirname(__file__), '..')
@@ -19,8 +19,10 @@ sys.path.append(os.path.join(parent_dir, 'llama-model'))
 from config import config
 
 # Import services
-from services.llama_service import load_model, analyze_code, load_cve_db, search_cves
+from services.llama_service import load_cve_db, search_cves
+from services.inference_backend import load_backend
 from services.patch_service import process_input, generate_security_report
+from services.result_cache import get_result_cache, analysis_cache_key
 
 # Import CVE classes (needed for pickle deserialization)
 from CVE.cve_vectordb import CVEEntry
@@ -28,35 +30,41 @@ from CVE.cve_vectordb import CVEEntry
 # Import state definitions
 from state import AgentState
 
-# Import LLaMA utilities
-from llama_predict import resolve_dtype
-
 # ============================================================================
 # Global model instances (lazy loading)
 # ============================================================================
-_llama_tokenizer = None
-_llama_model = None
+_inference_backend = None
 _cve_db = None
 
 
-def _get_llama_model():
+def _get_inference_backend():
     """
-    Lazy load LLaMA model (singleton pattern).
+    Lazy load the configured LLaMA inference backend (singleton pattern).
 
     Returns:
-        Tuple of (tokenizer, model)
+        InferenceBackend instance (see config.INFERENCE_BACKEND)
 
     Raises:
         RuntimeError: If model loading fails
     """
-    global _llama_tokenizer, _llama_model
-    if _llama_tokenizer is None or _llama_model is None:
+    global _inference_backend
+    if _inference_backend is None:
         try:
-            dtype = resolve_dtype(config.MODEL_DTYPE)
-            _llama_tokenizer, _llama_model = load_model(config.MODEL_PATH, dtype)
+            _inference_backend = load_backend(config.INFERENCE_BACKEND)
         except Exception as e:
             raise RuntimeError(f"Failed to initialize LLaMA model: {e}")
-    return _llama_tokenizer, _llama_model
+    return _inference_backend
+
+
+def is_vulnerable_analysis(analysis: str) -> bool:
+    """Classify an analysis text using the configured vulnerable/safe keywords."""
+    analysis_lower = analysis.lower()
+    is_vulnerable = any(keyword in analysis_lower for keyword in config.VULN_KEYWORDS)
+
+    # Also check for explicit "no vulnerabilities" or "safe" indicators
+    if any(keyword in analysis_lower for keyword in config.SAFE_KEYWORDS):
+        is_vulnerable = False
+    return is_vulnerable
 
 
 def _get_cve_db():
@@ -78,6 +86,28 @@ def _get_cve_db():
     return _cve_db
 
 
+def detect_language(code: str, path: str = None) -> str:
+    """
+    Detect programming language from file extension, then LANG_PATTERNS.
+
+    Args:
+        code: Source code
+        path: Optional file path (extension takes precedence)
+
+    Returns:
+        Language name (default: "python")
+    """
+    if path:
+        ext = os.path.splitext(path)[1].lower()
+        if ext in config.LANG_EXTENSIONS:
+            return config.LANG_EXTENSIONS[ext]
+
+    for lang, patterns in config.LANG_PATTERNS.items():
+        if any(pattern in code for pattern in patterns):
+            return lang
+    return "python"
+
+
 # ============================================================================
 # NODE IMPLEMENTATIONS
 # ============================================================================
@@ -85,7 +115,8 @@ def _get_cve_db():
 def initial_analysis_node(state: AgentState) -> Dict[str, Any]:
     """
     Initial vulnerability analysis using fine-tuned LLaMA model.
-    Uses analyze.py::analyze_code() function.
+    Uses analyze.py::analyze_code() function. If the caller passed
+    precomputed_analysis (batched scan), generation is skipped.
 
     Updates:
         - initial_analysis: LLaMA's vulnerability analysis text
@@ -101,20 +132,28 @@ def initial_analysis_node(state: AgentState) -> Dict[str, Any]:
             "is_detected": False,
         }
 
-    # Load LLaMA model
-    tokenizer, llama_model = _get_llama_model()
+    cache = get_result_cache()
+    cache_key = analysis_cache_key(input_code)
 
-    # Analyze code
-    print(f"Analyzing code ({len(input_code)} chars)...")
-    analysis_result = analyze_code(input_code, tokenizer, llama_model, max_new_tokens=config.MAX_NEW_TOKENS)
+    # Not initial_analysis: with a checkpointer that may still hold a previous run's result
+    analysis_result = state.get("precomputed_analysis")
+    if analysis_result:
+        # Precomputed by a batched generate call (repository scan mode)
+        print(f"Using precomputed analysis ({len(analysis_result)} chars)")
+    elif cache is not None and (analysis_result := cache.get("analysis", cache_key)):
+        print(f"Using cached analysis ({len(analysis_result)} chars)")
+    else:
+        # Load LLaMA model
+        backend = _get_inference_backend()
 
-    # Determine if vulnerability detected using configured keywords
-    analysis_lower = analysis_result.lower()
-    is_vulnerable = any(keyword in analysis_lower for keyword in config.VULN_KEYWORDS)
+        # Analyze code
+        print(f"Analyzing code ({len(input_code)} chars)...")
+        analysis_result = backend.analyze(input_code, max_new_tokens=config.MAX_NEW_TOKENS)
+        if cache is not None:
+            cache.set("analysis", cache_key, analysis_result)
 
-    # Also check for explicit "no vulnerabilities" or "safe" indicators
-    if any(keyword in analysis_lower for keyword in config.SAFE_KEYWORDS):
-        is_vulnerable = False
+    # Determine if vulnerability detected using configured keywords
+    is_vulnerable = is_vulnerable_analysis(analysis_result)
 
     print(f"Analysis complete. Vulnerabilities detected: {is_vulnerable}")
 
@@ -124,54 +163,30 @@ def initial_analysis_node(state: AgentState) -> Dict[str, Any]:
     }
 
 
-def rag_node(state: AgentState) -> Dict[str, Any]:
+def _retrieve_cves(query: str) -> Tuple[List[Dict[str, Any]], List[str]]:
     """
-    Retrieve similar CVEs from vector database using RAG.
-    Uses analyze.py::search_cves() function.
+    Search the CVE database and format the hits for state.
 
-    Updates:
-        - retrieved_vulnerabilities: List of similar CVE entries
-        - matched_vulnerabilities: List of vulnerability type names
+    Returns:
+        (retrieved vulnerabilities, vulnerability type names from their CWEs)
     """
-    print("\n--- RAG NODE ---")
-
-    initial_analysis = state.get("initial_analysis", "")
-    if not initial_analysis:
-        print("WARNING: No initial analysis available")
-        return {
-            "retrieved_vulnerabilities": [],
-            "matched_vulnerabilities": [],
-        }
-
     # Load CVE database
     cve_db = _get_cve_db()
     if cve_db is None:
         print("ERROR: CVE database not available")
-        return {
-            "retrieved_vulnerabilities": [],
-            "matched_vulnerabilities": [],
-        }
+        return [], []
 
     # Search for similar CVEs
-    print(f"Searching CVE database with query: {initial_analysis[:100]}...")
-    cve_results = search_cves(initial_analysis, cve_db, top_k=config.CVE_TOP_K)
+    print(f"Searching CVE database with query: {query[:100]}...")
+    cve_results = search_cves(query, cve_db, top_k=config.CVE_TOP_K)
 
     # Format retrieved vulnerabilities
     retrieved_vulns = []
-    matched_vuln_names = set()
+    matched_vuln_names = []
 
     for cve_entry, similarity in cve_results:
-        # Get CWE from metadata or extract from text
-        cwe_from_meta = cve_entry.metadata.get("cwe", "")
-        cwe_from_text = ""
-
-        # Try to find CWE in the CVE text if not in metadata
-        if not cwe_from_meta and cve_entry.text:
-            cwe_matches = re.findall(r'CWE-\d+:?\s*([^,\n]+)', cve_entry.text)
-            if cwe_matches:
-                cwe_from_text = ", ".join(cwe_matches[:3])  # Take first 3 matches
-
-        final_cwe = cwe_from_meta or cwe_from_text
+        # CWE fields are filled from the "CWE Categories" block when the DB is loaded
+        final_cwe = cve_entry.metadata.get("cwe", "")
 
         vuln_dict = {
             "cve_id": cve_entry.cve_id,
@@ -182,15 +197,65 @@ def rag_node(state: AgentState) -> Dict[str, Any]:
         }
         retrieved_vulns.append(vuln_dict)
 
-        # Extract vulnerability type from CWE
-        if final_cwe:
-            # Extract vulnerability name from CWE (e.g., "CWE-89: SQL Injection" -> "SQL Injection")
-            if ":" in final_cwe:
-                vuln_name = final_cwe.split(":", 1)[1].strip()
-                matched_vuln_names.add(vuln_name)
-            else:
-                # If no colon, use the whole CWE string
-                matched_vuln_names.add(final_cwe.strip())
+        # Vulnerability type names from CWE (e.g., "CWE-89: SQL Injection" -> "SQL Injection")
+        cwe_names = cve_entry.metadata.get("cwe_names") or []
+        if not cwe_names and final_cwe:
+            cwe_names = [final_cwe.strip()]
+        for name in cwe_names[:3]:
+            if name not in matched_vuln_names:
+                matched_vuln_names.append(name)
+
+    return retrieved_vulns, matched_vuln_names
+
+
+def speculative_rag_node(state: AgentState) -> Dict[str, Any]:
+    """
+    Retrieve CVEs with a query built from the code itself, without waiting
+    for the LLaMA analysis (async graph only; verified in async_rag_node).
+
+    Updates:
+        - speculative_vulnerabilities: CVEs retrieved for the code-derived query
+        - speculative_matches: Vulnerability type names of those CVEs
+    """
+    print("\n--- SPECULATIVE RAG NODE ---")
+
+    input_code = state.get("input_code", "")
+    if not input_code:
+        return {"speculative_vulnerabilities": [], "speculative_matches": []}
+
+    language = state.get("language") or detect_language(input_code)
+    hints = [name for pattern, name in config.VULN_PATTERNS if re.search(pattern, input_code, re.IGNORECASE)]
+    query = f"{language} code {' '.join(hints)}\n{input_code[:config.SPECULATIVE_QUERY_CHARS]}"
+
+    retrieved_vulns, matched = _retrieve_cves(query)
+    print(f"Speculatively retrieved {len(retrieved_vulns)} CVEs: {matched}")
+    return {
+        "speculative_vulnerabilities": retrieved_vulns,
+        "speculative_matches": matched,
+    }
+
+
+def rag_node(state: AgentState) -> Dict[str, Any]:
+    """
+    Retrieve similar CVEs from vector database using RAG.
+    Uses analyze.py::search_cves() function.
+
+    Updates:
+        - retrieved_vulnerabilities: List of similar CVE entries
+        - matched_vulnerabilities: List of vulnerability type names
+    """
+    print("\n--- RAG NODE ---")
+
+    initial_analysis = state.get("initial_analysis", "")
+    if not initial_analysis:
+        print("WARNING: No initial analysis available")
+        return {
+            "retrieved_vulnerabilities": [],
+            "matched_vulnerabilities": [],
+        }
+
+    retrieved_vulns, matched_vuln_names = _retrieve_cves(initial_analysis)
+    matched_vuln_names = set(matched_vuln_names)
 
     # Fallback: extract common vulnerability types from initial_analysis if CWE extraction failed
     if not matched_vuln_names and initial_analysis:
@@ -285,11 +350,7 @@ def vulnerability_fix_node(state: AgentState) -> Dict[str, Any]:
         normalized_score = 0.0
 
     # Detect language using configured patterns
-    language = "python"  # Default
-    for lang, patterns in config.LANG_PATTERNS.items():
-        if any(pattern in input_code for pattern in patterns):
-            language = lang
-            break
+    language = state.get("language") or detect_language(input_code)
 
     print(f"Processing vulnerability: {vuln_name}")
     print(f"CVSS: {final_severity} -> normalized score: {normalized_score:.2f}")
@@ -388,11 +449,7 @@ def report_generation_node(state: AgentState) -> Dict[str, Any]:
     primary_vuln = matched_vulnerabilities[0] if matched_vulnerabilities else "UNKNOWN_VULNERABILITY"
 
     # Detect language
-    language = "python"  # Default
-    for lang, patterns in config.LANG_PATTERNS.items():
-        if any(pattern in input_code for pattern in patterns):
-            language = lang
-            break
+    language = state.get("language") or detect_language(input_code)
 
     print(f"Calling LLM to generate detailed security report...")
     print(f"  Vulnerability: {primary_vuln}")
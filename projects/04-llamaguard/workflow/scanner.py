@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+scanner.py
+
+Repository-scale batch scanning for LlamaGuard.
+
+Walks a source tree, splits files into function-level units, deduplicates
+identical units by hash, runs the LLaMA analysis for all unique units in
+batched generate calls, then pushes each unit through the LangGraph
+workflow and writes one aggregated report.
+
+Usage:
+    python workflow/scanner.py path/to/repo --output scan_report.md
+"""
+
+import os
+import re
+import ast
+import json
+import time
+import argparse
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterator, List
+
+from config import config
+from nodes import detect_language, _get_inference_backend
+from services.result_cache import code_digest, get_result_cache, analysis_cache_key
+from graph import get_graph
+
+
+# ============================================================================
+# CODE UNITS
+# ============================================================================
+
+@dataclass
+class CodeUnit:
+    """A function-level slice of a source file."""
+    path: str
+    language: str
+    name: str
+    start_line: int
+    end_line: int
+    code: str
+    digest: str = ""
+
+
+@dataclass
+class UnitResult:
+    """Workflow outcome for one unique code unit."""
+    digest: str
+    is_detected: bool
+    final_severity: str
+    matched_vulnerabilities: List[str]
+    report: str
+    locations: List[Dict[str, object]] = field(default_factory=list)
+
+
+# Function headers for brace-delimited languages
+BRACE_FUNCTION_PATTERNS = {
+    'javascript': re.compile(
+        r'^[ \t]*(?:export\s+)?(?:async\s+)?function\s*\*?\s*(\w+)\s*\([^)]*\)\s*\{'
+        r'|^[ \t]*(?:export\s+)?(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s*)?\([^)]*\)\s*=>\s*\{',
+        re.MULTILINE,
+    ),
+    'java': re.compile(
+        r'^[ \t]*(?:(?:public|private|protected|static|final|synchronized|abstract)\s+)*'
+        r'[\w<>\[\], ]+\s+(\w+)\s*\([^)]*\)\s*(?:throws\s+[\w., ]+)?\s*\{',
+        re.MULTILINE,
+    ),
+    'php': re.compile(
+        r'^[ \t]*(?:(?:public|private|protected|static|final|abstract)\s+)*function\s+&?\s*(\w+)\s*\([^)]*\)[^{;]*\{',
+        re.MULTILINE,
+    ),
+}
+
+
+def _split_python(path: str, source: str) -> List[CodeUnit]:
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return []
+
+    lines = source.splitlines()
+    units = []
+
+    def visit(node, inside_function: bool):
+        for child in ast.iter_child_nodes(node):
+            is_function = isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))
+            if is_function and not inside_function:
+                start = min([d.lineno for d in child.decorator_list] + [child.lineno])
+                end = child.end_lineno or child.lineno
+                units.append(CodeUnit(
+                    path=path, language='python', name=child.name,
+                    start_line=start, end_line=end,
+                    code="\n".join(lines[start - 1:end]),
+                ))
+            visit(child, inside_function or is_function)
+
+    visit(tree, False)
+    return units
+
+
+def _split_braces(path: str, source: str, language: str) -> List[CodeUnit]:
+    pattern = BRACE_FUNCTION_PATTERNS.get(language)
+    if pattern is None:
+        return []
+
+    units = []
+    consumed_until = 0
+    for match in pattern.finditer(source):
+        if match.start() < consumed_until:
+            continue  # nested in a unit already emitted
+
+        depth = 0
+        end = None
+        for pos in range(match.end() - 1, len(source)):
+            char = source[pos]
+            if char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth == 0:
+                    end = pos + 1
+                    break
+        if end is None:
+            continue
+
+        name = next((g for g in match.groups() if g), "<anonymous>")
+        start_line = source.count("\n", 0, match.start()) + 1
+        end_line = source.count("\n", 0, end) + 1
+        units.append(CodeUnit(
+            path=path, language=language, name=name,
+            start_line=start_line, end_line=end_line,
+            code=source[match.start():end].strip("\n"),
+        ))
+        consumed_until = end
+
+    return units
+
+
+def split_units(path: str, source: str) -> List[CodeUnit]:
+    """
+    Split a source file into function-level units.
+
+    Files in which no function can be found are analyzed as a single unit.
+    """
+    language = detect_language(source, path)
+    if language == 'python':
+        units = _split_python(path, source)
+    else:
+        units = _split_braces(path, source, language)
+
+    if not units:
+        units = [CodeUnit(
+            path=path, language=language, name="<module>",
+            start_line=1, end_line=source.count("\n") + 1, code=source,
+        )]
+
+    kept = []
+    for unit in units:
+        if len([line for line in unit.code.splitlines() if line.strip()]) < config.SCAN_MIN_UNIT_LINES:
+            continue
+        unit.digest = code_digest(unit.code)
+        kept.append(unit)
+    return kept
+
+
+def iter_source_files(root: str) -> Iterator[str]:
+    """Yield scannable source files under root (or root itself if it is a file)."""
+    if os.path.isfile(root):
+        yield root
+        return
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in config.SCAN_SKIP_DIRS)
+        for filename in sorted(filenames):
+            if os.path.splitext(filename)[1].lower() not in config.LANG_EXTENSIONS:
+                continue
+            path = os.path.join(dirpath, filename)
+            try:
+                if os.path.getsize(path) > config.SCAN_MAX_FILE_BYTES:
+                    print(f"Skipping large file: {path}")
+                    continue
+            except OSError:
+                continue
+            yield path
+
+
+# ============================================================================
+# SCAN
+# ============================================================================
+
+def scan_repository(root: str, batch_size: int = None) -> Dict[str, object]:
+    """
+    Scan a source tree and return aggregated results.
+
+    Args:
+        root: Repository directory (or single file)
+        batch_size: Prompts per generate call (default: config.SCAN_BATCH_SIZE)
+
+    Returns:
+        Dict with per-unit results and throughput statistics
+    """
+    batch_size = batch_size or config.SCAN_BATCH_SIZE
+    started = time.perf_counter()
+
+    # 1. Collect and deduplicate units
+    files = 0
+    all_units: List[CodeUnit] = []
+    for path in iter_source_files(root):
+        try:
+            with open(path, "r", encoding=config.DEFAULT_ENCODING, errors="replace") as f:
+                source = f.read()
+        except OSError as e:
+            print(f"WARNING: Could not read {path}: {e}")
+            continue
+        files += 1
+        all_units.extend(split_units(os.path.relpath(path, root) if os.path.isdir(root) else path, source))
+
+    unique: Dict[str, CodeUnit] = {}
+    locations: Dict[str, List[Dict[str, object]]] = {}
+    for unit in all_units:
+        unique.setdefault(unit.digest, unit)
+        locations.setdefault(unit.digest, []).append({
+            "path": unit.path, "name": unit.name,
+            "start_line": unit.start_line, "end_line": unit.end_line,
+        })
+
+    print(f"\n[Scan] {files} files, {len(all_units)} units, {len(unique)} unique")
+
+    # 2. Batched LLaMA analysis for unique units not already in the result cache
+    unit_list = list(unique.values())
+    cache = get_result_cache()
+    analyses: List[str] = [""] * len(unit_list)
+    pending = []
+    for i, unit in enumerate(unit_list):
+        cached = cache.get("analysis", analysis_cache_key(unit.code)) if cache is not None else None
+        if cached:
+            analyses[i] = cached
+        else:
+            pending.append(i)
+
+    print(f"[Scan] {len(unit_list) - len(pending)} cached, {len(pending)} to analyze")
+    if pending:
+        backend = _get_inference_backend()
+        fresh = backend.analyze_batch(
+            [unit_list[i].code for i in pending],
+            max_new_tokens=config.MAX_NEW_TOKENS, batch_size=batch_size,
+        )
+        for i, analysis in zip(pending, fresh):
+            analyses[i] = analysis
+            if cache is not None:
+                cache.set("analysis", analysis_cache_key(unit_list[i].code), analysis)
+    analyzed_at = time.perf_counter()
+
+    # 3. Remaining workflow per unit (analysis already in state).
+    # No checkpointer: nothing reads per-unit state back after invoke().
+    graph = get_graph(checkpointer=False)
+    results: List[UnitResult] = []
+    for unit, analysis in zip(unit_list, analyses):
+        state = graph.invoke(
+            {
+                "input_code": unit.code,
+                "precomputed_analysis": analysis,
+                "language": unit.language,
+            },
+        )
+        results.append(UnitResult(
+            digest=unit.digest,
+            is_detected=bool(state.get("is_detected")),
+            final_severity=str(state.get("final_severity", "0")),
+            matched_vulnerabilities=list(state.get("matched_vulnerabilities", []) or []),
+            report=state.get("report", ""),
+            locations=locations[unit.digest],
+        ))
+
+    elapsed = time.perf_counter() - started
+    return {
+        "root": root,
+        "files": files,
+        "units": len(all_units),
+        "unique_units": len(unique),
+        "results": results,
+        "elapsed_seconds": elapsed,
+        "analysis_seconds": analyzed_at - started,
+        "files_per_second": files / elapsed if elapsed > 0 else 0.0,
+        "units_per_second": len(all_units) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def format_scan_report(scan: Dict[str, object]) -> str:
+    """Render aggregated scan results as one markdown report."""
+    results: List[UnitResult] = scan["results"]
+    findings = sorted(
+        (r for r in results if r.is_detected),
+        key=lambda r: int(r.final_severity) if r.final_severity.isdigit() else 0,
+        reverse=True,
+    )
+
+    report = "# LlamaGuard Repository Scan Report\n\n"
+    report += f"- Root: `{scan['root']}`\n"
+    report += f"- Files scanned: {scan['files']}\n"
+    report += f"- Code units: {scan['units']} ({scan['unique_units']} unique)\n"
+    report += f"- Units with findings: {len(findings)}\n"
+    report += (f"- Elapsed: {scan['elapsed_seconds']:.1f}s "
+               f"({scan['files_per_second']:.2f} files/sec, {scan['units_per_second']:.2f} units/sec)\n\n")
+
+    if not findings:
+        report += "## Status: SAFE\n\nNo vulnerabilities detected.\n"
+        return report
+
+    report += "## Findings\n\n"
+    report += "| CVSS | Vulnerabilities | Locations |\n|---|---|---|\n"
+    for result in findings:
+        where = "<br>".join(
+            f"`{loc['path']}:{loc['start_line']}` {loc['name']}" for loc in result.locations
+        )
+        vulns = ", ".join(result.matched_vulnerabilities) or "-"
+        report += f"| {result.final_severity} | {vulns} | {where} |\n"
+    report += "\n"
+
+    for result in findings:
+        first = result.locations[0]
+        report += f"---\n\n### `{first['path']}:{first['start_line']}` {first['name']}\n\n"
+        report += result.report.strip() + "\n\n"
+
+    return report
+
+
+def main():
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description="LlamaGuard repository scan")
+    parser.add_argument("root", type=str, help="Repository directory or source file to scan")
+    parser.add_argument("--output", type=str, default=None, help="Path to save the markdown report")
+    parser.add_argument("--json", type=str, default=None, help="Path to save raw results as JSON")
+    parser.add_argument("--batch_size", type=int, default=config.SCAN_BATCH_SIZE,
+                        help="Prompts per batched generate call")
+    args = parser.parse_args()
+
+    scan = scan_repository(args.root, batch_size=args.batch_size)
+    report = format_scan_report(scan)
+
+    print("\n" + "=" * 80)
+    print(report)
+
+    if args.output:
+        with open(args.output, "w", encoding=config.DEFAULT_ENCODING) as f:
+            f.write(report)
+        print(f"\nReport saved to: {args.output}")
+
+    if args.json:
+        payload = dict(scan)
+        payload["results"] = [asdict(r) for r in scan["results"]]
+        with open(args.json, "w", encoding=config.DEFAULT_ENCODING) as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        print(f"Results saved to: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+server.py
+
+Resident LlamaGuard scan service (FastAPI).
+
+The inference backend, the CVE database and the async graph are loaded once
+at startup. LLaMA analyses of concurrent scan jobs are merged into shared
+analyze_batch calls (micro-batching); the rest of each job runs through the
+async graph, and node-by-node progress can be streamed as server-sent events.
+
+Endpoints:
+    POST /scan                  submit {"code", "language"?, "wait"?}
+    GET  /scan/{job_id}         job status and result
+    GET  /scan/{job_id}/events  node progress (text/event-stream)
+    GET  /metrics               queue depth, batch sizes, p50/p99 latency
+    GET  /health
+
+Usage:
+    python workflow/server.py --port 8000
+"""
+
+import json
+import math
+import time
+import uuid
+import asyncio
+import argparse
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from config import config
+from nodes import detect_language, speculative_rag_node, _get_inference_backend, _get_cve_db
+from services.result_cache import get_result_cache, analysis_cache_key
+from graph import get_async_graph, astream_analysis
+
+
+# ============================================================================
+# METRICS
+# ============================================================================
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0.0 for no samples)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class ServiceMetrics:
+    """Rolling counters for the /metrics endpoint."""
+
+    def __init__(self, window: int = 1000):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.batch_sizes: Deque[int] = deque(maxlen=window)
+        self.batch_seconds: Deque[float] = deque(maxlen=window)
+        self.jobs_submitted = 0
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self.analysis_cache_hits = 0
+
+    def record_batch(self, size: int, seconds: float):
+        self.batch_sizes.append(size)
+        self.batch_seconds.append(seconds)
+
+    def record_job(self, seconds: float, failed: bool = False):
+        self.latencies.append(seconds)
+        if failed:
+            self.jobs_failed += 1
+        else:
+            self.jobs_completed += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = list(self.latencies)
+        batch_sizes = list(self.batch_sizes)
+        return {
+            "jobs_submitted": self.jobs_submitted,
+            "jobs_completed": self.jobs_completed,
+            "jobs_failed": self.jobs_failed,
+            "analysis_cache_hits": self.analysis_cache_hits,
+            "batches": len(batch_sizes),
+            "last_batch_size": batch_sizes[-1] if batch_sizes else 0,
+            "mean_batch_size": sum(batch_sizes) / len(batch_sizes) if batch_sizes else 0.0,
+            "max_batch_size": max(batch_sizes) if batch_sizes else 0,
+            "batch_seconds_p50": percentile(list(self.batch_seconds), 50),
+            "latency_seconds_p50": percentile(latencies, 50),
+            "latency_seconds_p99": percentile(latencies, 99),
+        }
+
+
+# ============================================================================
+# MICRO-BATCHING
+# ============================================================================
+
+class MicroBatcher:
+    """
+    Collects analysis requests and runs them as one analyze_batch call.
+
+    A batch is flushed when it reaches max_batch_size or max_wait_ms after
+    its first request arrived. Batches run one at a time (one model).
+    """
+
+    def __init__(self, backend, metrics: ServiceMetrics,
+                 max_batch_size: int = 8, max_wait_ms: int = 50):
+        self.backend = backend
+        self.metrics = metrics
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.in_flight = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    @property
+    def depth(self) -> int:
+        """Requests waiting for a batch slot."""
+        return self.queue.qsize()
+
+    async def analyze(self, code: str) -> str:
+        """Queue one code snippet and wait for its analysis."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((code, future))
+        return await future
+
+    async def _collect(self) -> List[Any]:
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            codes = [code for code, _ in batch]
+            self.in_flight = len(batch)
+            start = time.perf_counter()
+            try:
+                analyses = await asyncio.to_thread(
+                    self.backend.analyze_batch, codes,
+                    max_new_tokens=config.MAX_NEW_TOKENS, batch_size=len(codes),
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError(f"Code analysis failed: {e}"))
+            else:
+                for (_, future), analysis in zip(batch, analyses):
+                    if not future.done():
+                        future.set_result(analysis)
+            finally:
+                self.in_flight = 0
+            self.metrics.record_batch(len(batch), time.perf_counter() - start)
+
+
+# ============================================================================
+# JOBS
+# ============================================================================
+
+class ScanJob:
+    """One submitted scan; progress events are kept for replay to late subscribers."""
+
+    def __init__(self, code: str, language: Optional[str] = None):
+        self.job_id = uuid.uuid4().hex
+        self.code = code
+        self.language = language or detect_language(code)
+        self.status = "queued"
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.events: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self._changed = asyncio.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    async def emit(self, event: Dict[str, Any]):
+        async with self._changed:
+            self.events.append(event)
+            self._changed.notify_all()
+
+    async def finish(self, status: str):
+        async with self._changed:
+            self.status = status
+            self.finished_at = time.time()
+            self._changed.notify_all()
+
+    async def wait_for_event(self, seen: int):
+        async with self._changed:
+            await self._changed.wait_for(lambda: len(self.events) > seen or self.done)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "language": self.language,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "nodes_completed": [event["node"] for event in self.events if "node" in event],
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class ScanService:
+    """Holds the warm models, the batcher and the job table."""
+
+    def __init__(self):
+        self.metrics = ServiceMetrics(config.SERVER_LATENCY_WINDOW)
+        self.jobs: "OrderedDict[str, ScanJob]" = OrderedDict()
+        self.batcher: Optional[MicroBatcher] = None
+        self.running = 0
+        # Strong references: the event loop only keeps weak ones to tasks
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def start(self):
+        print("\n[Service] Loading inference backend, CVE database and graph...")
+        backend = await asyncio.to_thread(_get_inference_backend)
+        await asyncio.to_thread(_get_cve_db)
+        # Jobs read their result from the stream, so no per-job checkpoints are kept
+        get_async_graph(checkpointer=False)
+        self.batcher = MicroBatcher(
+            backend, self.metrics,
+            max_batch_size=config.SERVER_MAX_BATCH_SIZE,
+            max_wait_ms=config.SERVER_MAX_BATCH_WAIT_MS,
+        )
+        self.batcher.start()
+        print("[Service] Ready")
+
+    async def stop(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self.batcher is not None:
+            await self.batcher.stop()
+
+    def submit(self, code: str, language: Optional[str] = None) -> ScanJob:
+        job = ScanJob(code, language)
+        self.jobs[job.job_id] = job
+        self.metrics.jobs_submitted += 1
+        self._evict()
+        task = asyncio.create_task(self._run_job(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def _evict(self):
+        while len(self.jobs) > config.SERVER_MAX_JOBS:
+            oldest = next((job_id for job_id, job in self.jobs.items() if job.done), None)
+            if oldest is None:
+                break
+            del self.jobs[oldest]
+
+    async def _analyze(self, code: str) -> str:
+        cache = get_result_cache()
+        cache_key = analysis_cache_key(code)
+        if cache is not None:
+            cached = cache.get("analysis", cache_key)
+            if cached:
+                self.metrics.analysis_cache_hits += 1
+                return cached
+
+        analysis = await self.batcher.analyze(code)
+        if cache is not None:
+            cache.set("analysis", cache_key, analysis)
+        return analysis
+
+    async def _speculate(self, job: ScanJob) -> Dict[str, Any]:
+        if not config.SPECULATIVE_RAG_ENABLED:
+            return {}
+        return await asyncio.to_thread(speculative_rag_node, {"input_code": job.code, "language": job.language})
+
+    async def _run_job(self, job: ScanJob):
+        start = time.perf_counter()
+        self.running += 1
+        job.status = "running"
+        try:
+            # CVE retrieval on the code runs while the analysis waits for its batch
+            analysis, speculative = await asyncio.gather(self._analyze(job.code), self._speculate(job))
+            await job.emit({"event": "analysis", "chars": len(analysis),
+                            "seconds": time.perf_counter() - start})
+
+            # State fields have no reducers, so merging the node updates gives the final state
+            state: Dict[str, Any] = {}
+            async for node_name, output in astream_analysis(
+                job.code, job.job_id, checkpointer=False,
+                precomputed_analysis=analysis, language=job.language, **speculative
+            ):
+                state.update(output)
+                await job.emit({"node": node_name, "output": output,
+                                "seconds": time.perf_counter() - start})
+
+            job.result = {
+                "is_detected": bool(state.get("is_detected")),
+                "final_severity": str(state.get("final_severity", "0")),
+                "matched_vulnerabilities": list(state.get("matched_vulnerabilities", []) or []),
+                "fixed_code": state.get("fixed_code", ""),
+                "patches": state.get("patches", []) or [],
+                "report": state.get("report", ""),
+            }
+            await job.finish("completed")
+            self.metrics.record_job(time.perf_counter() - start)
+        except Exception as e:
+            print(f"ERROR: scan job {job.job_id} failed: {e}")
+            job.error = str(e)
+            await job.finish("failed")
+            self.metrics.record_job(time.perf_counter() - start, failed=True)
+        finally:
+            self.running -= 1
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        snapshot = self.metrics.snapshot()
+        snapshot.update({
+            "queue_depth": self.batcher.depth if self.batcher else 0,
+            "batch_in_flight": self.batcher.in_flight if self.batcher else 0,
+            "jobs_running": self.running,
+        })
+        return snapshot
+
+
+# ============================================================================
+# HTTP API
+# ============================================================================
+
+class ScanRequest(BaseModel):
+    code: str
+    language: Optional[str] = None
+    wait: bool = False
+
+
+service = ScanService()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await service.start()
+    yield
+    await service.stop()
+
+
+app = FastAPI(title="LlamaGuard Scan Service", lifespan=lifespan)
+
+
+def _get_job(job_id: str) -> ScanJob:
+    job = service.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+
+@app.post("/scan")
+async def submit_scan(request: ScanRequest):
+    if not request.code.strip():
+        raise HTTPException(status_code=400, detail="No code provided")
+
+    job = service.submit(request.code, request.language)
+    if request.wait:
+        while not job.done:
+            await job.wait_for_event(len(job.events))
+        return job.summary()
+    return {"job_id": job.job_id, "status": job.status}
+
+
+@app.get("/scan/{job_id}")
+async def scan_status(job_id: str):
+    return _get_job(job_id).summary()
+
+
+@app.get("/scan/{job_id}/events")
+async def scan_events(job_id: str):
+    job = _get_job(job_id)
+
+    async def stream():
+        seen = 0
+        while True:
+            while seen < len(job.events):
+                yield f"data: {json.dumps(job.events[seen], ensure_ascii=False, default=str)}\n\n"
+                seen += 1
+            if job.done:
+                break
+            await job.wait_for_event(seen)
+        final = {"event": job.status, "result": job.result, "error": job.error}
+        yield f"data: {json.dumps(final, ensure_ascii=False, default=str)}\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+@app.get("/metrics")
+async def metrics():
+    return service.metrics_snapshot()
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok" if service.batcher is not None else "starting"}
+
+
+def main():
+    """CLI entry point"""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="LlamaGuard scan service")
+    parser.add_argument("--host", type=str, default=config.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=config.SERVER_PORT)
+    args = parser.parse_args()
+
+    # One process: the model and the job table live in memory
+    uvicorn.run(app, host=args.host, port=args.port, workers=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ Modules:
 from .llama_service import (
     load_model,
     analyze_code,
+    analyze_code_batch,
     load_cve_db,
     search_cves,
 )
@@ -16,14 +17,29 @@ from .patch_service import (
     process_input,
     generate_security_report,
 )
+from .inference_backend import (
+    InferenceBackend,
+    load_backend,
+)
+from .result_cache import (
+    ResultCache,
+    get_result_cache,
+)
 
 __all__ = [
     # LLaMA Service
     'load_model',
     'analyze_code',
+    'analyze_code_batch',
     'load_cve_db',
     'search_cves',
     # Patch Service
     'process_input',
     'generate_security_report',
+    # Inference Backends
+    'InferenceBackend',
+    'load_backend',
+    # Result Cache
+    'ResultCache',
+    'get_result_cache',
 ]
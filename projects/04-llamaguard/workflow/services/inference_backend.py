@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+inference_backend.py
+
+Pluggable inference backends for the LLaMA vulnerability analyzer.
+
+Backends:
+- hf:       HuggingFace transformers, device_map="auto" (original behavior)
+- cpu:      transformers on CPU with int8 (torch dynamic quantization) or
+            int4 (optimum-quanto) weights
+- onnx:     ONNX Runtime via optimum (CPUExecutionProvider)
+- llamacpp: GGUF model via llama-cpp-python
+
+All backends expose analyze(code) / analyze_batch(codes) / count_tokens(text).
+"""
+
+import os
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Type
+
+import torch
+
+# Add parent directories to path
+service_dir = os.path.dirname(__file__)
+workflow_dir = os.path.join(service_dir, '..')
+project_dir = os.path.join(workflow_dir, '..')
+sys.path.insert(0, workflow_dir)
+sys.path.append(os.path.join(project_dir, 'llama-model'))
+
+from config import config
+from llama_predict import resolve_dtype, build_prompt
+from services.llama_service import load_model, analyze_code, analyze_code_batch
+
+
+class InferenceBackend(ABC):
+    """Base class: one loaded model that turns code into an analysis text."""
+
+    name = "base"
+
+    @abstractmethod
+    def analyze(self, code: str, max_new_tokens: int = 512) -> str:
+        """Return the model's analysis of one code snippet."""
+
+    def analyze_batch(self, codes: List[str], max_new_tokens: int = 512, batch_size: int = 8) -> List[str]:
+        """Default: one prompt at a time (backends with real batching override this)."""
+        return [self.analyze(code, max_new_tokens=max_new_tokens) for code in codes]
+
+    @abstractmethod
+    def count_tokens(self, text: str) -> int:
+        """Number of model tokens in text (no special tokens)."""
+
+
+class TransformersBackend(InferenceBackend):
+    """Any (tokenizer, model) pair with a HuggingFace generate() API."""
+
+    name = "hf"
+
+    def __init__(self, tokenizer, model):
+        self.tokenizer = tokenizer
+        self.model = model
+
+    @classmethod
+    def load(cls, model_path: str = None) -> "TransformersBackend":
+        tokenizer, model = load_model(model_path or config.MODEL_PATH, resolve_dtype(config.MODEL_DTYPE))
+        return cls(tokenizer, model)
+
+    def analyze(self, code: str, max_new_tokens: int = 512) -> str:
+        return analyze_code(code, self.tokenizer, self.model, max_new_tokens=max_new_tokens)
+
+    def analyze_batch(self, codes: List[str], max_new_tokens: int = 512, batch_size: int = 8) -> List[str]:
+        return analyze_code_batch(codes, self.tokenizer, self.model,
+                                  max_new_tokens=max_new_tokens, batch_size=batch_size)
+
+    def count_tokens(self, text: str) -> int:
+        return len(self.tokenizer(text, add_special_tokens=False).input_ids)
+
+
+class CPUQuantizedBackend(TransformersBackend):
+    """CPU inference with quantized (int8 / int4) Linear weights."""
+
+    name = "cpu"
+
+    def __init__(self, tokenizer, model, quantization: str):
+        super().__init__(tokenizer, model)
+        self.quantization = quantization
+
+    @classmethod
+    def load(cls, model_path: str = None, quantization: str = None, threads: int = None) -> "CPUQuantizedBackend":
+        from transformers import AutoTokenizer, AutoModelForCausalLM
+
+        model_path = model_path or config.MODEL_PATH
+        quantization = quantization or config.CPU_QUANTIZATION
+        threads = threads or config.CPU_THREADS
+        if threads:
+            torch.set_num_threads(threads)
+
+        print(f"\n[1/3] Loading LLaMA model on CPU ({quantization}) from {model_path}...")
+        try:
+            tokenizer = AutoTokenizer.from_pretrained(model_path, use_fast=True)
+            if tokenizer.pad_token is None:
+                tokenizer.pad_token = tokenizer.eos_token
+
+            model = AutoModelForCausalLM.from_pretrained(model_path, dtype=torch.float32)
+            model.eval()
+        except Exception as e:
+            raise RuntimeError(f"Failed to load model from {model_path}: {e}")
+
+        if quantization == "int8":
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        elif quantization == "int4":
+            try:
+                from optimum.quanto import quantize, freeze, qint4
+            except ImportError:
+                raise ImportError(
+                    "optimum-quanto is required for int4 CPU inference. "
+                    "Install with: pip install optimum-quanto"
+                )
+            quantize(model, weights=qint4)
+            freeze(model)
+        elif quantization != "none":
+            raise ValueError(f"Unknown CPU quantization: {quantization}")
+
+        print(f"Model loaded (CPU, {torch.get_num_threads()} threads)")
+        return cls(tokenizer, model, quantization)
+
+    def analyze_batch(self, codes: List[str], max_new_tokens: int = 512, batch_size: int = 8) -> List[str]:
+        # Padded batches only add wasted compute on CPU
+        return InferenceBackend.analyze_batch(self, codes, max_new_tokens=max_new_tokens)
+
+
+class OnnxBackend(TransformersBackend):
+    """ONNX Runtime model exported from the merged checkpoint (optimum)."""
+
+    name = "onnx"
+
+    @classmethod
+    def load(cls, model_path: str = None) -> "OnnxBackend":
+        try:
+            from optimum.onnxruntime import ORTModelForCausalLM
+        except ImportError:
+            raise ImportError(
+                "optimum[onnxruntime] is required for the onnx backend. "
+                "Install with: pip install optimum[onnxruntime]"
+            )
+        from transformers import AutoTokenizer
+
+        onnx_path = model_path or config.ONNX_MODEL_PATH
+        export = not os.path.exists(os.path.join(onnx_path, "model.onnx"))
+        source = config.MODEL_PATH if export else onnx_path
+
+        print(f"\n[1/3] Loading ONNX model from {source} (export: {export})...")
+        try:
+            tokenizer = AutoTokenizer.from_pretrained(source, use_fast=True)
+            if tokenizer.pad_token is None:
+                tokenizer.pad_token = tokenizer.eos_token
+            model = ORTModelForCausalLM.from_pretrained(
+                source, export=export, provider="CPUExecutionProvider", use_cache=True
+            )
+            if export:
+                model.save_pretrained(onnx_path)
+                tokenizer.save_pretrained(onnx_path)
+        except Exception as e:
+            raise RuntimeError(f"Failed to load ONNX model from {source}: {e}")
+
+        print("Model loaded (ONNX Runtime, CPU)")
+        return cls(tokenizer, model)
+
+
+class LlamaCppBackend(InferenceBackend):
+    """GGUF model through llama.cpp."""
+
+    name = "llamacpp"
+
+    def __init__(self, llm):
+        self.llm = llm
+
+    @classmethod
+    def load(cls, model_path: str = None, threads: int = None) -> "LlamaCppBackend":
+        try:
+            from llama_cpp import Llama
+        except ImportError:
+            raise ImportError(
+                "llama-cpp-python is required for the llamacpp backend. "
+                "Install with: pip install llama-cpp-python"
+            )
+
+        gguf_path = model_path or config.GGUF_MODEL_PATH
+        print(f"\n[1/3] Loading GGUF model from {gguf_path}...")
+        try:
+            llm = Llama(
+                model_path=gguf_path,
+                n_ctx=config.LLAMACPP_N_CTX,
+                n_threads=threads or config.CPU_THREADS or None,
+                verbose=False,
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to load GGUF model from {gguf_path}: {e}")
+
+        print("Model loaded (llama.cpp)")
+        return cls(llm)
+
+    def analyze(self, code: str, max_new_tokens: int = 512) -> str:
+        try:
+            output = self.llm(build_prompt(code), max_tokens=max_new_tokens, temperature=0.0)
+        except Exception as e:
+            raise RuntimeError(f"Code analysis failed: {e}")
+        return output["choices"][0]["text"].strip()
+
+    def count_tokens(self, text: str) -> int:
+        return len(self.llm.tokenize(text.encode("utf-8"), add_bos=False))
+
+
+BACKENDS: Dict[str, Type[InferenceBackend]] = {
+    "hf": TransformersBackend,
+    "cpu": CPUQuantizedBackend,
+    "onnx": OnnxBackend,
+    "llamacpp": LlamaCppBackend,
+}
+
+
+def load_backend(name: str = None, **kwargs) -> InferenceBackend:
+    """
+    Load an inference backend by name (default: config.INFERENCE_BACKEND).
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    name = name or config.INFERENCE_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend: {name} (choose from {', '.join(BACKENDS)})")
+
+    start = time.perf_counter()
+    backend = BACKENDS[name].load(**kwargs)
+    print(f"Inference backend '{name}' ready ({time.perf_counter() - start:.1f}s)")
+    return backend
+
@@ -97,6 +97,76 @@ def analyze_code(code: str, tokenizer, model, max_new_tokens: int = 512) -> str:
         raise RuntimeError(f"Code analysis failed: {e}")
 
 
+def analyze_code_batch(codes, tokenizer, model, max_new_tokens: int = 512, batch_size: int = 8):
+    """
+    Analyze many code snippets with batched, length-bucketed generate calls.
+
+    Prompts are sorted by token length so each batch pads to a similar
+    length, and padded on the left so generation continues right after
+    each prompt.
+
+    Args:
+        codes: List of source code strings
+        tokenizer: HuggingFace tokenizer
+        model: LLaMA model
+        max_new_tokens: Maximum tokens to generate per snippet (default: 512)
+        batch_size: Prompts per generate call (default: 8)
+
+    Returns:
+        List of analysis texts, in the same order as codes
+
+    Raises:
+        RuntimeError: If inference fails
+    """
+    if not codes:
+        return []
+
+    print(f"\n[2/3] Analyzing {len(codes)} code units with LLaMA (batch size {batch_size})...")
+
+    prompts = [build_prompt(code) for code in codes]
+    lengths = [len(ids) for ids in tokenizer(prompts, add_special_tokens=True).input_ids]
+    order = sorted(range(len(prompts)), key=lambda i: lengths[i])
+
+    results = [""] * len(prompts)
+    padding_side = tokenizer.padding_side
+    tokenizer.padding_side = "left"
+
+    try:
+        for start in range(0, len(order), batch_size):
+            batch_idx = order[start:start + batch_size]
+            inputs = tokenizer(
+                [prompts[i] for i in batch_idx],
+                return_tensors="pt",
+                padding=True,
+            ).to(model.device)
+
+            with torch.inference_mode():
+                output = model.generate(
+                    **inputs,
+                    max_new_tokens=max_new_tokens,
+                    do_sample=False,
+                    temperature=None,
+                    top_p=None,
+                    pad_token_id=tokenizer.pad_token_id,
+                    eos_token_id=tokenizer.eos_token_id,
+                )
+
+            input_len = inputs.input_ids.shape[1]
+            decoded = tokenizer.batch_decode(output[:, input_len:], skip_special_tokens=True)
+            for i, text in zip(batch_idx, decoded):
+                results[i] = text.strip()
+
+            print(f"  Batch {start // batch_size + 1}: {len(batch_idx)} units "
+                  f"(prompt length {lengths[batch_idx[0]]}-{lengths[batch_idx[-1]]} tokens)")
+    except Exception as e:
+        raise RuntimeError(f"Batched code analysis failed: {e}")
+    finally:
+        tokenizer.padding_side = padding_side
+
+    print("Analysis complete")
+    return results
+
+
 def load_cve_db(index_path: str, data_path: str):
     """
     Load CVE vector database.
@@ -130,7 +200,7 @@ def load_cve_db(index_path: str, data_path: str):
         raise RuntimeError(f"Failed to load CVE database: {e}")
 
 
-def search_cves(query: str, cve_db, top_k: int = 5):
+def search_cves(query: str, cve_db, top_k: int = 5, **filters):
     """
     Search for similar CVEs using semantic search.
 
@@ -138,6 +208,8 @@ def search_cves(query: str, cve_db, top_k: int = 5):
         query: Query text (vulnerability analysis)
         cve_db: CVEVectorDB instance
         top_k: Number of results to return (default: 5)
+        **filters: Metadata filters passed to CVEVectorDB.search
+            (cwe, severity, min_cvss, max_cvss, published_after, published_before)
 
     Returns:
         List of (CVEEntry, similarity_score) tuples
@@ -148,7 +220,7 @@ def search_cves(query: str, cve_db, top_k: int = 5):
     print(f"\n[RAG] Searching for similar CVEs (top {top_k})...")
 
     try:
-        results = cve_db.search(query, top_k=top_k)
+        results = cve_db.search(query, top_k=top_k, **filters)
         print(f"Found {len(results)} similar CVEs")
         return results
     except Exception as e:
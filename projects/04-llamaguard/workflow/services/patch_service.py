@@ -11,6 +11,9 @@ Uses configuration from config.py for all thresholds and API settings.
 import os
 import sys
 import json
+import asyncio
+import threading
+import weakref
 from typing import Dict, Any, List
 
 # Add parent directory to path for config import
@@ -19,35 +22,101 @@ workflow_dir = os.path.join(service_dir, '..')
 sys.path.insert(0, workflow_dir)
 
 from config import config
+from services.result_cache import get_result_cache, patch_cache_key
 
 # ---------------------------
-# External LLM call (OpenAI-compatible client)
+# Shared Solar clients (one connection pool per process / per event loop)
 # ---------------------------
-def call_external_for_patch(vuln: str, code: str, language: str) -> Dict[str, Any]:
+_client = None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+_client_lock = threading.Lock()
+
+
+def _require_api_key():
+    if not config.UPSTAGE_API_KEY:
+        raise RuntimeError('UPSTAGE_API_KEY environment variable is required')
+
+
+def get_client():
     """
-    Call Upstage Solar API to generate security patch.
+    Return the process-wide OpenAI-compatible client for Upstage Solar.
 
-    Args:
-        vuln: Vulnerability type/name
-        code: Original vulnerable code
-        language: Programming language
+    Raises:
+        RuntimeError: If UPSTAGE_API_KEY not set or the OpenAI SDK is missing
+    """
+    global _client
+    _require_api_key()
+    with _client_lock:
+        if _client is None:
+            try:
+                from openai import OpenAI
+            except ImportError:
+                raise RuntimeError('OpenAI SDK not installed. Install with: pip install openai>=1.52.2')
+            _client = OpenAI(api_key=config.UPSTAGE_API_KEY, base_url=config.UPSTAGE_BASE_URL)
+    return _client
 
-    Returns:
-        {"vuln": ..., "patched_code": {"language": ..., "code_snippet": ...}}
+
+def get_async_client():
+    """
+    Return the async client of the running event loop; concurrent requests share its connection pool.
+
+    httpx connections are bound to the loop that opened them, so each loop
+    (e.g. one per asyncio.run() call) gets its own client.
 
     Raises:
-        RuntimeError: If UPSTAGE_API_KEY not set or API call fails
+        RuntimeError: If UPSTAGE_API_KEY not set, the OpenAI SDK is missing,
+            or no event loop is running
     """
-    if not config.UPSTAGE_API_KEY:
-        raise RuntimeError('UPSTAGE_API_KEY environment variable is required')
+    _require_api_key()
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            try:
+                import httpx
+                from openai import AsyncOpenAI
+            except ImportError:
+                raise RuntimeError('OpenAI SDK not installed. Install with: pip install openai>=1.52.2')
+            client = AsyncOpenAI(
+                api_key=config.UPSTAGE_API_KEY,
+                base_url=config.UPSTAGE_BASE_URL,
+                http_client=httpx.AsyncClient(limits=httpx.Limits(
+                    max_connections=config.PATCH_MAX_CONCURRENCY,
+                    max_keepalive_connections=config.PATCH_MAX_CONCURRENCY,
+                )),
+            )
+            _async_clients[loop] = client
+    return client
+
+
+def _parse_json_response(resp) -> Dict[str, Any]:
+    """Extract and parse the JSON object from a chat completion response."""
+    # Extract content
+    try:
+        content = resp.choices[0].message.content.strip()
+    except (AttributeError, IndexError) as e:
+        raise RuntimeError(f'Unexpected API response format: {e}')
 
+    # Parse JSON
     try:
-        from openai import OpenAI
-    except ImportError as e:
-        raise RuntimeError('OpenAI SDK not installed. Install with: pip install openai>=1.52.2')
+        return json.loads(content)
+    except json.JSONDecodeError:
+        # Try to extract JSON from markdown code block
+        import re
+        match = re.search(r'\{[\s\S]*\}', content)
+        if match:
+            try:
+                return json.loads(match.group(0))
+            except json.JSONDecodeError:
+                pass
+        raise RuntimeError(f'Could not parse JSON from API response: {content[:200]}...')
 
-    client = OpenAI(api_key=config.UPSTAGE_API_KEY, base_url=config.UPSTAGE_BASE_URL)
 
+# ---------------------------
+# External LLM call (OpenAI-compatible client)
+# ---------------------------
+def _patch_request(vuln: str, code: str, language: str) -> Dict[str, Any]:
+    """chat.completions.create() arguments for a patch request."""
     system_prompt = (
         "You are a senior security engineer and code reviewer. Given vulnerable code and vuln metadata, "
         "produce a JSON object EXACTLY matching the schema: {\"vuln\":..., \"patched_code\":{\"language\":...,\"code_snippet\":...}}. "
@@ -63,39 +132,55 @@ def call_external_for_patch(vuln: str, code: str, language: str) -> Dict[str, An
         "Return a single JSON object with the patched code (no extra commentary)."
     )
 
+    return dict(
+        model=config.UPSTAGE_MODEL,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+        temperature=config.UPSTAGE_TEMPERATURE,
+        max_tokens=config.UPSTAGE_MAX_TOKENS,
+        stream=False
+    )
+
+
+def call_external_for_patch(vuln: str, code: str, language: str) -> Dict[str, Any]:
+    """
+    Call Upstage Solar API to generate security patch.
+
+    Args:
+        vuln: Vulnerability type/name
+        code: Original vulnerable code
+        language: Programming language
+
+    Returns:
+        {"vuln": ..., "patched_code": {"language": ..., "code_snippet": ...}}
+
+    Raises:
+        RuntimeError: If UPSTAGE_API_KEY not set or API call fails
+    """
+    client = get_client()
+
     try:
-        resp = client.chat.completions.create(
-            model=config.UPSTAGE_MODEL,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=config.UPSTAGE_TEMPERATURE,
-            max_tokens=config.UPSTAGE_MAX_TOKENS,
-            stream=False
-        )
+        resp = client.chat.completions.create(**_patch_request(vuln, code, language))
     except Exception as ex:
         raise RuntimeError(f'API call failed: {ex}')
 
-    # Extract content
-    try:
-        content = resp.choices[0].message.content.strip()
-    except (AttributeError, IndexError) as e:
-        raise RuntimeError(f'Unexpected API response format: {e}')
+    return _parse_json_response(resp)
+
+
+async def call_external_for_patch_async(vuln: str, code: str, language: str) -> Dict[str, Any]:
+    """
+    Async variant of call_external_for_patch using the pooled async client.
+    """
+    client = get_async_client()
 
-    # Parse JSON
     try:
-        return json.loads(content)
-    except json.JSONDecodeError:
-        # Try to extract JSON from markdown code block
-        import re
-        match = re.search(r'\{[\s\S]*\}', content)
-        if match:
-            try:
-                return json.loads(match.group(0))
-            except json.JSONDecodeError:
-                pass
-        raise RuntimeError(f'Could not parse JSON from API response: {content[:200]}...')
+        resp = await client.chat.completions.create(**_patch_request(vuln, code, language))
+    except Exception as ex:
+        raise RuntimeError(f'API call failed: {ex}')
+
+    return _parse_json_response(resp)
 
 # ---------------------------
 # Main processing logic
@@ -121,9 +206,51 @@ def process_input(original_code: str, vuln: str, score: float, language: str) ->
             "message": f"Low severity (score: {score:.2f}) - monitoring recommended."
         }
 
+    # Same (vuln, code, language) already patched in an earlier run
+    cache = get_result_cache()
+    cache_key = patch_cache_key(vuln, original_code, language)
+    if cache is not None:
+        cached = cache.get("patch", cache_key)
+        if cached is not None:
+            return cached
+
     # High severity -> call external API
     resp = call_external_for_patch(vuln=vuln, code=original_code, language=language)
 
+    result = _patch_result(resp, vuln, language)
+    if cache is not None:
+        cache.set("patch", cache_key, result)
+    return result
+
+
+async def process_input_async(original_code: str, vuln: str, score: float, language: str) -> Dict[str, Any]:
+    """
+    Async variant of process_input; safe to run many at once (shared client pool).
+    """
+    if score < config.PATCH_SCORE_THRESHOLD:
+        return {
+            "vuln": vuln,
+            "decision": "ok",
+            "message": f"Low severity (score: {score:.2f}) - monitoring recommended."
+        }
+
+    cache = get_result_cache()
+    cache_key = patch_cache_key(vuln, original_code, language)
+    if cache is not None:
+        cached = cache.get("patch", cache_key)
+        if cached is not None:
+            return cached
+
+    resp = await call_external_for_patch_async(vuln=vuln, code=original_code, language=language)
+
+    result = _patch_result(resp, vuln, language)
+    if cache is not None:
+        cache.set("patch", cache_key, result)
+    return result
+
+
+def _patch_result(resp: Dict[str, Any], vuln: str, language: str) -> Dict[str, Any]:
+    """Validate a patch response and normalize it."""
     # Validate response
     if not isinstance(resp, dict) or 'patched_code' not in resp:
         raise RuntimeError('Invalid API response: missing patched_code')
@@ -194,15 +321,7 @@ def generate_security_report(
     Raises:
         RuntimeError: If UPSTAGE_API_KEY not set or API call fails
     """
-    if not config.UPSTAGE_API_KEY:
-        raise RuntimeError('UPSTAGE_API_KEY environment variable is required')
-
-    try:
-        from openai import OpenAI
-    except ImportError:
-        raise RuntimeError('OpenAI SDK not installed. Install with: pip install openai>=1.52.2')
-
-    client = OpenAI(api_key=config.UPSTAGE_API_KEY, base_url=config.UPSTAGE_BASE_URL)
+    client = get_client()
 
     system_prompt = """You are a senior security engineer and vulnerability analyst. Your task is to generate a comprehensive security report for a code vulnerability.
 
@@ -284,22 +403,4 @@ Generate a complete security report in JSON format."""
     except Exception as ex:
         raise RuntimeError(f'API call failed: {ex}')
 
-    # Extract content
-    try:
-        content = resp.choices[0].message.content.strip()
-    except (AttributeError, IndexError) as e:
-        raise RuntimeError(f'Unexpected API response format: {e}')
-
-    # Parse JSON
-    try:
-        return json.loads(content)
-    except json.JSONDecodeError:
-        # Try to extract JSON from markdown code block
-        import re
-        match = re.search(r'\{[\s\S]*\}', content)
-        if match:
-            try:
-                return json.loads(match.group(0))
-            except json.JSONDecodeError:
-                pass
-        raise RuntimeError(f'Could not parse JSON from API response: {content[:200]}...')
+    return _parse_json_response(resp)
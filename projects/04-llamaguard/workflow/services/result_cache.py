@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+result_cache.py
+
+Persistent on-disk cache for LlamaGuard results.
+
+Two logical caches share one SQLite file:
+- analysis: LLaMA analysis text keyed by (normalized code hash, model id, prompt version)
+- patch:    Solar patch response keyed by (vuln, code hash, language, model)
+
+Entries are evicted least-recently-used first once the total stored size
+exceeds the configured limit.
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Optional
+
+# Add parent directory to path for config import
+service_dir = os.path.dirname(__file__)
+workflow_dir = os.path.join(service_dir, '..')
+sys.path.insert(0, workflow_dir)
+
+from config import config
+
+
+def normalize_code(code: str) -> str:
+    """Strip trailing whitespace and blank lines so cosmetic edits hash the same."""
+    lines = [line.rstrip() for line in code.strip().splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+def code_digest(code: str) -> str:
+    """SHA-256 of the normalized code."""
+    return hashlib.sha256(normalize_code(code).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """SQLite key/value cache with size-based LRU eviction."""
+
+    def __init__(self, db_path: str, max_bytes: int):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_access ON results(last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        payload = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM results WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE results SET last_access = ? WHERE namespace = ? AND key = ?",
+                (time.time(), namespace, key),
+            )
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        data = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (namespace, key, value, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, data, len(data.encode("utf-8")), time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Drop least recently used entries until under the limit
+        excess = total - self.max_bytes
+        freed = 0
+        doomed = []
+        for namespace, key, size in self._conn.execute(
+            "SELECT namespace, key, size FROM results ORDER BY last_access ASC"
+        ):
+            doomed.append((namespace, key))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM results WHERE namespace = ? AND key = ?", doomed)
+
+    def stats(self):
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+        return {"entries": count, "bytes": total, "max_bytes": self.max_bytes}
+
+
+# ============================================================================
+# Global cache instance (lazy)
+# ============================================================================
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """
+    Return the shared result cache, or None when caching is disabled.
+    """
+    global _cache
+    if not config.RESULT_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache(config.RESULT_CACHE_PATH, config.RESULT_CACHE_MAX_MB * 1024 * 1024)
+    return _cache
+
+
+def _backend_id() -> str:
+    """Configured inference backend; quantized / GGUF outputs are cached separately."""
+    name = config.INFERENCE_BACKEND
+    if name == "cpu":
+        return f"cpu-{config.CPU_QUANTIZATION}"
+    if name == "llamacpp":
+        return f"llamacpp-{os.path.basename(config.GGUF_MODEL_PATH)}"
+    return name
+
+
+def analysis_cache_key(code: str) -> str:
+    """(normalized code hash, model id, backend, prompt version, generation length)"""
+    return ResultCache.make_key(
+        code_digest(code),
+        os.path.basename(os.path.normpath(config.MODEL_PATH)),
+        _backend_id(),
+        config.ANALYSIS_PROMPT_VERSION,
+        config.MAX_NEW_TOKENS,
+    )
+
+
+def patch_cache_key(vuln: str, code: str, language: str) -> str:
+    """(vuln, raw code hash, language, patch model)
+
+    A patch is full replacement code, so it is keyed on the exact input:
+    normalization would hand back a patch laid out for different code.
+    """
+    raw_digest = hashlib.sha256(code.encode("utf-8")).hexdigest()
+    return ResultCache.make_key(vuln, raw_digest, language, config.UPSTAGE_MODEL)
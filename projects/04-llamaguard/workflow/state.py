@@ -16,18 +16,29 @@ class AgentState(TypedDict):
     Fields:
         input_code: User-provided source code to analyze
         initial_analysis: LLaMA model vulnerability analysis output
+        precomputed_analysis: Analysis generated outside the graph (batched scan /
+            server); set on every invocation so a checkpoint never carries it over
         retrieved_vulnerabilities: Similar CVEs from vector database (RAG)
         matched_vulnerabilities: Extracted vulnerability type names
         final_severity: CVSS score (0-10) averaged from related CVEs
         fixed_code: Patched/secure version of the code
         report: Final analysis report for user
         is_detected: Whether vulnerabilities were detected
+        language: Source language (optional, detected from code when absent)
+        speculative_vulnerabilities: CVEs retrieved from the code before analysis (async graph)
+        speculative_matches: Vulnerability type names of the speculative CVEs
+        patches: Per-vulnerability patches (async graph)
     """
     input_code: Annotated[str, "User input code"]
     initial_analysis: Annotated[str, "LLaMA vulnerability analysis"]
+    precomputed_analysis: Annotated[str, "Analysis passed in by the caller"]
     retrieved_vulnerabilities: Annotated[List[Dict[str, Any]], "Related CVEs from vector DB"]
     matched_vulnerabilities: Annotated[List[str], "Vulnerability type names"]
     final_severity: Annotated[str, "CVSS score (0-10)"]
     fixed_code: Annotated[str, "Patched code"]
     report: Annotated[str, "Final report"]
-    is_detected: Annotated[bool, "Vulnerability detected flag"] 
+    is_detected: Annotated[bool, "Vulnerability detected flag"]
+    language: Annotated[str, "Source language"]
+    speculative_vulnerabilities: Annotated[List[Dict[str, Any]], "CVEs from code-derived query"]
+    speculative_matches: Annotated[List[str], "Vulnerability type names (speculative)"]
+    patches: Annotated[List[Dict[str, Any]], "Per-vulnerability patches"]
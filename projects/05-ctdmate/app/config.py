@@ -41,3 +41,37 @@ QDRANT_URL       = os.getenv("QDRANT_URL", "")  # 빈 문자열 = 로컬 path 
 QDRANT_API_KEY   = os.getenv("QDRANT_API_KEY", "")
 QDRANT_GUIDE_COLLECTION    = os.getenv("QDRANT_GUIDE_COLLECTION", "guidelines")
 QDRANT_GLOSSARY_COLLECTION = os.getenv("QDRANT_GLOSSARY_COLLECTION", "glossary")
+
+# ---------- Local Llama router (brain/llama_client.py) ----------
+LLAMA_POOL_SIZE       = int(os.getenv("CTD_LLAMA_POOL_SIZE", "2"))         # 상주 llama.cpp 워커 수 (0 = 서버에서 로드 안 함, GPU 오프로드 시 1)
+LLAMA_PREFIX_CACHE_MB = int(os.getenv("CTD_LLAMA_PREFIX_CACHE_MB", "256"))  # 워커별 접두사 KV RAM 캐시
+
+# ---------- Solar generation (tools/gen_solar.py) ----------
+SOLAR_CONNECT_TIMEOUT = float(os.getenv("CTD_SOLAR_CONNECT_TIMEOUT", "10"))
+SOLAR_READ_TIMEOUT    = float(os.getenv("CTD_SOLAR_READ_TIMEOUT", "90"))   # 스트리밍은 청크 간 대기 기준
+SOLAR_POOL_SIZE       = int(os.getenv("CTD_SOLAR_POOL_SIZE", "8"))         # keep-alive 커넥션 수
+SOLAR_CACHE_SIZE      = int(os.getenv("CTD_SOLAR_CACHE_SIZE", "128"))      # 메모리 LRU 응답 수 (0=끔)
+SOLAR_CACHE_DIR       = os.getenv("CTD_SOLAR_CACHE_DIR", "")                # 지정 시 디스크에도 저장
+
+# ---------- Embedding service (rag/embedding_service.py) ----------
+EMBED_QUERY_CACHE_SIZE = int(os.getenv("CTD_EMBED_CACHE_SIZE", "1024"))  # LRU 쿼리 벡터 수
+EMBED_BATCH_MAX        = int(os.getenv("CTD_EMBED_BATCH_MAX", "32"))     # 마이크로배치 최대 쿼리 수
+EMBED_BATCH_WAIT_MS    = float(os.getenv("CTD_EMBED_BATCH_WAIT_MS", "5"))
+
+# ---------- Sparse (BM25) index / hybrid fusion (rag/sparse.py) ----------
+SPARSE_INDEX = os.getenv("CTD_SPARSE_INDEX", "1") != "0"   # 인덱싱 시 sparse 벡터 생성, 검색 시 사용
+BM25_K1      = float(os.getenv("CTD_BM25_K1", "1.2"))
+BM25_B       = float(os.getenv("CTD_BM25_B", "0.75"))
+BM25_AVG_LEN = float(os.getenv("CTD_BM25_AVG_LEN", "256"))  # 청크당 평균 토큰 수(근사)
+RRF_K        = int(os.getenv("CTD_RRF_K", "60"))
+
+# ---------- Indexer (rag/indexer.py) ----------
+INDEX_WORKERS = int(os.getenv("CTD_INDEX_WORKERS", "4"))   # 임베딩+업서트 병렬 배치 수
+
+# ---------- Regulation validation (tools/reg_rag.py) ----------
+VALIDATE_WORKERS          = int(os.getenv("CTD_VALIDATE_WORKERS", "4"))    # validate_excel 병렬 시트 수
+NORMALIZE_MAX_CONCURRENCY = int(os.getenv("CTD_NORMALIZE_MAX_CONCURRENCY", "1"))  # 동시 LLaMA 정규화 수
+
+# ---------- Document parsing (tools/smartdoc_upstage.py) ----------
+PARSE_WORKERS   = int(os.getenv("CTD_PARSE_WORKERS", "4"))            # 동시에 파싱할 파일 수
+PARSE_CACHE_DIR = os.getenv("CTD_PARSE_CACHE_DIR", "./out/cache/upstage")
@@ -1,8 +1,10 @@
 # ctdmate/app/router.py
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+import json
+from typing import Any, Dict, Iterator, List, Optional
 
 from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 # 내부 의존성
@@ -24,7 +26,22 @@ except Exception:
 app = FastAPI(title="CTDMate API", version="0.1.0")
 
 # 단일 인스턴스(간단)
-_llama = LlamaLocalClient()  # 구현체로 교체
+def _load_llama():
+    # 상주 GGUF 워커 풀 (CFG.LLAMA_POOL_SIZE=0 이거나 모델/llama-cpp 가 없으면 스텁)
+    if CFG.LLAMA_POOL_SIZE > 0:
+        try:
+            try:
+                from ctdmate.brain.llama_client import shared_llama_pool
+                from ctdmate.app.prompts import ROUTER_SYSTEM
+            except Exception:
+                from ..brain.llama_client import shared_llama_pool  # type: ignore
+                from .prompts import ROUTER_SYSTEM  # type: ignore
+            return shared_llama_pool(warm_prompts=(ROUTER_SYSTEM,), n_ctx=2048, temperature=0.1)
+        except Exception:
+            pass
+    return LlamaLocalClient()
+
+_llama = _load_llama()
 _router = Router(llama=_llama)
 _fsm = CTDFSM(llama_client=_llama)
 _reg = RegulationRAGTool(auto_normalize=True, enable_rag=True, llama_client=_llama)
@@ -36,6 +53,10 @@ class RouteReq(BaseModel):
     desc: str = Field(..., description="요청 설명")
 
 
+class RouteBatchReq(BaseModel):
+    descs: List[str] = Field(..., description="요청 설명 목록")
+
+
 class ParseReq(BaseModel):
     files: List[str] = Field(..., description="파싱 대상 경로(.pdf/.xlsx)")
 
@@ -80,6 +101,11 @@ def route(req: RouteReq) -> Dict[str, Any]:
     return _router.decide(req.desc)
 
 
+@app.post("/v1/route/batch")
+def route_batch(req: RouteBatchReq) -> Dict[str, Any]:
+    return {"plans": _router.decide_batch(req.descs), "stats": dict(_router.stats)}
+
+
 @app.post("/v1/parse")
 def parse(req: ParseReq) -> Dict[str, Any]:
     return parse_run(req.files)
@@ -99,6 +125,15 @@ def generate(req: GenerateReq) -> Dict[str, Any]:
     return _gen.generate(section=req.section, prompt=req.prompt, output_format=req.format, csv_present=req.csv_present)
 
 
+@app.post("/v1/generate/stream")
+def generate_stream(req: GenerateReq) -> StreamingResponse:
+    # SSE: token 이벤트(Solar 원문 조각) 후 result 이벤트(정규화·Lint 반영 최종 결과)
+    def _events() -> Iterator[str]:
+        for ev in _gen.generate_stream(section=req.section, prompt=req.prompt, output_format=req.format, csv_present=req.csv_present):
+            yield f"event: {ev['type']}\ndata: {json.dumps(ev, ensure_ascii=False)}\n\n"
+    return StreamingResponse(_events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
 @app.post("/v1/pipeline")
 def pipeline(req: PipelineReq) -> Dict[str, Any]:
     return _fsm.run(
@@ -3,12 +3,20 @@
 Fine-tuned GGUF 모델을 사용하는 LlamaLocalClient 구현
 """
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 import logging
+import queue
+import threading
 
 logger = logging.getLogger(__name__)
 
+try:
+    from ctdmate.app import config as CFG
+except Exception:
+    from ..app import config as CFG  # type: ignore
+
 try:
     from llama_cpp import Llama
     HAS_LLAMA_CPP = True
@@ -16,6 +24,11 @@ except ImportError:
     HAS_LLAMA_CPP = False
     logger.warning("llama-cpp-python not installed. LlamaGGUFClient will not work.")
 
+try:
+    from llama_cpp import LlamaRAMCache
+except ImportError:
+    LlamaRAMCache = None  # type: ignore
+
 
 class LlamaGGUFClient:
     """
@@ -28,6 +41,7 @@ class LlamaGGUFClient:
         temperature: 생성 온도 (기본: 0.1)
         max_tokens: 최대 생성 토큰 (기본: 512)
         verbose: 로깅 출력 (기본: False)
+        prefix_cache_mb: 프롬프트 접두사 KV 상태 RAM 캐시 크기 (0 = 끔)
     """
 
     def __init__(
@@ -38,6 +52,7 @@ class LlamaGGUFClient:
         temperature: float = 0.1,
         max_tokens: int = 512,
         verbose: bool = False,
+        prefix_cache_mb: int = 0,
     ):
         if not HAS_LLAMA_CPP:
             raise ImportError("llama-cpp-python is required. Install with: pip install llama-cpp-python")
@@ -69,13 +84,17 @@ class LlamaGGUFClient:
         logger.info(f"Loading GGUF model: {self.model_path}")
         logger.info(f"  n_ctx: {n_ctx}, n_gpu_layers: {n_gpu_layers}")
 
-        # Llama 모델 로드
+        # Llama 모델 로드 (mmap → CPU 추론이면 같은 파일을 여는 다른 인스턴스와 가중치 페이지 공유)
         self.llm = Llama(
             model_path=self.model_path,
             n_ctx=n_ctx,
             n_gpu_layers=n_gpu_layers,
+            use_mmap=True,
             verbose=verbose,
         )
+        if prefix_cache_mb > 0 and LlamaRAMCache is not None:
+            # 공통 접두사(시스템 프롬프트)의 KV 상태를 저장해 재평가 생략
+            self.llm.set_cache(LlamaRAMCache(capacity_bytes=int(prefix_cache_mb) << 20))
 
         logger.info(f"✓ Model loaded successfully")
 
@@ -105,6 +124,20 @@ class LlamaGGUFClient:
         content = response.get("choices", [{}])[0].get("message", {}).get("content", "")
         return content.strip()
 
+    def warm(self, system: str) -> None:
+        """시스템 프롬프트 접두사를 미리 평가 (이후 같은 접두사 요청은 캐시/KV 재사용)."""
+        self.llm.create_chat_completion(
+            messages=[{"role": "system", "content": system}, {"role": "user", "content": ""}],
+            temperature=0.0,
+            max_tokens=1,
+        )
+
+    def close(self) -> None:
+        """모델 해제 (GPU/메모리 반환)."""
+        llm, self.llm = self.llm, None
+        if llm is not None and hasattr(llm, "close"):
+            llm.close()
+
     def __call__(self, prompt: str, **kwargs) -> str:
         """
         Direct prompt completion (system=없이 사용)
@@ -142,6 +175,105 @@ def create_default_client(**kwargs) -> LlamaGGUFClient:
     return LlamaGGUFClient(**kwargs)
 
 
+def _offloads_to_gpu(n_gpu_layers: int) -> bool:
+    if n_gpu_layers == 0:
+        return False
+    try:
+        from llama_cpp import llama_supports_gpu_offload
+        return bool(llama_supports_gpu_offload())
+    except Exception:
+        return True   # 확인 불가 → 오프로드한다고 가정
+
+
+class LlamaWorkerPool:
+    """
+    상주 llama.cpp 워커 풀 (chat(system, user) 인터페이스 → Router/TermNormalizer에 그대로 주입).
+    - 워커마다 별도 Llama 인스턴스(자체 컨텍스트·KV 캐시). 가중치는 CPU 추론일 때만 mmap 으로 공유되고,
+      GPU 오프로드 시에는 인스턴스마다 VRAM 에 사본을 올리므로 기본 워커 풀은 1개로 제한
+    - chat: 쉬는 워커 하나를 빌려 실행 (Llama 인스턴스는 스레드 안전하지 않음)
+    - chat_batch: 여러 요청을 워커 수만큼 동시에 처리, 입력 순서대로 반환
+    - warm_prompts: 시작 시 각 워커에서 미리 평가할 시스템 프롬프트 (라우터 프롬프트 등)
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        factory: Optional[Callable[[], Any]] = None,
+        warm_prompts: Sequence[str] = (),
+        **client_kwargs,
+    ):
+        self.size = max(1, int(size or CFG.LLAMA_POOL_SIZE))
+        client_kwargs.setdefault("prefix_cache_mb", CFG.LLAMA_PREFIX_CACHE_MB)
+        if factory is None:
+            if self.size > 1 and _offloads_to_gpu(client_kwargs.get("n_gpu_layers", -1)):
+                logger.warning(f"GPU offload: each worker would load its own weights, pool size {self.size} -> 1")
+                self.size = 1
+            factory = lambda: LlamaGGUFClient(**client_kwargs)
+        self.workers = [factory() for _ in range(self.size)]
+        self._idle: "queue.Queue[Any]" = queue.Queue()
+        for w in self.workers:
+            for system in warm_prompts:
+                try:
+                    w.warm(system)
+                except Exception as e:
+                    logger.warning(f"warm-up failed: {e}")
+            self._idle.put(w)
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="llama-worker")
+
+    def chat(self, system: str, user: str) -> str:
+        worker = self._idle.get()
+        try:
+            return worker.chat(system, user)
+        finally:
+            self._idle.put(worker)
+
+    def chat_batch(self, requests: Sequence[Tuple[str, str]], return_exceptions: bool = False) -> List[Any]:
+        futures = [self._executor.submit(self.chat, system, user) for system, user in requests]
+        out: List[Any] = []
+        for fut in futures:
+            try:
+                out.append(fut.result())
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                out.append(e)
+        return out
+
+    def close(self) -> None:
+        """실행 중인 요청을 마친 뒤 워커 모델을 해제. 공용 풀이면 등록도 해제."""
+        self._executor.shutdown(wait=True)
+        for w in self.workers:
+            if hasattr(w, "close"):
+                w.close()
+        self.workers = []
+        self._idle = queue.Queue()
+        with _POOLS_LOCK:
+            for key in [k for k, pool in _POOLS.items() if pool is self]:
+                del _POOLS[key]
+
+
+_POOLS: Dict[Tuple, LlamaWorkerPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def shared_llama_pool(size: Optional[int] = None, warm_prompts: Sequence[str] = (), **kwargs) -> LlamaWorkerPool:
+    """
+    프로세스 공용 워커 풀 (같은 설정이면 한 번만 로드). CTDPipeline·API 서버가 공유.
+
+    Args:
+        size: 워커 수 (기본: CFG.LLAMA_POOL_SIZE)
+        warm_prompts: 워커별로 미리 평가할 시스템 프롬프트
+        **kwargs: LlamaGGUFClient에 전달할 인자
+    """
+    key = (size or CFG.LLAMA_POOL_SIZE, tuple(warm_prompts), tuple(sorted(kwargs.items())))
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = LlamaWorkerPool(size=size, warm_prompts=warm_prompts, **kwargs)
+            _POOLS[key] = pool
+        return pool
+
+
 # Alias for backward compatibility
 LlamaLocalClient = LlamaGGUFClient
 
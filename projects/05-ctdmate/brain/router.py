@@ -2,7 +2,8 @@
 from __future__ import annotations
 import json
 import re
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 
 # 타입
 try:
@@ -91,25 +92,42 @@ def _safe_json(s: str) -> Dict[str, Any]:
     except Exception:
         return {}
 
+# 섹션 힌트 (앞에서부터 첫 일치)
+_SECTION_RULES: List[Tuple[str, re.Pattern]] = [
+    ("M2.3", re.compile(r"\bm2\.3\b|\bqos\b")),
+    ("M2.4", re.compile(r"\bm2\.4\b|비임상\s*개요")),
+    ("M2.5", re.compile(r"\bm2\.5\b|임상\s*개요")),
+    ("M2.6", re.compile(r"\bm2\.6\b|비임상\s*요약")),
+    ("M2.7", re.compile(r"\bm2\.7\b|임상\s*요약")),
+    ("M1", re.compile(r"\bm1\b|행정|라벨")),
+]
+
+def _matched_sections(d: str) -> List[str]:
+    return [sec for sec, rx in _SECTION_RULES if rx.search(d)]
+
+def _is_unambiguous(desc: str) -> bool:
+    """
+    LLM 없이 확정해도 되는 요청: 섹션 힌트가 정확히 하나이고 작업 의도(파싱/생성/검증)가 잡힘.
+    "비임상 요약"처럼 "임상 요약" 패턴도 함께 걸리는 경우는 M2.6 한 가지로 본다.
+    """
+    d = (desc or "").lower()
+    secs = set(_matched_sections(d))
+    if "M2.6" in secs:
+        secs.discard("M2.7")
+    if "M2.4" in secs:
+        secs.discard("M2.5")
+    if len(secs) != 1:
+        return False
+    plan = _heuristic_plan(desc)
+    return bool(plan["need_parse"] or plan["need_generate"] or plan["need_validate"])
+
 def _heuristic_plan(desc: str) -> RoutePlan:
     d = (desc or "").lower()
     need_parse = any(w in d for w in ["pdf", "xlsx", "파일", "스캔", "ocr", "업로드"])
     need_generate = any(w in d for w in ["작성", "생성", "draft", "요약"])
     need_validate = any(w in d for w in ["검증", "체크", "lint", "validate", "적합성"])
-    # 섹션 힌트
-    sec = "UNKNOWN"
-    if re.search(r"\bm2\.3\b|\bqos\b", d):
-        sec = "M2.3"
-    elif re.search(r"\bm2\.4\b|비임상\s*개요", d):
-        sec = "M2.4"
-    elif re.search(r"\bm2\.5\b|임상\s*개요", d):
-        sec = "M2.5"
-    elif re.search(r"\bm2\.6\b|비임상\s*요약", d):
-        sec = "M2.6"
-    elif re.search(r"\bm2\.7\b|임상\s*요약", d):
-        sec = "M2.7"
-    elif re.search(r"\bm1\b|행정|라벨", d):
-        sec = "M1"
+    secs = _matched_sections(d)
+    sec = secs[0] if secs else "UNKNOWN"
 
     action = "pipeline"
     if need_generate and not need_validate and not need_parse:
@@ -159,38 +177,55 @@ def _merge(base: RoutePlan, llm_json: Dict[str, Any]) -> RoutePlan:
 class Router:
     """
     분기 뇌.
-    1) 휴리스틱 초안 생성
+    1) 휴리스틱 초안 생성 — 모호하지 않은 요청(_is_unambiguous)은 여기서 확정 (fast_path)
     2) Llama3.2-3B가 JSON으로 최종 결론
     3) 병합·정규화 후 RoutePlan 반환
+    llama 가 chat_batch 를 제공하면(LlamaWorkerPool) decide_batch 가 한 번에 분산 처리한다.
     """
-    def __init__(self, llama: Optional[LlamaLocalClient] = None):
+    def __init__(self, llama: Optional[LlamaLocalClient] = None, fast_path: bool = True):
         self.llama = llama
+        self.fast_path = fast_path
+        self.stats = {"heuristic": 0, "llm": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def _needs_llm(self, user_desc: str) -> bool:
+        return bool(self.llama) and not (self.fast_path and _is_unambiguous(user_desc))
+
+    def _messages(self, user_desc: str) -> Tuple[str, str]:
+        # 시스템 프롬프트는 요청과 무관하게 고정 → 워커의 접두사 캐시 재사용
+        if _HAS_PROMPTS:
+            msgs = _build_msgs(user_desc)  # system + user(JSON 스키마)
+            return msgs[0]["content"], msgs[1]["content"]
+        sys = (
+            "당신은 CTD 작업 라우터다. action, section, need_parse, need_rag, "
+            "need_generate, need_validate, output_format 필드를 가진 JSON만 출력."
+        )
+        schema = {
+            "action": "generate|validate|parse|pipeline",
+            "section": "M1|M2.3|M2.4|M2.5|M2.6|M2.7|UNKNOWN",
+            "need_parse": True,
+            "need_rag": True,
+            "need_generate": False,
+            "need_validate": False,
+            "output_format": "yaml|markdown",
+        }
+        usr = f"입력 설명:\n{user_desc}\n\n아래 스키마로만 JSON을 출력하라:\n{json.dumps(schema, ensure_ascii=False)}"
+        return sys, usr
 
     def decide(self, user_desc: str) -> RoutePlan:
         plan = _heuristic_plan(user_desc)
 
-        if not self.llama:
+        if not self._needs_llm(user_desc):
+            self._count("heuristic")
             return plan
 
+        self._count("llm")
         try:
-            if _HAS_PROMPTS:
-                msgs = _build_msgs(user_desc)  # system + user(JSON 스키마)
-                sys = msgs[0]["content"]; usr = msgs[1]["content"]
-            else:
-                sys = (
-                    "당신은 CTD 작업 라우터다. action, section, need_parse, need_rag, "
-                    "need_generate, need_validate, output_format 필드를 가진 JSON만 출력."
-                )
-                schema = {
-                    "action": "generate|validate|parse|pipeline",
-                    "section": "M1|M2.3|M2.4|M2.5|M2.6|M2.7|UNKNOWN",
-                    "need_parse": True,
-                    "need_rag": True,
-                    "need_generate": False,
-                    "need_validate": False,
-                    "output_format": "yaml|markdown",
-                }
-                usr = f"입력 설명:\n{user_desc}\n\n아래 스키마로만 JSON을 출력하라:\n{json.dumps(schema, ensure_ascii=False)}"
+            sys, usr = self._messages(user_desc)
             raw = self.llama.chat(system=sys, user=usr)
             j = _safe_json(raw)
             plan = _merge(plan, j)
@@ -199,3 +234,27 @@ class Router:
             pass
 
         return plan
+
+    def decide_batch(self, user_descs: List[str]) -> List[RoutePlan]:
+        """여러 요청을 한 번에 라우팅 (LLM이 필요한 것만 모아 워커 풀로 동시 처리)."""
+        plans = [_heuristic_plan(d) for d in user_descs]
+        todo = [i for i, d in enumerate(user_descs) if self._needs_llm(d)]
+        self._count("heuristic", len(plans) - len(todo))
+        self._count("llm", len(todo))
+        if not todo:
+            return plans
+
+        reqs = [self._messages(user_descs[i]) for i in todo]
+        if hasattr(self.llama, "chat_batch"):
+            raws = self.llama.chat_batch(reqs, return_exceptions=True)
+        else:
+            raws = []
+            for sys, usr in reqs:
+                try:
+                    raws.append(self.llama.chat(system=sys, user=usr))
+                except Exception as e:
+                    raws.append(e)
+        for i, raw in zip(todo, raws):
+            if isinstance(raw, str):   # 예외는 휴리스틱 유지
+                plans[i] = _merge(plans[i], _safe_json(raw))
+        return plans
@@ -2,7 +2,7 @@
 from __future__ import annotations
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 # 프로젝트 루트를 sys.path에 추가 (직접 실행 시)
 if __name__ == "__main__":
@@ -54,17 +54,23 @@ class CTDPipeline:
             llama_client: 커스텀 Llama 클라이언트 (None이면 자동 생성)
             use_finetuned: Fine-tuned GGUF 모델 사용 여부 (기본: True)
         """
-        # Fine-tuned 모델 자동 로드
+        # Fine-tuned 모델 자동 로드 (프로세스 공용 워커 풀 → 파이프라인 인스턴스마다 재로드하지 않음)
         if llama_client is None and use_finetuned:
             try:
-                from ctdmate.brain.llama_client import create_default_client
-                llama_client = create_default_client(
+                try:
+                    from ctdmate.brain.llama_client import shared_llama_pool
+                    from ctdmate.app.prompts import ROUTER_SYSTEM
+                except Exception:
+                    from .brain.llama_client import shared_llama_pool  # type: ignore
+                    from .app.prompts import ROUTER_SYSTEM  # type: ignore
+                llama_client = shared_llama_pool(
+                    warm_prompts=(ROUTER_SYSTEM,),
                     n_ctx=2048,
                     n_gpu_layers=-1,  # GPU 전부 사용
                     temperature=0.1,
                     verbose=False,
                 )
-                print("✓ Fine-tuned GGUF model loaded successfully")
+                print(f"✓ Fine-tuned GGUF model loaded successfully ({llama_client.size} workers)")
             except Exception as e:
                 print(f"⚠️  Failed to load fine-tuned model: {e}")
                 print("   Falling back to heuristic-only mode")
@@ -89,7 +95,9 @@ class CTDPipeline:
         section: Optional[str] = None,
         output_format: Optional[str] = None,
         auto_fix: bool = True,
+        on_token: Optional[Callable[[str], None]] = None,
     ) -> Dict[str, Any]:
+        """on_token: 생성 단계 Solar 스트리밍 토큰 콜백 (캐시 히트면 원문 전체 1회)"""
         plan: RoutePlan = self.router.decide(user_desc)
         if section:
             plan["section"] = section
@@ -173,6 +181,7 @@ class CTDPipeline:
                     section=plan.get("section") or "M2.3",
                     prompt=normalized,
                     output_format=plan.get("output_format") or "yaml",
+                    on_token=on_token,
                 )
             else:
                 generate_out = {  # type: ignore[assignment]
@@ -398,6 +407,7 @@ Examples:
     ap.add_argument("--section", "-s", help="강제 섹션(예: M2.3, M2.6, M2.7)")
     ap.add_argument("--format", "-o", choices=["yaml", "markdown"], help="출력 형식")
     ap.add_argument("--no-autofix", action="store_true", help="자동 정규화 비활성")
+    ap.add_argument("--stream", action="store_true", help="생성 토큰을 stderr로 실시간 출력")
 
     args = ap.parse_args()
 
@@ -455,6 +465,7 @@ Examples:
             section=args.section,
             output_format=args.format,
             auto_fix=not args.no_autofix,
+            on_token=(lambda t: print(t, end="", file=sys.stderr, flush=True)) if args.stream else None,
         )
         print(json.dumps(out, ensure_ascii=False, indent=2))
 
@@ -1,3 +1,3 @@
 # ctdmate/rag/__init__.py
 from __future__ import annotations
-__all__ = ["indexer", "retriever", "mfds_rag", "glossary_rag", "term_normalizer"]
+__all__ = ["indexer", "retriever", "mfds_rag", "glossary_rag", "term_normalizer", "embedding_service"]
@@ -0,0 +1,231 @@
+# ctdmate/rag/embedding_service.py
+from __future__ import annotations
+import sys, time, hashlib, threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+# ---- config ----
+try:
+    from ctdmate.app import config as CFG
+except Exception:
+    from ..app import config as CFG  # type: ignore
+
+# ---- deps (soft) ----
+try:
+    from fastembed import TextEmbedding
+except Exception:
+    TextEmbedding = None  # type: ignore
+
+try:
+    from sentence_transformers import SentenceTransformer
+except Exception:
+    SentenceTransformer = None  # type: ignore
+
+import numpy as np
+
+
+class _STWrapper:
+    """SentenceTransformer → FastEmbed 스타일 embed(texts)."""
+    def __init__(self, model):
+        self.model = model
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return self.model.encode(texts, convert_to_numpy=True).tolist()
+
+
+class _DummyEmbedder:
+    """의존성/모델이 없을 때 쓰는 결정적 해시 임베더."""
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        vecs = []
+        for t in texts:
+            h = hashlib.sha256(t.encode("utf-8")).digest()
+            arr = np.frombuffer(h, dtype=np.uint8).astype("float32")
+            arr = arr[:self.dim] if arr.size >= self.dim else np.pad(arr, (0, self.dim - arr.size))
+            vecs.append((arr / max(1.0, float(np.linalg.norm(arr)))).tolist())
+        return vecs
+
+
+def _load_backend(model_name: str):
+    # sentence-transformers 우선 (-instruct 등 더 많은 모델 지원) → FastEmbed → dummy
+    if SentenceTransformer:
+        try:
+            return _STWrapper(SentenceTransformer(model_name))
+        except Exception as e:
+            print(f"[WARNING] SentenceTransformer failed: {e}", file=sys.stderr)
+    if TextEmbedding:
+        try:
+            return TextEmbedding(model_name=model_name)
+        except Exception as e:
+            print(f"[WARNING] FastEmbed failed: {e}", file=sys.stderr)
+    print(f"[WARNING] Using dummy embedder (256 dims)", file=sys.stderr)
+    return _DummyEmbedder()
+
+
+class EmbeddingService:
+    """
+    모델 하나를 감싸는 프로세스 공용 임베딩 서비스.
+    - embed: 문서 배치 임베딩 (그대로 모델 호출)
+    - embed_query: 쿼리 1건. LRU 캐시 → 미스는 마이크로배칭 큐로 모아 한 번에 호출
+    acquire_embedder()/release_embedder() 로 얻고 반납한다.
+    """
+    def __init__(
+        self,
+        model_name: str,
+        backend=None,
+        cache_size: Optional[int] = None,
+        max_batch: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+    ):
+        self.model_name = model_name
+        self.backend = backend if backend is not None else _load_backend(model_name)
+        self.cache_size = int(CFG.EMBED_QUERY_CACHE_SIZE if cache_size is None else cache_size)
+        self.max_batch = max(1, int(CFG.EMBED_BATCH_MAX if max_batch is None else max_batch))
+        self.max_wait = float(CFG.EMBED_BATCH_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000.0
+
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._model_lock = threading.Lock()   # 모델 호출 직렬화
+        self._pending: List[Tuple[str, Future]] = []
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        self.stats = {"hits": 0, "misses": 0, "batches": 0, "batched_queries": 0}
+
+    # ---------- documents ----------
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        with self._model_lock:
+            return [list(map(float, v)) for v in self.backend.embed(list(texts))]  # generator → list
+
+    # ---------- queries ----------
+    def embed_query(self, text: str) -> List[float]:
+        with self._cache_lock:
+            vec = self._cache.get(text)
+            if vec is not None:
+                self._cache.move_to_end(text)
+                self.stats["hits"] += 1
+                return vec
+            self.stats["misses"] += 1
+
+        fut: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"EmbeddingService closed: {self.model_name}")
+            self._pending.append((text, fut))
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name=f"embed-{self.model_name}", daemon=True)
+                self._worker.start()
+            self._cond.notify()
+        vec = fut.result()
+        self._cache_put(text, vec)
+        return vec
+
+    def prime_queries(self, texts: List[str]) -> int:
+        """
+        여러 쿼리를 모델 한 번 호출로 임베딩해 LRU 캐시에 미리 채운다
+        (이후 embed_query 는 캐시 히트). 반환: 새로 임베딩한 쿼리 수.
+        """
+        if self.cache_size <= 0:
+            return 0
+        with self._cache_lock:
+            todo = [t for t in dict.fromkeys(texts) if t and t not in self._cache]
+        todo = todo[:self.cache_size]   # 캐시보다 많으면 넣자마자 밀려남
+        for t, vec in zip(todo, self.embed(todo)):
+            self._cache_put(t, vec)
+        return len(todo)
+
+    def _cache_put(self, text: str, vec: List[float]) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[text] = vec
+            self._cache.move_to_end(text)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _take_batch(self) -> List[Tuple[str, Future]]:
+        # 첫 요청 이후 max_wait 동안 또는 max_batch 까지 모은다
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if not self._pending:
+                return []
+            deadline = time.monotonic() + self.max_wait
+            while len(self._pending) < self.max_batch and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            # 같은 쿼리가 배치에 여러 번 있으면 한 번만 임베딩
+            texts = list(dict.fromkeys(t for t, _ in batch))
+            try:
+                vecs = dict(zip(texts, self.embed(texts)))
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            self.stats["batches"] += 1
+            self.stats["batched_queries"] += len(batch)
+            for t, fut in batch:
+                fut.set_result(vecs[t])
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._worker is not None:
+            self._worker.join(timeout=5)
+        with self._cache_lock:
+            self._cache.clear()
+
+
+# ---------- process-wide registry ----------
+_registry: Dict[str, EmbeddingService] = {}
+_refcounts: Dict[str, int] = {}
+_registry_lock = threading.Lock()
+
+
+def acquire_embedder(model_name: Optional[str] = None, **kwargs) -> EmbeddingService:
+    """모델명별 공용 EmbeddingService (없으면 로드). 참조 카운트 +1."""
+    name = model_name or CFG.EMBED_MODEL
+    with _registry_lock:
+        svc = _registry.get(name)
+        if svc is None:
+            svc = EmbeddingService(name, **kwargs)
+            _registry[name] = svc
+            _refcounts[name] = 0
+        _refcounts[name] += 1
+        return svc
+
+
+def release_embedder(svc: Optional[EmbeddingService]) -> None:
+    """참조 카운트 -1. 0이 되면 모델을 내려 메모리 반환."""
+    if svc is None:
+        return
+    with _registry_lock:
+        name = svc.model_name
+        if _registry.get(name) is not svc:
+            return
+        _refcounts[name] -= 1
+        if _refcounts[name] > 0:
+            return
+        del _registry[name]
+        del _refcounts[name]
+    svc.close()
+
+
+def embedder_refcount(model_name: Optional[str] = None) -> int:
+    with _registry_lock:
+        return _refcounts.get(model_name or CFG.EMBED_MODEL, 0)
@@ -3,6 +3,12 @@ from __future__ import annotations
 from typing import List, Dict, Any, Optional
 import os
 
+# config
+try:
+    from ctdmate.app import config as CFG
+except Exception:
+    from ..app import config as CFG  # type: ignore
+
 # Qdrant 클라이언트(선택)
 try:
     from qdrant_client import QdrantClient, models
@@ -10,39 +16,20 @@ except Exception:
     QdrantClient = None  # type: ignore
     models = None  # type: ignore
 
-# FastEmbed(e5) 임베더(선택)
+# 프로세스 공용 임베더
 try:
-    from fastembed import TextEmbedding
+    from ctdmate.rag.embedding_service import acquire_embedder, release_embedder
 except Exception:
-    TextEmbedding = None  # type: ignore
+    from .embedding_service import acquire_embedder, release_embedder  # type: ignore
 
 DEFAULT_COLLECTION = os.getenv("QDRANT_GLOSSARY_COLLECTION", "glossary")
 QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
 QDRANT_API_KEY = os.getenv("QDRANT_API_KEY", "")
-EMBED_MODEL = os.getenv("EMBED_MODEL", "intfloat/e5-large-v2")
+EMBED_MODEL = CFG.EMBED_MODEL  # 인덱서와 같은 모델이어야 벡터 차원이 맞음
 
 def _e5_query_prefix(q: str) -> str:
     return f"query: {q}"
 
-class _DummyEmbedder:
-    def embed(self, texts: List[str]) -> List[List[float]]:
-        import numpy as np, hashlib
-        vecs: List[List[float]] = []
-        for t in texts:
-            h = hashlib.sha256(t.encode("utf-8")).digest()
-            arr = np.frombuffer(h, dtype=np.uint8).astype("float32")
-            arr = arr[:64] if arr.size >= 64 else np.pad(arr, (0, 64-arr.size))
-            vecs.append((arr / max(1.0, float(np.linalg.norm(arr)))).tolist())
-        return vecs
-
-def _build_embedder():
-    if TextEmbedding:
-        try:
-            return TextEmbedding(model_name=EMBED_MODEL)
-        except Exception:
-            pass
-    return _DummyEmbedder()
-
 class GlossaryRAGTool:
     """
     용어집 RAG 검색기.
@@ -75,13 +62,14 @@ class GlossaryRAGTool:
             except Exception:
                 self.client = None
 
-        self.embedder = _build_embedder()
+        # EMBED_MODEL 이 retriever 와 같으면 같은 모델 인스턴스를 공유
+        self.embedder = acquire_embedder(EMBED_MODEL)
 
     def search(self, query: str, k: Optional[int] = None) -> List[Dict[str, Any]]:
         k = k or self.top_k
         if not self.client:
             return []
-        qv = self.embedder.embed([_e5_query_prefix(query)])[0]
+        qv = self.embedder.embed_query(_e5_query_prefix(query))
         try:
             res = self.client.search(
                 collection_name=self.collection,
@@ -108,6 +96,13 @@ class GlossaryRAGTool:
             })
         return out
 
+    def prime_queries(self, queries: List[str]) -> int:
+        return self.embedder.prime_queries([_e5_query_prefix(q) for q in queries])
+
     def lookup_term(self, term: str) -> Optional[Dict[str, Any]]:
         hits = self.search(term, k=1)
         return hits[0] if hits else None
+
+    def close(self) -> None:
+        release_embedder(self.embedder)
+        self.embedder = None
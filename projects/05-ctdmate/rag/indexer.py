@@ -1,8 +1,9 @@
 # ctdmate/rag/indexer.py
 from __future__ import annotations
-import os, json, uuid, hashlib
+import os, json, uuid, hashlib, time, threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Iterable
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
 
 # --- config / deps ---
 try:
@@ -20,6 +21,11 @@ try:
 except Exception as e:
     raise RuntimeError("FastEmbed가 필요합니다. pip install fastembed") from e
 
+try:
+    from ctdmate.rag.sparse import SPARSE_VECTOR_NAME, encode_document
+except Exception:
+    from .sparse import SPARSE_VECTOR_NAME, encode_document  # type: ignore
+
 # 선택: 파서 호출( --parse 옵션)
 def _maybe_parse_to_jsonl(inputs: List[str]) -> List[str]:
     jsonls: List[str] = []
@@ -57,7 +63,12 @@ class Indexer:
     JSONL(chunk) → Qdrant 업서트.
     - 입력: {"id"?, "text", "metadata": {...}} 라인별 JSON
     - 벡터: FastEmbed(E5 호환), cosine
+    - sparse: BM25 TF 성분(SPARSE_VECTOR_NAME, IDF는 Qdrant가 코퍼스 전체로 계산)
     - 중복: id가 없으면 sha256(source+text) 16자리로 생성 → 동일 id면 upsert 덮어쓰기
+    - 파이프라인: JSONL 파싱(메인) → 임베딩+업서트(워커 풀, wait=False) 중첩,
+      동시에 처리 중인 배치는 max_inflight 개로 제한. content_hash 가 같은 기존 포인트는 건너뜀
+    - 증분: 포인트마다 원본 JSONL 경로(index_file)를 기록 → 재인덱싱 시 그 파일이
+      더 이상 만들지 않는 포인트는 삭제 (prune_stale)
     """
     def __init__(
         self,
@@ -66,17 +77,28 @@ class Indexer:
         api_key: Optional[str] = None,
         recreate: bool = False,
         batch_size: int = 128,
+        sparse: Optional[bool] = None,
+        workers: Optional[int] = None,
+        max_inflight: Optional[int] = None,
+        skip_existing: bool = True,
+        prune_stale: bool = True,
     ):
         self.collection = collection or CFG.QDRANT_GUIDE_COLLECTION
         self.client = QdrantClient(url=url or CFG.QDRANT_URL, api_key=api_key or CFG.QDRANT_API_KEY, prefer_grpc=False)
         self.embedder = TextEmbedding(model_name=CFG.EMBED_MODEL)
         self.dim = _probe_dim(self.embedder)
         self.batch_size = int(batch_size)
+        self.sparse = CFG.SPARSE_INDEX if sparse is None else bool(sparse)
+        self.workers = max(1, int(workers or CFG.INDEX_WORKERS))
+        self.max_inflight = max(1, int(max_inflight or self.workers * 2))
+        self.skip_existing = bool(skip_existing)
+        self.prune_stale = bool(prune_stale)
         self._ensure_collection(recreate=recreate)
 
     # ---- 컬렉션 보장 ----
     def _ensure_collection(self, recreate: bool = False):
         exists = False
+        info = None
         try:
             info = self.client.get_collection(self.collection)
             exists = bool(info)
@@ -88,8 +110,26 @@ class Indexer:
             self.client.create_collection(
                 collection_name=self.collection,
                 vectors_config=models.VectorParams(size=self.dim, distance=models.Distance.COSINE),
+                sparse_vectors_config=(
+                    {SPARSE_VECTOR_NAME: models.SparseVectorParams(modifier=models.Modifier.IDF)}
+                    if self.sparse else None
+                ),
                 optimizers_config=models.OptimizersConfigDiff(indexing_threshold=20000),
             )
+        elif self.sparse:
+            # 기존 컬렉션에는 sparse 벡터를 추가할 수 없음 → dense만 인덱싱
+            sparse_cfg = getattr(getattr(info, "config", None), "params", None)
+            if SPARSE_VECTOR_NAME not in (getattr(sparse_cfg, "sparse_vectors", None) or {}):
+                print(f"[WARNING] '{self.collection}'에 sparse 인덱스가 없습니다. --recreate로 재생성하면 활성화됩니다.")
+                self.sparse = False
+        # 파일 단위 정리(scroll 필터)용 payload 인덱스 (이미 있으면 무시)
+        try:
+            self.client.create_payload_index(
+                collection_name=self.collection, field_name="index_file",
+                field_schema=models.PayloadSchemaType.KEYWORD,
+            )
+        except Exception:
+            pass
 
     # ---- 임베딩 ----
     def _embed(self, texts: List[str]) -> List[List[float]]:
@@ -98,11 +138,18 @@ class Indexer:
 
     # ---- 업서트 ----
     def _to_point(self, pid: str, vec: List[float], payload: Dict[str, Any]) -> models.PointStruct:
-        return models.PointStruct(id=pid, vector=vec, payload=payload)
+        if not self.sparse:
+            return models.PointStruct(id=pid, vector=vec, payload=payload)
+        indices, values = encode_document(payload.get("text", ""))
+        return models.PointStruct(
+            id=pid,
+            vector={"": vec, SPARSE_VECTOR_NAME: models.SparseVector(indices=indices, values=values)},
+            payload=payload,
+        )
 
-    def upsert_points(self, points: List[models.PointStruct]) -> None:
+    def upsert_points(self, points: List[models.PointStruct], wait: bool = True) -> None:
         if not points: return
-        self.client.upsert(collection_name=self.collection, points=points)
+        self.client.upsert(collection_name=self.collection, points=points, wait=wait)
 
     # ---- JSONL 파서 ----
     def _iter_jsonl(self, path: Path) -> Iterable[Dict[str, Any]]:
@@ -148,46 +195,152 @@ class Indexer:
         base = (payload.get("source") or "") + payload.get("content_hash", _sha256(payload["text"]))
         return _sha256(base)[:16]
 
+    # ---- 파이프라인 단계 ----
+    def _iter_batches(self, paths: List[Path]) -> Iterator[List[Tuple[int, str, Dict[str, Any]]]]:
+        # (파일 번호, point id, payload) 를 batch_size 단위로
+        batch: List[Tuple[int, str, Dict[str, Any]]] = []
+        for fi, p in enumerate(paths):
+            index_file = str(p.resolve())
+            for obj in self._iter_jsonl(p):
+                payload = self._payload_from_obj(obj)
+                payload["index_file"] = index_file
+                batch.append((fi, self._point_id(obj, payload), payload))
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def _drop_unchanged(self, batch: List[Tuple[int, str, Dict[str, Any]]]) -> List[Tuple[int, str, Dict[str, Any]]]:
+        # 같은 id·같은 content_hash 로 이미 인덱싱된 포인트 제외
+        if not self.skip_existing:
+            return batch
+        try:
+            found = self.client.retrieve(
+                collection_name=self.collection,
+                ids=[pid for _, pid, _ in batch],
+                with_payload=["content_hash", "index_file"],
+                with_vectors=False,
+            )
+        except Exception:
+            return batch
+        indexed = {str(p.id): (p.payload or {}) for p in found or []}
+        todo: List[Tuple[int, str, Dict[str, Any]]] = []
+        moved: Dict[str, List[str]] = {}
+        for item in batch:
+            old = indexed.get(item[1])
+            if old is None or old.get("content_hash") != item[2]["content_hash"]:
+                todo.append(item)
+            elif old.get("index_file") != item[2]["index_file"]:
+                # 내용은 같고 원본 파일만 다름(이전 버전 포인트 포함) → 재임베딩 없이 payload만 갱신
+                moved.setdefault(item[2]["index_file"], []).append(item[1])
+        for index_file, ids in moved.items():
+            # _prune 가 index_file 로 scroll 하므로 반영될 때까지 기다린다
+            self.client.set_payload(
+                collection_name=self.collection, payload={"index_file": index_file}, points=ids, wait=True,
+            )
+        return todo
+
+    def _stale_ids(self, index_file: str, keep: set) -> List[str]:
+        # index_file 로 인덱싱된 포인트 중 이번 실행에서 만들어지지 않은 id
+        stale: List[str] = []
+        flt = models.Filter(must=[models.FieldCondition(key="index_file", match=models.MatchValue(value=index_file))])
+        offset = None
+        while True:
+            found, offset = self.client.scroll(
+                collection_name=self.collection, scroll_filter=flt, limit=1024,
+                offset=offset, with_payload=False, with_vectors=False,
+            )
+            stale.extend(str(p.id) for p in found if str(p.id) not in keep)
+            if offset is None:
+                return stale
+
+    def _prune(self, paths: List[Path], seen: List[set], file_stats: List[Dict[str, Any]]) -> None:
+        # 이번 실행에서 본 id 는 다른 파일로 옮겨졌어도(retag) 살아 있는 포인트
+        live = set().union(*seen)
+        for fi, p in enumerate(paths):
+            stale = self._stale_ids(str(p.resolve()), live)
+            if stale:
+                self.client.delete(collection_name=self.collection, points_selector=models.PointIdsList(points=stale))
+            file_stats[fi]["deleted"] = len(stale)
+
+    def _embed_and_upsert(self, batch: List[Tuple[int, str, Dict[str, Any]]]) -> List[int]:
+        vecs = self._embed([pl["text"] for _, _, pl in batch])
+        pts = [self._to_point(pid, v, pl) for (_, pid, pl), v in zip(batch, vecs)]
+        self.upsert_points(pts, wait=False)
+        return [fi for fi, _, _ in batch]
+
     # ---- JSONL 인덱싱 ----
+    def index_files(self, jsonl_paths: List[str]) -> Dict[str, Any]:
+        """여러 JSONL을 하나의 파이프라인으로 인덱싱 (파일별 결과 + 전체 처리량)."""
+        t0 = time.perf_counter()
+        all_paths = [Path(p) for p in jsonl_paths]
+        details: List[Dict[str, Any]] = []
+        paths: List[Path] = []
+        for p in all_paths:
+            if p.exists():
+                details.append({"ok": True, "file": str(p), "upserted": 0, "skipped": 0, "collection": self.collection})
+                paths.append(p)
+            else:
+                details.append({"ok": False, "file": str(p), "error": "not_found"})
+        file_stats = [d for d in details if d["ok"]]
+        seen: List[set] = [set() for _ in paths]
+
+        inflight = threading.BoundedSemaphore(self.max_inflight)
+        pending: List[Future] = []
+
+        def _reap(block: bool) -> None:
+            for fut in [f for f in pending if block or f.done()]:
+                pending.remove(fut)
+                for fi in fut.result():
+                    file_stats[fi]["upserted"] += 1
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for batch in self._iter_batches(paths):
+                todo = self._drop_unchanged(batch)
+                for fi, pid, _ in batch:
+                    seen[fi].add(pid)
+                    file_stats[fi]["skipped"] += 1
+                for fi, _, _ in todo:
+                    file_stats[fi]["skipped"] -= 1
+                if not todo:
+                    continue
+                inflight.acquire()   # 메모리 상한: 처리 중 배치 max_inflight 개
+                fut = pool.submit(self._embed_and_upsert, todo)
+                fut.add_done_callback(lambda _f: inflight.release())
+                pending.append(fut)
+                _reap(block=False)
+            _reap(block=True)
+        if self.prune_stale:
+            self._prune(paths, seen, file_stats)
+
+        elapsed = time.perf_counter() - t0
+        upserted = sum(d["upserted"] for d in file_stats)
+        skipped = sum(d["skipped"] for d in file_stats)
+        return {
+            "ok": True,
+            "collection": self.collection,
+            "total_upserted": upserted,
+            "total_skipped": skipped,
+            "total_deleted": sum(d.get("deleted", 0) for d in file_stats),
+            "files": len(all_paths),
+            "seconds": round(elapsed, 3),
+            "chunks_per_sec": round((upserted + skipped) / elapsed, 2) if elapsed > 0 else 0.0,
+            "details": details,
+        }
+
     def index_jsonl(self, jsonl_path: str) -> Dict[str, Any]:
-        p = Path(jsonl_path)
-        if not p.exists():
-            return {"ok": False, "file": str(p), "error": "not_found"}
-        points: List[models.PointStruct] = []
-        texts: List[str] = []
-        metas: List[Dict[str, Any]] = []
-        ids: List[str] = []
-
-        for obj in self._iter_jsonl(p):
-            payload = self._payload_from_obj(obj)
-            pid = self._point_id(obj, payload)
-            ids.append(pid); metas.append(payload); texts.append(payload["text"])
-
-            if len(texts) >= self.batch_size:
-                vecs = self._embed(texts)
-                pts = [self._to_point(pid, v, pl) for pid, v, pl in zip(ids, vecs, metas)]
-                self.upsert_points(pts)
-                points.extend(pts)
-                texts.clear(); metas.clear(); ids.clear()
-
-        if texts:
-            vecs = self._embed(texts)
-            pts = [self._to_point(pid, v, pl) for pid, v, pl in zip(ids, vecs, metas)]
-            self.upsert_points(pts)
-            points.extend(pts)
-
-        return {"ok": True, "file": str(p), "upserted": len(points), "collection": self.collection}
+        res = self.index_files([jsonl_path])
+        d = res["details"][0]
+        if not d["ok"]:
+            return d
+        return d | {"seconds": res["seconds"], "chunks_per_sec": res["chunks_per_sec"]}
 
     # ---- 디렉토리 일괄 ----
     def index_dir(self, dir_path: str, pattern: str = "*.jsonl") -> Dict[str, Any]:
         d = Path(dir_path)
         files = sorted(list(d.rglob(pattern)))
-        total = 0; items = []
-        for f in files:
-            res = self.index_jsonl(str(f))
-            total += int(res.get("upserted", 0))
-            items.append(res)
-        return {"ok": True, "total_upserted": total, "files": len(files), "details": items}
+        return self.index_files([str(f) for f in files])
 
 # ---- CLI ----
 def _expand_inputs(paths: List[str]) -> List[str]:
@@ -210,6 +363,9 @@ if __name__ == "__main__":
     ap.add_argument("--collection", default=CFG.QDRANT_GUIDE_COLLECTION)
     ap.add_argument("--recreate", action="store_true", help="컬렉션 재생성")
     ap.add_argument("--batch", type=int, default=128)
+    ap.add_argument("--workers", type=int, default=CFG.INDEX_WORKERS, help="임베딩/업서트 워커 수")
+    ap.add_argument("--no-skip", action="store_true", help="content_hash 가 같은 기존 포인트도 다시 인덱싱")
+    ap.add_argument("--no-prune", action="store_true", help="입력 JSONL이 더 이상 만들지 않는 기존 포인트를 남겨 둠")
     ap.add_argument("--parse", action="store_true", help="입력이 pdf/xlsx면 smartdoc_upstage로 JSONL 생성 후 인덱싱")
     args = ap.parse_args()
 
@@ -231,11 +387,12 @@ if __name__ == "__main__":
     if not jsonls:
         raise SystemExit("인덱싱할 JSONL이 없습니다. (--parse로 pdf/xlsx를 변환하거나 JSONL 경로를 지정)")
 
-    ix = Indexer(collection=args.collection, recreate=args.recreate, batch_size=args.batch)
-    total = 0
-    details = []
-    for j in jsonls:
-        res = ix.index_jsonl(j)
-        details.append(res); total += int(res.get("upserted", 0))
+    ix = Indexer(collection=args.collection, recreate=args.recreate, batch_size=args.batch,
+                 workers=args.workers, skip_existing=not args.no_skip, prune_stale=not args.no_prune)
+    res = ix.index_files(jsonls)
 
-    print(json.dumps({"ok": True, "collection": args.collection, "indexed": total, "files": len(jsonls), "details": details}, ensure_ascii=False, indent=2))
+    print(json.dumps({
+        "ok": True, "collection": args.collection, "indexed": res["total_upserted"],
+        "skipped": res["total_skipped"], "deleted": res["total_deleted"], "files": len(jsonls),
+        "seconds": res["seconds"], "chunks_per_sec": res["chunks_per_sec"], "details": res["details"],
+    }, ensure_ascii=False, indent=2))
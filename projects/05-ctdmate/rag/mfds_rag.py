@@ -50,6 +50,13 @@ class MFDSRAGTool:
         # 선택적 필터 규칙(rules/rag_filters.yaml)
         self.filter_rules = _load_yaml(str(CFG.RULES_DIR / "rag_filters.yaml"))
 
+    def prime_queries(self, queries: List[str]) -> int:
+        return self.retriever.prime_queries(queries)
+
+    def close(self) -> None:
+        # 공용 임베더 참조 반납
+        self.retriever.close()
+
     def _where_for_module(self, module: str) -> Dict[str, Any]:
         m = _normalize_section(module)
         # Use nested path for metadata (LangChain-style payload)
@@ -69,15 +76,15 @@ class MFDSRAGTool:
         return where
 
     def search(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
-        # Use vector_search when BM25 is disabled
-        if not self.retriever.use_bm25:
+        # Use vector_search when neither the sparse index nor BM25 rerank is available
+        if not self.retriever.hybrid_enabled:
             return self.retriever.vector_search(query=query, k=k)
         return self.retriever.search_hybrid(query=query, k=k, fetch_k=max(20, 4*k), alpha=HYBRID_ALPHA)
 
     def search_by_module(self, query: str, module: str, k: int = 5) -> List[Dict[str, Any]]:
         where = self._where_for_module(module)
-        # Use vector_search when BM25 is disabled
-        if not self.retriever.use_bm25:
+        # Use vector_search when neither the sparse index nor BM25 rerank is available
+        if not self.retriever.hybrid_enabled:
             return self.retriever.vector_search(query=query, k=k, where=where)
         return self.retriever.search_hybrid(query=query, k=k, fetch_k=max(20, 4*k), alpha=HYBRID_ALPHA, where=where)
 
@@ -90,5 +97,8 @@ class MFDSRAGTool:
         module: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         where = self._where_for_module(module) if module else None
-        cands = self.retriever.search_hybrid(query=query, k=fetch_k, fetch_k=fetch_k, alpha=HYBRID_ALPHA, where=where)
+        # 저장 벡터를 함께 받아 MMR에서 재임베딩하지 않음
+        cands = self.retriever.search_hybrid(
+            query=query, k=fetch_k, fetch_k=fetch_k, alpha=HYBRID_ALPHA, where=where, with_vectors=True
+        )
         return self.retriever.mmr_rerank(query=query, candidates=cands, k=k, lambda_mult=lambda_mult)
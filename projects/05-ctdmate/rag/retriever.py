@@ -1,6 +1,6 @@
 # ctdmate/rag/retriever.py
 from __future__ import annotations
-import os, json, math, hashlib
+import os, json
 from typing import List, Dict, Any, Optional, Iterable, Tuple
 from pathlib import Path
 
@@ -19,24 +19,23 @@ except Exception as e:
     _qdrant_import_error = e
 
 try:
-    from fastembed import TextEmbedding
-except Exception as e:
-    TextEmbedding = None  # type: ignore
-    _fastembed_import_error = e
+    from rank_bm25 import BM25Okapi  # optional
+except Exception:
+    BM25Okapi = None  # type: ignore
 
+# ---- sparse (BM25) index ----
 try:
-    from sentence_transformers import SentenceTransformer
-except Exception as e:
-    SentenceTransformer = None  # type: ignore
-    _sentence_transformers_import_error = e
+    from ctdmate.rag.sparse import SPARSE_VECTOR_NAME, encode_query, rrf_fuse, tokenize
+except Exception:
+    from .sparse import SPARSE_VECTOR_NAME, encode_query, rrf_fuse, tokenize  # type: ignore
 
+# ---- shared embedder ----
 try:
-    from rank_bm25 import BM25Okapi  # optional
+    from ctdmate.rag.embedding_service import acquire_embedder, release_embedder
 except Exception:
-    BM25Okapi = None  # type: ignore
+    from .embedding_service import acquire_embedder, release_embedder  # type: ignore
 
 import numpy as np
-import re
 
 E5_QUERY_PREFIX = os.getenv("E5_QUERY_PREFIX", "query: ")
 E5_DOC_PREFIX   = os.getenv("E5_DOC_PREFIX",   "passage: ")
@@ -44,51 +43,16 @@ E5_DOC_PREFIX   = os.getenv("E5_DOC_PREFIX",   "passage: ")
 def _norm_text(s: str) -> str:
     return " ".join((s or "").split())
 
-def _tokens_for_bm25(s: str) -> List[str]:
-    return re.findall(r"[A-Za-z가-힣0-9]{2,}", s.lower())
+def query_text(query: str) -> str:
+    # embed_query 에 넘기는 실제 문자열 (쿼리 캐시 키)
+    return E5_QUERY_PREFIX + _norm_text(query)
 
-def _cosine(a: np.ndarray, b: np.ndarray) -> float:
-    denom = (np.linalg.norm(a) * np.linalg.norm(b))
-    return float(np.dot(a, b) / denom) if denom else 0.0
+def _tokens_for_bm25(s: str) -> List[str]:
+    return tokenize(s)
 
-def _build_embedder():
-    # Try sentence-transformers first (supports more models including -instruct variants)
-    if SentenceTransformer:
-        try:
-            model = SentenceTransformer(CFG.EMBED_MODEL)
-            # Wrap to match FastEmbed API
-            class _STWrapper:
-                def __init__(self, model):
-                    self.model = model
-                def embed(self, texts: List[str]) -> List[List[float]]:
-                    return self.model.encode(texts, convert_to_numpy=True).tolist()
-            return _STWrapper(model)
-        except Exception as e:
-            import sys
-            print(f"[WARNING] SentenceTransformer failed: {e}", file=sys.stderr)
-
-    # Fallback to FastEmbed
-    if TextEmbedding:
-        try:
-            return TextEmbedding(model_name=CFG.EMBED_MODEL)
-        except Exception as e:
-            import sys
-            print(f"[WARNING] FastEmbed failed: {e}", file=sys.stderr)
-
-    # very small deterministic fallback
-    import sys
-    print(f"[WARNING] Using dummy embedder (256 dims)", file=sys.stderr)
-    class _Dummy:
-        def embed(self, texts: List[str]) -> List[List[float]]:
-            vecs = []
-            for t in texts:
-                h = hashlib.sha256(t.encode("utf-8")).digest()
-                arr = np.frombuffer(h, dtype=np.uint8).astype("float32")
-                arr = arr[:256] if arr.size >= 256 else np.pad(arr, (0, 256-arr.size))
-                v = arr / max(1.0, float(np.linalg.norm(arr)))
-                vecs.append(v.tolist())
-            return vecs
-    return _Dummy()
+def _unit_rows(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    return np.divide(x, norms, out=np.zeros_like(x), where=norms > 0)
 
 def _ensure_qdrant():
     if QdrantClient is None or models is None:
@@ -98,7 +62,8 @@ class Retriever:
     """
     Qdrant 컬렉션 검색기.
     - vector_search: 벡터 kNN
-    - search_hybrid: 벡터(kNN) 후보 → BM25 재랭크 → alpha 결합
+    - search_hybrid: 컬렉션에 sparse(BM25) 인덱스가 있으면 dense/sparse 각각 검색 → 가중 RRF 결합,
+                     없으면 벡터(kNN) 후보 → BM25 재랭크 → alpha 결합
     - mmr_rerank: 다양성 재랭크
     반환 포맷: {"content": str, "metadata": {...}, "score": float}
     """
@@ -138,10 +103,23 @@ class Retriever:
             # 서버 모드 (HTTP/HTTPS)
             self.client = QdrantClient(url=qdrant_url, api_key=qdrant_api_key, prefer_grpc=False)
 
-        self.embedder = _build_embedder()
+        # 모델명별 프로세스 공용 임베더 (close()에서 반납)
+        self.embedder = acquire_embedder(CFG.EMBED_MODEL)
         self.use_bm25 = bool(use_bm25 and BM25Okapi is not None)
+        self.use_sparse = bool(CFG.SPARSE_INDEX and self._has_sparse_index())
         self.payload_key = fetch_payload_text_key
 
+    def _has_sparse_index(self) -> bool:
+        try:
+            info = self.client.get_collection(self.collection)
+            return SPARSE_VECTOR_NAME in (info.config.params.sparse_vectors or {})
+        except Exception:
+            return False
+
+    @property
+    def hybrid_enabled(self) -> bool:
+        return self.use_sparse or self.use_bm25
+
     # ---------- Qdrant Filter ----------
     def _build_filter(self, where: Optional[Dict[str, Any]]) -> Optional["models.Filter"]:
         if not where:
@@ -165,9 +143,10 @@ class Retriever:
 
     # ---------- Vector search ----------
     def vector_search(
-        self, query: str, k: int = 5, where: Optional[Dict[str, Any]] = None
+        self, query: str, k: int = 5, where: Optional[Dict[str, Any]] = None,
+        with_vectors: bool = False,
     ) -> List[Dict[str, Any]]:
-        qv = self.embedder.embed([E5_QUERY_PREFIX + _norm_text(query)])[0]
+        qv = self.embedder.embed_query(query_text(query))
         flt = self._build_filter(where)
         try:
             res = self.client.search(
@@ -175,12 +154,12 @@ class Retriever:
                 query_vector=qv,
                 limit=int(k),
                 with_payload=True,
-                with_vectors=False,
+                with_vectors=bool(with_vectors),
                 query_filter=flt,
             )
         except Exception:
             return []
-        return [self._point_to_doc(p) for p in res or []]
+        return [self._point_to_doc(p, with_vectors) for p in res or []]
 
     # ---------- Hybrid (vector + BM25) ----------
     def search_hybrid(
@@ -190,11 +169,15 @@ class Retriever:
         fetch_k: int = 30,
         alpha: float = 0.7,
         where: Optional[Dict[str, Any]] = None,
+        with_vectors: bool = False,
     ) -> List[Dict[str, Any]]:
         alpha = float(alpha)
         fetch_k = max(k, int(fetch_k))
+        if self.use_sparse:
+            return self._search_fused(query, k=k, fetch_k=fetch_k, alpha=alpha, where=where, with_vectors=with_vectors)
+
         # Step1: vector fetch_k
-        vec_hits = self.vector_search(query, k=fetch_k, where=where)
+        vec_hits = self.vector_search(query, k=fetch_k, where=where, with_vectors=with_vectors)
         if not vec_hits:
             return []
         if not self.use_bm25:
@@ -220,6 +203,40 @@ class Retriever:
         ranked = [vec_hits[i] | {"score": float(comb[i])} for i in order[:k]]
         return ranked
 
+    # ---------- Dense + sparse (corpus BM25) fusion ----------
+    def _search_fused(
+        self,
+        query: str,
+        k: int,
+        fetch_k: int,
+        alpha: float,
+        where: Optional[Dict[str, Any]] = None,
+        with_vectors: bool = False,
+    ) -> List[Dict[str, Any]]:
+        indices, values = encode_query(query)
+        if not indices:
+            return self.vector_search(query, k=k, where=where, with_vectors=with_vectors)
+        qv = self.embedder.embed_query(query_text(query))
+        flt = self._build_filter(where)
+        common = dict(
+            collection_name=self.collection, limit=int(fetch_k), query_filter=flt,
+            with_payload=True, with_vectors=bool(with_vectors),
+        )
+        try:
+            dense = self.client.query_points(query=qv, **common).points
+            sparse = self.client.query_points(
+                query=models.SparseVector(indices=indices, values=values), using=SPARSE_VECTOR_NAME, **common
+            ).points
+        except Exception:
+            return self.vector_search(query, k=k, where=where, with_vectors=with_vectors)
+
+        points = {str(p.id): p for p in list(sparse) + list(dense)}
+        fused = rrf_fuse(
+            [[str(p.id) for p in dense], [str(p.id) for p in sparse]],
+            weights=[alpha, 1.0 - alpha],
+        )
+        return [self._point_to_doc(points[pid], with_vectors) | {"score": score} for pid, score in fused[:k]]
+
     # ---------- MMR rerank ----------
     def mmr_rerank(
         self,
@@ -229,36 +246,59 @@ class Retriever:
         lambda_mult: float = 0.5,
         text_key: str = "content",
     ) -> List[Dict[str, Any]]:
+        """
+        후보의 저장 벡터("vector", with_vectors=True 로 조회)를 그대로 사용하고,
+        없는 후보만 임베딩한다. 유사도는 정규화 후 행렬곱 한 번으로 계산하고
+        선택된 문서와의 최대 유사도 벡터를 점진 갱신한다.
+        """
         if not candidates:
             return []
-        q_vec = np.array(self.embedder.embed([E5_QUERY_PREFIX + _norm_text(query)])[0], dtype="float32")
-        docs = [c.get(text_key) or "" for c in candidates]
-        dvecs = np.array(self.embedder.embed([E5_DOC_PREFIX + _norm_text(t) for t in docs]), dtype="float32")
+        q_vec = _unit_rows(np.asarray(self.embedder.embed_query(query_text(query)), dtype="float32"))
+
+        missing = [i for i, c in enumerate(candidates) if c.get("vector") is None]
+        if missing:
+            embedded = self.embedder.embed(
+                [E5_DOC_PREFIX + _norm_text(candidates[i].get(text_key) or "") for i in missing]
+            )
+            fill = dict(zip(missing, embedded))
+        else:
+            fill = {}
+        dvecs = _unit_rows(np.asarray(
+            [fill[i] if i in fill else c["vector"] for i, c in enumerate(candidates)], dtype="float32"
+        ))
+
+        sims_to_q = dvecs @ q_vec
+        sims = dvecs @ dvecs.T
+        n = len(candidates)
+        k = min(int(k), n)
 
-        sims_to_q = np.array([_cosine(q_vec, v) for v in dvecs], dtype="float32")
         selected: List[int] = []
-        remaining: List[int] = list(range(len(candidates)))
+        picked = np.zeros(n, dtype=bool)
+        max_sim = np.zeros(n, dtype="float32")   # 선택 문서와의 최대 유사도 (음수는 0으로 취급)
+        while len(selected) < k:
+            if selected:
+                scores = lambda_mult * sims_to_q - (1.0 - lambda_mult) * max_sim
+            else:
+                scores = sims_to_q.copy()
+            scores[picked] = -np.inf
+            i = int(np.argmax(scores))
+            selected.append(i)
+            picked[i] = True
+            np.maximum(max_sim, sims[i], out=max_sim)
 
-        while remaining and len(selected) < k:
-            if not selected:
-                i = int(np.argmax(sims_to_q[remaining]))
-                selected.append(remaining.pop(i))
-                continue
-            best_idx = None
-            best_score = -math.inf
-            for idx_pos, idx in enumerate(remaining):
-                max_div = 0.0
-                for s in selected:
-                    max_div = max(max_div, _cosine(dvecs[idx], dvecs[s]))
-                score = lambda_mult * sims_to_q[idx] - (1.0 - lambda_mult) * max_div
-                if score > best_score:
-                    best_score = score
-                    best_idx = idx_pos
-            selected.append(remaining.pop(best_idx))  # type: ignore
-        return [candidates[i] for i in selected[:k]]
+        return [{key: v for key, v in candidates[i].items() if key != "vector"} for i in selected]
+
+    # ---------- Lifecycle ----------
+    def prime_queries(self, queries: List[str]) -> int:
+        # 곧 검색할 쿼리들을 한 번에 임베딩해 두기 (embedding_service 쿼리 캐시)
+        return self.embedder.prime_queries([query_text(q) for q in queries])
+
+    def close(self) -> None:
+        release_embedder(self.embedder)
+        self.embedder = None
 
     # ---------- Helpers ----------
-    def _point_to_doc(self, p) -> Dict[str, Any]:
+    def _point_to_doc(self, p, with_vectors: bool = False) -> Dict[str, Any]:
         pl = p.payload or {}
 
         # Content 추출: page_content (LangChain 스타일) 또는 self.payload_key 또는 definition
@@ -285,4 +325,11 @@ class Retriever:
                 "para_id": meta.get("para_id"),
             },
             "score": float(getattr(p, "score", 0.0) or 0.0),
-        }
+        } | ({"vector": self._point_vector(p)} if with_vectors else {})
+
+    @staticmethod
+    def _point_vector(p) -> Optional[List[float]]:
+        vec = getattr(p, "vector", None)
+        if isinstance(vec, dict):  # named vectors: 첫 번째 dense 벡터
+            vec = next((v for v in vec.values() if isinstance(v, list)), None)
+        return vec
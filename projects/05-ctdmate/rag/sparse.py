@@ -0,0 +1,78 @@
+# ctdmate/rag/sparse.py
+from __future__ import annotations
+import re, hashlib
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# ---- config ----
+try:
+    from ctdmate.app import config as CFG
+except Exception:
+    from ..app import config as CFG  # type: ignore
+
+# Qdrant 컬렉션의 sparse 벡터 이름 (IDF modifier → 코퍼스 전체 IDF는 Qdrant가 계산)
+SPARSE_VECTOR_NAME = "bm25"
+
+_TOKEN_RE = re.compile(r"[A-Za-z가-힣0-9]{2,}")
+
+
+def tokenize(s: str) -> List[str]:
+    # retriever BM25 재랭크와 동일한 토큰화
+    return _TOKEN_RE.findall((s or "").lower())
+
+
+def term_id(token: str) -> int:
+    # 프로세스/실행 간 안정적인 32bit 해시 (Python hash()는 실행마다 다름)
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+def _to_sparse(weights: Dict[int, float]) -> Tuple[List[int], List[float]]:
+    indices = sorted(weights)
+    return indices, [float(weights[i]) for i in indices]
+
+
+def encode_document(
+    text: str,
+    k1: Optional[float] = None,
+    b: Optional[float] = None,
+    avg_len: Optional[float] = None,
+) -> Tuple[List[int], List[float]]:
+    """
+    문서 → BM25 TF 성분 sparse 벡터 (indices, values).
+    IDF는 컬렉션의 Modifier.IDF 로 검색 시 적용된다.
+    """
+    k1 = CFG.BM25_K1 if k1 is None else k1
+    b = CFG.BM25_B if b is None else b
+    avg_len = CFG.BM25_AVG_LEN if avg_len is None else avg_len
+    toks = tokenize(text)
+    if not toks:
+        return [], []
+    norm = k1 * (1.0 - b + b * len(toks) / max(1.0, float(avg_len)))
+    weights: Dict[int, float] = {}
+    for tok, tf in Counter(toks).items():
+        tid = term_id(tok)
+        weights[tid] = weights.get(tid, 0.0) + tf * (k1 + 1.0) / (tf + norm)
+    return _to_sparse(weights)
+
+
+def encode_query(text: str) -> Tuple[List[int], List[float]]:
+    # 쿼리는 고유 토큰마다 1.0 (점수 = Σ IDF·TF성분)
+    return _to_sparse({term_id(tok): 1.0 for tok in set(tokenize(text))})
+
+
+def rrf_fuse(
+    ranked_lists: Sequence[Sequence[str]],
+    weights: Optional[Sequence[float]] = None,
+    k: Optional[int] = None,
+) -> List[Tuple[str, float]]:
+    """
+    Reciprocal Rank Fusion. score(d) = Σ w_i / (k + rank_i(d)), rank는 1부터.
+    반환: (id, score) 점수 내림차순 (동점은 먼저 등장한 순)
+    """
+    k = CFG.RRF_K if k is None else k
+    weights = list(weights) if weights is not None else [1.0] * len(ranked_lists)
+    scores: Dict[str, float] = {}
+    for w, ids in zip(weights, ranked_lists):
+        for rank, pid in enumerate(ids, start=1):
+            scores[pid] = scores.get(pid, 0.0) + float(w) / (k + rank)
+    return sorted(scores.items(), key=lambda kv: -kv[1])
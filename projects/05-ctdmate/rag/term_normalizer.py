@@ -1,6 +1,6 @@
 # ctdmate/rag/term_normalizer.py
 from __future__ import annotations
-from typing import Any, Optional, Dict, List, Tuple
+from typing import Any, Optional, Dict, List
 from pathlib import Path
 import re, json, yaml
 
@@ -11,7 +11,11 @@ except Exception:
     from ..app import config as APP_CONFIG  # type: ignore
 
 _RULES: Optional[Dict[str, Any]] = None
-_PATTERNS: List[Tuple[re.Pattern, str]] = []
+# 모든 동의어를 하나로 묶은 매처(접두사 트리 정규식, 긴 것 우선) + 소문자 동의어 → 표준어
+_MATCHER: Optional[re.Pattern] = None
+_CANONICAL: Dict[str, str] = {}
+# 문장 경계(구분자 보존): 마침표류 뒤 공백 또는 줄바꿈
+_SENT_SPLIT_RX = re.compile(r"((?<=[.!?。])\s+|\n+)")
 
 def _read_text(p: Path) -> Optional[str]:
     try:
@@ -21,7 +25,7 @@ def _read_text(p: Path) -> Optional[str]:
 
 def _load_rules() -> Dict[str, Any]:
     """normalization.yaml / normalize.json / nomalization.yaml 탐색 후 로드."""
-    global _RULES, _PATTERNS
+    global _RULES, _MATCHER, _CANONICAL
     if _RULES is not None:
         return _RULES
 
@@ -63,15 +67,43 @@ def _load_rules() -> Dict[str, Any]:
             if isinstance(v, list):
                 terms.append({"canonical": str(k), "synonyms": [str(s) for s in v]})
 
-    _PATTERNS = []
+    _CANONICAL = {}
     for t in terms:
-        can = t["canonical"]
         for s in t["synonyms"]:
-            _PATTERNS.append((re.compile(rf"(?<!\w){re.escape(s)}(?!\w)", re.I), can))
+            _CANONICAL.setdefault(s.lower(), t["canonical"])   # 같은 동의어는 먼저 정의된 표준어
+    _MATCHER = _compile_matcher(_CANONICAL)
 
     _RULES = {"terms": terms}
     return _RULES
 
+def _trie_pattern(node: Dict[str, Any]) -> str:
+    # 접두사 트리 → 정규식. 각 위치에서 후보 분기가 첫 글자로 갈리므로 동의어 수와 무관하게
+    # 매칭 비용은 일치 길이에 비례. 끝 노드의 자식은 greedy (?:…)? → 긴 동의어 우선.
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return f"(?:{body})?" if "" in node else body
+
+def _compile_matcher(canonical: Dict[str, str]) -> Optional[re.Pattern]:
+    """모든 동의어를 한 번에 찾는 단일 패스 매처 (단어 경계는 기존 패턴별 규칙과 동일)."""
+    if not canonical:
+        return None
+    trie: Dict[str, Any] = {}
+    for syn in canonical:
+        node = trie
+        for ch in syn:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    return re.compile(rf"(?<!\w){_trie_pattern(trie)}(?!\w)", re.I)
+
+def apply_rules(text: str) -> str:
+    """규칙 기반 치환만 수행 (텍스트 길이에 선형, 한 번 훑음)."""
+    _load_rules()
+    if not text or _MATCHER is None:
+        return text
+    return _MATCHER.sub(lambda m: _CANONICAL.get(m.group(0).lower(), m.group(0)), text)
+
 class TermNormalizer:
     """
     규칙 기반 용어 정규화기.
@@ -85,16 +117,32 @@ class TermNormalizer:
     def normalize(self, text: str) -> str:
         if not text:
             return text
-        out = text
-        for rx, can in _PATTERNS:
-            out = rx.sub(can, out)
-        if self.client:
-            try:
-                sys = "You normalize medical regulatory terms to canonical forms. Keep meaning. Return text only."
-                user = f"Normalize terminology in Korean:\n{out}"
-                resp = self.client.chat(system=sys, user=user)
-                if isinstance(resp, str) and resp.strip():
-                    out = resp.strip()
-            except Exception:
-                pass
-        return out
+        if not self.client:
+            return apply_rules(text)
+        # 규칙은 전체 텍스트에 한 번 적용 (". " 를 포함한 동의어도 매칭)
+        fixed = apply_rules(text)
+        if fixed == text:
+            return text
+        # LLM 보정은 규칙 치환으로 실제 바뀐 문장에만 (같은 문장은 한 번만 호출)
+        original = set(_SENT_SPLIT_RX.split(text)[::2])
+        parts = _SENT_SPLIT_RX.split(fixed)   # [문장, 구분자, 문장, ...]
+        refined: Dict[str, str] = {}
+        for i in range(0, len(parts), 2):
+            sent = parts[i]
+            if sent in original:
+                continue
+            if sent not in refined:
+                refined[sent] = self._refine(sent)
+            parts[i] = refined[sent]
+        return "".join(parts)
+
+    def _refine(self, sentence: str) -> str:
+        try:
+            sys = "You normalize medical regulatory terms to canonical forms. Keep meaning. Return text only."
+            user = f"Normalize terminology in Korean:\n{sentence}"
+            resp = self.client.chat(system=sys, user=user)
+            if isinstance(resp, str) and resp.strip():
+                return resp.strip()
+        except Exception:
+            pass
+        return sentence
@@ -0,0 +1,73 @@
+# ctdmate/tests/test_embedding_service.py
+from __future__ import annotations
+import threading
+from ctdmate.rag import embedding_service as ES
+
+class CountingBackend:
+    def __init__(self):
+        self.calls = []
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+def test_registry_shares_and_refcounts(monkeypatch):
+    loads = []
+    monkeypatch.setattr(ES, "_load_backend", lambda name: loads.append(name) or CountingBackend())
+    a = ES.acquire_embedder("test-model")
+    b = ES.acquire_embedder("test-model")
+    assert a is b
+    assert loads == ["test-model"]
+    assert ES.embedder_refcount("test-model") == 2
+
+    ES.release_embedder(a)
+    assert ES.embedder_refcount("test-model") == 1
+    ES.release_embedder(b)
+    assert ES.embedder_refcount("test-model") == 0
+
+    c = ES.acquire_embedder("test-model")
+    assert c is not a   # 0이 되면 내렸다가 다시 로드
+    assert loads == ["test-model", "test-model"]
+    ES.release_embedder(c)
+
+def test_query_lru_cache():
+    backend = CountingBackend()
+    svc = ES.EmbeddingService("m", backend=backend, cache_size=2, max_wait_ms=0)
+    assert svc.embed_query("aa") == [2.0, 1.0]
+    svc.embed_query("aa")
+    assert len(backend.calls) == 1
+    assert svc.stats["hits"] == 1
+
+    svc.embed_query("bbb")
+    svc.embed_query("cccc")          # "aa" 밀려남
+    svc.embed_query("aa")
+    assert len(backend.calls) == 4
+    svc.close()
+
+def test_concurrent_queries_are_batched():
+    backend = CountingBackend()
+    svc = ES.EmbeddingService("m", backend=backend, cache_size=0, max_batch=16, max_wait_ms=200)
+    results = {}
+    barrier = threading.Barrier(8)
+
+    def worker(i):
+        barrier.wait()
+        results[i] = svc.embed_query("q" * (i + 1))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+
+    assert results == {i: [float(i + 1), 1.0] for i in range(8)}
+    assert len(backend.calls) < 8
+    assert sum(len(c) for c in backend.calls) == 8
+    svc.close()
+
+def test_prime_queries_batches_into_cache():
+    backend = CountingBackend()
+    svc = ES.EmbeddingService("m", backend=backend, cache_size=8, max_wait_ms=0)
+    svc.embed_query("a")
+    assert svc.prime_queries(["a", "bb", "bb", "ccc"]) == 2   # 캐시에 있거나 중복이면 제외
+    assert backend.calls[-1] == ["bb", "ccc"]
+    assert svc.embed_query("ccc") == [3.0, 1.0]
+    assert len(backend.calls) == 2
+    svc.close()
@@ -0,0 +1,66 @@
+# ctdmate/tests/test_gen_solar.py
+from __future__ import annotations
+import json
+from ctdmate.tools import gen_solar as GS
+
+class FakeResponse:
+    def __init__(self, status_code, deltas):
+        self.status_code = status_code
+        self.deltas = deltas
+        self.encoding = None
+    def raise_for_status(self):
+        pass
+    def close(self):
+        pass
+    def iter_lines(self, decode_unicode=False):
+        for d in self.deltas:
+            yield "data: " + json.dumps({"choices": [{"delta": {"content": d}}]})
+            yield ""
+        yield "data: [DONE]"
+    def json(self):
+        return {"choices": [{"message": {"content": "".join(self.deltas)}}]}
+
+class FakeSession:
+    def __init__(self, missing_paths=()):
+        self.posts = []
+        self.missing_paths = missing_paths
+    def post(self, url, headers, json, stream, timeout):
+        self.posts.append((url, json["stream"]))
+        if any(url.endswith(p) for p in self.missing_paths):
+            return FakeResponse(404, [])
+        return FakeResponse(200, ["### Draft", " body", " [CIT-1]"])
+
+def _generator(monkeypatch, session):
+    monkeypatch.setattr(GS, "_http_session", lambda: session)
+    return GS.SolarGenerator(enable_rag=False, auto_normalize=False, output_format="markdown")
+
+def test_stream_tokens_then_cache_hit(monkeypatch):
+    session = FakeSession()
+    gen = _generator(monkeypatch, session)
+    tokens = []
+    out = gen.generate("M2.3", "요약", on_token=tokens.append)
+    assert tokens == ["### Draft", " body", " [CIT-1]"]
+    assert out["text"] == "### Draft body [CIT-1]"
+    assert out["cache_hit"] is False and out["offline_fallback"] is None
+    assert session.posts[0][1] is True
+
+    # 같은 섹션·프롬프트·근거·모델 → 호출 없이 즉시
+    again = gen.generate("M2.3", "요약", on_token=tokens.append)
+    assert again["cache_hit"] is True and again["text"] == out["text"]
+    assert tokens[-1] == "### Draft body [CIT-1]"
+    assert len(session.posts) == 1
+
+    # 프롬프트가 바뀌면 다시 호출 (비스트리밍)
+    gen.generate("M2.3", "다른 요약")
+    assert len(session.posts) == 2 and session.posts[1][1] is False
+
+def test_working_chat_path_is_remembered(monkeypatch):
+    monkeypatch.setattr(GS.CFG, "UPSTAGE_CHAT_PATH", "/v1/chat/completions")
+    session = FakeSession(missing_paths=("/v1/chat/completions",))
+    gen = _generator(monkeypatch, session)
+    gen.generate("M2.7", "a")
+    gen.generate("M2.7", "b")
+    base = GS.CFG.UPSTAGE_API_BASE.rstrip("/")
+    assert [u[len(base):] for u, _ in session.posts] == [
+        "/v1/chat/completions", "/solar/chat/completions", "/solar/chat/completions",
+    ]
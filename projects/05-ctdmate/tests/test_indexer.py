@@ -0,0 +1,122 @@
+# ctdmate/tests/test_indexer.py
+from __future__ import annotations
+import json
+import threading
+from types import SimpleNamespace
+from ctdmate.rag.indexer import Indexer
+
+class FakeClient:
+    def __init__(self):
+        self.points = {}
+        self.upsert_waits = []
+        self.lock = threading.Lock()
+    def retrieve(self, collection_name, ids, with_payload, with_vectors):
+        with self.lock:
+            return [SimpleNamespace(id=i, payload=self.points[i]) for i in ids if i in self.points]
+    def upsert(self, collection_name, points, wait=True):
+        with self.lock:
+            self.upsert_waits.append(wait)
+            for p in points:
+                self.points[str(p.id)] = dict(p.payload)
+    def set_payload(self, collection_name, payload, points, wait=True):
+        with self.lock:
+            for i in points:
+                self.points[i].update(payload)
+    def scroll(self, collection_name, scroll_filter, limit, offset, with_payload, with_vectors):
+        value = scroll_filter.must[0].match.value
+        ids = sorted(i for i, pl in self.points.items() if pl.get("index_file") == value)
+        start = offset or 0
+        nxt = start + limit if start + limit < len(ids) else None
+        return [SimpleNamespace(id=i) for i in ids[start:start + limit]], nxt
+    def delete(self, collection_name, points_selector):
+        with self.lock:
+            for i in points_selector.points:
+                self.points.pop(i, None)
+
+def _indexer(client, batch_size=2, workers=2) -> Indexer:
+    ix = Indexer.__new__(Indexer)   # 모델 로드 없이 파이프라인만 검증
+    ix.collection, ix.client = "c", client
+    ix.batch_size, ix.sparse = batch_size, False
+    ix.workers, ix.max_inflight = workers, 2
+    ix.skip_existing = ix.prune_stale = True
+    ix._embed = lambda texts: [[float(len(t)), 1.0] for t in texts]
+    return ix
+
+def _write_jsonl(path, texts):
+    path.write_text("\n".join(json.dumps({"text": t, "metadata": {"source": path.name}}) for t in texts), encoding="utf-8")
+    return str(path)
+
+def test_index_files_counts_and_skips_unchanged(tmp_path):
+    a = _write_jsonl(tmp_path / "a.jsonl", [f"chunk {i}" for i in range(5)])
+    b = _write_jsonl(tmp_path / "b.jsonl", ["other 1", "other 2"])
+    client = FakeClient()
+    ix = _indexer(client)
+
+    res = ix.index_files([a, b, str(tmp_path / "missing.jsonl")])
+    assert res["total_upserted"] == 7 and res["total_skipped"] == 0
+    assert [d.get("upserted") for d in res["details"]] == [5, 2, None]
+    assert res["details"][2]["error"] == "not_found"
+    assert len(client.points) == 7
+    assert set(client.upsert_waits) == {False}
+
+    # 재실행: 전부 건너뜀, 바뀐 청크만 다시 업서트
+    again = ix.index_files([a, b])
+    assert again["total_upserted"] == 0 and again["total_skipped"] == 7
+    _write_jsonl(tmp_path / "b.jsonl", ["other 1", "other 2 changed"])
+    changed = ix.index_jsonl(b)
+    assert changed["upserted"] == 1 and changed["skipped"] == 1
+    assert "chunks_per_sec" in changed
+
+def test_incremental_reindex_prunes_and_retags(tmp_path):
+    a = _write_jsonl(tmp_path / "a.jsonl", ["keep 1", "keep 2", "drop me"])
+    client = FakeClient()
+    ix = _indexer(client)
+    ix.index_files([a])
+    assert len(client.points) == 3
+
+    # 청크 하나 삭제 + 하나 추가 → 새 청크만 임베딩, 사라진 청크는 삭제
+    _write_jsonl(tmp_path / "a.jsonl", ["keep 1", "keep 2", "new one"])
+    res = ix.index_jsonl(a)
+    assert (res["upserted"], res["skipped"], res["deleted"]) == (1, 2, 1)
+    assert sorted(pl["text"] for pl in client.points.values()) == ["keep 1", "keep 2", "new one"]
+
+    # index_file 이 없는 이전 포인트는 재임베딩 없이 payload만 채움
+    for pl in client.points.values():
+        pl.pop("index_file")
+    res = ix.index_jsonl(a)
+    assert (res["upserted"], res["skipped"], res["deleted"]) == (0, 3, 0)
+    assert {pl["index_file"] for pl in client.points.values()} == {str((tmp_path / "a.jsonl").resolve())}
+
+    # 다른 파일의 포인트는 건드리지 않음
+    b = _write_jsonl(tmp_path / "b.jsonl", ["other"])
+    ix.index_files([b])
+    _write_jsonl(tmp_path / "a.jsonl", [])
+    assert ix.index_jsonl(a)["deleted"] == 3
+    assert [pl["text"] for pl in client.points.values()] == ["other"]
+
+class LaggingPayloadClient(FakeClient):
+    # set_payload 가 아직 반영되지 않은 상태(비동기 쓰기)를 흉내
+    def __init__(self):
+        super().__init__()
+        self.payload_waits = []
+    def set_payload(self, collection_name, payload, points, wait=True):
+        self.payload_waits.append(wait)
+
+def test_prune_keeps_points_moved_to_another_file(tmp_path):
+    def write(path, texts):
+        path.write_text("\n".join(json.dumps({"text": t, "metadata": {"source": "shared"}}) for t in texts), encoding="utf-8")
+        return str(path)
+
+    a = write(tmp_path / "a.jsonl", ["moved"])
+    b = write(tmp_path / "b.jsonl", ["stay"])
+    client = LaggingPayloadClient()
+    ix = _indexer(client)
+    ix.index_files([a, b])
+
+    # 같은 청크가 a → b 로 이동: payload 갱신이 늦어도 a 의 prune 에서 지우면 안 됨
+    write(tmp_path / "a.jsonl", [])
+    write(tmp_path / "b.jsonl", ["stay", "moved"])
+    res = ix.index_files([a, b])
+    assert [d["deleted"] for d in res["details"]] == [0, 0]
+    assert sorted(pl["text"] for pl in client.points.values()) == ["moved", "stay"]
+    assert client.payload_waits == [True]
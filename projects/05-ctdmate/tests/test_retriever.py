@@ -0,0 +1,107 @@
+# ctdmate/tests/test_retriever.py
+from __future__ import annotations
+import numpy as np
+from ctdmate.rag.retriever import Retriever
+
+class FakeEmbedder:
+    def __init__(self, q_vec):
+        self.q_vec = q_vec
+        self.doc_calls = 0
+    def embed_query(self, text):
+        return list(self.q_vec)
+    def embed(self, texts):
+        self.doc_calls += 1
+        return [[1.0] + [0.0] * (len(self.q_vec) - 1) for _ in texts]
+
+def _retriever(q_vec) -> Retriever:
+    r = Retriever.__new__(Retriever)   # Qdrant 없이 MMR만 검증
+    r.embedder = FakeEmbedder(q_vec)
+    return r
+
+def _reference_mmr(q, D, k, lam):
+    # 기존 pairwise 루프 구현
+    cos = lambda a, b: float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+    sims_q = [cos(q, d) for d in D]
+    selected, remaining = [], list(range(len(D)))
+    while remaining and len(selected) < k:
+        if not selected:
+            selected.append(remaining.pop(int(np.argmax([sims_q[i] for i in remaining]))))
+            continue
+        best_pos, best = None, -np.inf
+        for pos, i in enumerate(remaining):
+            div = max([0.0] + [cos(D[i], D[s]) for s in selected])
+            score = lam * sims_q[i] - (1 - lam) * div
+            if score > best:
+                best, best_pos = score, pos
+        selected.append(remaining.pop(best_pos))
+    return selected
+
+def test_mmr_matches_reference_and_uses_stored_vectors():
+    rng = np.random.default_rng(0)
+    q = rng.normal(size=16).astype("float32")
+    D = rng.normal(size=(40, 16)).astype("float32")
+    cands = [{"content": f"d{i}", "vector": D[i].tolist(), "score": 0.0} for i in range(40)]
+    r = _retriever(q)
+
+    out = r.mmr_rerank("q", cands, k=8, lambda_mult=0.6)
+    assert [c["content"] for c in out] == [f"d{i}" for i in _reference_mmr(q, D, 8, 0.6)]
+    assert r.embedder.doc_calls == 0
+    assert all("vector" not in c for c in out)
+
+def test_mmr_embeds_only_missing_vectors():
+    r = _retriever([1.0, 0.0])
+    cands = [{"content": "a", "vector": [0.0, 1.0]}, {"content": "b"}]
+    out = r.mmr_rerank("q", cands, k=5)
+    assert [c["content"] for c in out] == ["b", "a"]
+    assert r.embedder.doc_calls == 1
+
+def test_rrf_fuse_weights_and_order():
+    from ctdmate.rag.sparse import rrf_fuse
+    fused = rrf_fuse([["a", "b", "c"], ["c", "d"]], weights=[1.0, 1.0], k=60)
+    assert [pid for pid, _ in fused][:1] == ["c"]          # 두 목록에 모두 등장
+    assert {pid for pid, _ in fused} == {"a", "b", "c", "d"}
+    only_dense = rrf_fuse([["a", "b"], ["b", "a"]], weights=[1.0, 0.0], k=60)
+    assert [pid for pid, _ in only_dense] == ["a", "b"]
+
+def test_sparse_encoding_is_stable():
+    from ctdmate.rag.sparse import encode_document, encode_query, term_id
+    idx, vals = encode_document("Dissolution dissolution test 용출 시험")
+    assert idx == sorted(idx) and len(idx) == len(vals) == 4
+    assert term_id("dissolution") in idx
+    assert vals[idx.index(term_id("dissolution"))] > vals[idx.index(term_id("test"))]   # tf=2 > tf=1
+    assert encode_query("용출 시험 용출") == (sorted([term_id("용출"), term_id("시험")]), [1.0, 1.0])
+
+def test_fused_search_recovers_exact_term_hits():
+    from qdrant_client import QdrantClient, models
+    from ctdmate.rag.sparse import SPARSE_VECTOR_NAME, encode_document
+
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        "c",
+        vectors_config=models.VectorParams(size=2, distance=models.Distance.COSINE),
+        sparse_vectors_config={SPARSE_VECTOR_NAME: models.SparseVectorParams(modifier=models.Modifier.IDF)},
+    )
+    docs = {
+        1: ("general stability guidance", [1.0, 0.0]),
+        2: ("storage conditions overview", [0.9, 0.1]),
+        3: ("photostability Q1B exact term", [0.0, 1.0]),   # dense 로는 가장 먼 문서
+    }
+    points = []
+    for i, (t, v) in docs.items():
+        idx, vals = encode_document(t)
+        points.append(models.PointStruct(
+            id=i, payload={"text": t},
+            vector={"": v, SPARSE_VECTOR_NAME: models.SparseVector(indices=idx, values=vals)},
+        ))
+    client.upsert("c", points=points)
+
+    r = _retriever([1.0, 0.0])
+    r.client, r.collection, r.payload_key = client, "c", "text"
+    r.use_sparse, r.use_bm25 = True, False
+
+    dense_only = r._search_fused("", k=2, fetch_k=2, alpha=1.0)
+    assert [d["content"] for d in dense_only] == ["general stability guidance", "storage conditions overview"]
+
+    hits = r.search_hybrid("Q1B photostability", k=2, fetch_k=2, alpha=0.5, with_vectors=True)
+    assert "photostability Q1B exact term" in [d["content"] for d in hits]
+    assert all(len(d["vector"]) == 2 for d in hits)
@@ -23,3 +23,42 @@ def test_router_llama_override():
     assert plan["action"] == "generate"
     assert plan["section"] == "M2.7"
     assert plan["output_format"] == "yaml"
+
+class CountingLlama(NoopLlama):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+        self.warmed = []
+    def chat(self, system: str, user: str) -> str:
+        self.calls += 1
+        return super().chat(system, user)
+    def warm(self, system: str) -> None:
+        self.warmed.append(system)
+    def close(self) -> None:
+        self.closed = True
+
+def test_fast_path_skips_llm_for_unambiguous_requests():
+    llama = CountingLlama()
+    r = Router(llama=llama)
+    plan = r.decide("M2.6 비임상 요약 작성 요청")
+    assert plan["section"] == "M2.6" and plan["need_generate"] is True
+    assert llama.calls == 0
+    r.decide("M2.3 과 M2.7 검증")      # 섹션 둘 → 모호
+    r.decide("이거 좀 봐줘")            # 의도/섹션 없음
+    assert llama.calls == 2
+    assert r.stats == {"heuristic": 1, "llm": 2}
+
+def test_decide_batch_uses_worker_pool():
+    from ctdmate.brain.llama_client import LlamaWorkerPool
+    workers = []
+    pool = LlamaWorkerPool(size=2, factory=lambda: workers.append(CountingLlama()) or workers[-1], warm_prompts=("SYS",))
+    assert [w.warmed for w in workers] == [["SYS"], ["SYS"]]
+
+    r = Router(llama=pool)
+    descs = ["M2.3 QOS 검증", "아무 설명", "무엇을 할까", "M1 라벨 작성"]
+    plans = r.decide_batch(descs)
+    assert [p["section"] for p in plans] == ["M2.3", "M2.7", "M2.7", "M1"]
+    assert sum(w.calls for w in workers) == 2
+    assert r.stats == {"heuristic": 2, "llm": 2}
+    pool.close()
+    assert all(getattr(w, "closed", False) for w in workers) and pool.workers == []
@@ -0,0 +1,94 @@
+# ctdmate/tests/test_smartdoc.py
+from __future__ import annotations
+import json
+import threading
+import time
+from types import SimpleNamespace
+import openpyxl
+from ctdmate.tools import smartdoc_upstage as SD
+
+class StubLoader:
+    def __init__(self, delay=0.05):
+        self.calls = []
+        self.active = self.peak = 0
+        self.delay = delay
+        self.lock = threading.Lock()
+    def __call__(self, path, split):
+        with self.lock:
+            self.calls.append((path.name, split))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)   # 원격 파싱 대기
+        with self.lock:
+            self.active -= 1
+        return [SimpleNamespace(page_content=f"# {path.stem} p{i}\nbody {i}") for i in (1, 2)]
+
+def _setup(monkeypatch, tmp_path):
+    loader = StubLoader()
+    monkeypatch.setattr(SD, "_parse_with_upstage", loader)
+    monkeypatch.setattr(SD, "_html_to_markdown", lambda html: html)
+    monkeypatch.setattr(SD, "OUTPUT_MD_DIR", tmp_path / "md")
+    monkeypatch.setattr(SD, "OUTPUT_RAG_DIR", tmp_path / "rag")
+    monkeypatch.setattr(SD, "PARSE_CACHE_DIR", tmp_path / "cache")
+    return loader
+
+def test_run_parses_concurrently_and_caches(monkeypatch, tmp_path):
+    loader = _setup(monkeypatch, tmp_path)
+    pdfs = []
+    for i in range(4):
+        p = tmp_path / f"doc{i}.pdf"
+        p.write_bytes(f"%PDF fake {i}".encode())
+        pdfs.append(str(p))
+
+    out = SD.run(pdfs + [str(tmp_path / "missing.pdf")], workers=4)
+    assert not out["ok"] and out["errors"][0]["input"].endswith("missing.pdf")
+    assert [r["input"] for r in out["results"]] == pdfs
+    assert loader.peak > 1
+    res = out["results"][0]
+    assert res["pages"] == 2 and res["chunks"] == 2
+    assert (tmp_path / "md" / "doc0.md").read_text(encoding="utf-8") == "# doc0 p1\nbody 1\n\n---\n\n# doc0 p2\nbody 2"
+    rows = [json.loads(l) for l in open(res["rag_jsonl"], encoding="utf-8")]
+    assert [r["metadata"]["page"] for r in rows] == [1, 2]
+    assert rows[0]["text"] == "# doc0 p1 body 1"
+
+    # 변경 없는 파일은 원격 호출 없음, 바뀐 파일만 다시 파싱
+    n = len(loader.calls)
+    SD.run(pdfs)
+    assert len(loader.calls) == n
+    (tmp_path / "doc1.pdf").write_bytes(b"%PDF changed")
+    SD.run(pdfs)
+    assert loader.calls[n:] == [("doc1.pdf", "page")]
+
+def test_xlsx_uses_local_sheet_chunks(monkeypatch, tmp_path):
+    loader = _setup(monkeypatch, tmp_path)
+    wb = openpyxl.Workbook()
+    wb.active.title = "Batch"
+    wb.active.append(["Lot", "Assay"])
+    wb.active.append(["A1", 99.5])
+    path = tmp_path / "batch.xlsx"
+    wb.save(path)
+
+    res = SD.run([str(path)])["results"][0]
+    assert loader.calls == [("batch.xlsx", "sheet")]
+    assert res["pages"] == 2 and res["chunks"] == 1
+    row = json.loads(open(res["rag_jsonl"], encoding="utf-8").read())
+    assert row["metadata"]["sheet_name"] == "Batch"
+    assert row["text"] == "# Sheet: Batch | Lot | Assay | | --- | --- | | A1 | 99.5 |"
+
+def test_same_stem_in_different_dirs_gets_separate_outputs(monkeypatch, tmp_path):
+    loader = _setup(monkeypatch, tmp_path)
+    paths = []
+    for d in ("a", "b"):
+        (tmp_path / d).mkdir()
+        p = tmp_path / d / "report.pdf"
+        p.write_bytes(f"%PDF {d}".encode())
+        paths.append(str(p))
+
+    out = SD.run(paths + [paths[0]], workers=3)
+    assert out["ok"] and len(loader.calls) == 2
+    md_files = [r["markdown"] for r in out["results"]]
+    assert md_files[0] != md_files[1] and md_files[0] == md_files[2]
+    for r in out["results"][:2]:
+        rows = [json.loads(l) for l in open(r["rag_jsonl"], encoding="utf-8")]
+        assert len(rows) == 2
+
@@ -0,0 +1,49 @@
+# ctdmate/tests/test_term_normalizer.py
+from __future__ import annotations
+import re
+import pytest
+from ctdmate.rag import term_normalizer as T
+
+CANONICAL = {"tab": "tablet", "tabs": "tablet", "p.o.": "oral", "po": "oral", "i.v.": "intravenous", "정제": "tablet"}
+
+@pytest.fixture
+def rules(monkeypatch):
+    monkeypatch.setattr(T, "_RULES", {"terms": []})
+    monkeypatch.setattr(T, "_CANONICAL", dict(CANONICAL))
+    monkeypatch.setattr(T, "_MATCHER", T._compile_matcher(CANONICAL))
+
+def _per_pattern_reference(text):
+    # 기존 방식: 동의어마다 정규식 (겹치지 않는 입력에서는 결과가 같아야 함)
+    for syn in sorted(CANONICAL, key=len, reverse=True):
+        text = re.sub(rf"(?<!\w){re.escape(syn)}(?!\w)", CANONICAL[syn], text, flags=re.I)
+    return text
+
+def test_single_pass_matches_word_boundaries(rules):
+    text = "Tab, TABS given P.O. or i.v.; tablets, potion and 정제 stay"
+    assert T.apply_rules(text) == "tablet, tablet given oral or intravenous; tablets, potion and tablet stay"
+    assert T.apply_rules(text) == _per_pattern_reference(text)
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+    def chat(self, system, user):
+        sentence = user.split("\n", 1)[1]
+        self.calls.append(sentence)
+        return sentence.upper()
+
+def test_llm_refines_only_changed_sentences(rules):
+    client = FakeClient()
+    text = "Take one tab daily. No change here.\nGive tab po now. Take one tab daily."
+    out = T.TermNormalizer(client=client).normalize(text)
+    assert client.calls == ["Take one tablet daily.", "Give tablet oral now."]
+    assert out == "TAKE ONE TABLET DAILY. No change here.\nGIVE TABLET ORAL NOW. TAKE ONE TABLET DAILY."
+
+def test_llm_path_matches_synonyms_across_sentence_marks(monkeypatch):
+    canonical = dict(CANONICAL, **{"p.o. q.d.": "oral once daily"})
+    monkeypatch.setattr(T, "_RULES", {"terms": []})
+    monkeypatch.setattr(T, "_CANONICAL", canonical)
+    monkeypatch.setattr(T, "_MATCHER", T._compile_matcher(canonical))
+    client = FakeClient()
+    out = T.TermNormalizer(client=client).normalize("Take one tab p.o. q.d. with food. Unchanged.")
+    assert client.calls == ["Take one tablet oral once daily with food."]
+    assert out == "TAKE ONE TABLET ORAL ONCE DAILY WITH FOOD. Unchanged."
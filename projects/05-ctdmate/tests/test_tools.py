@@ -1,6 +1,9 @@
 # ctdmate/tests/test_tools.py
 from __future__ import annotations
+import threading
+import time
 from pathlib import Path
+import openpyxl
 from ctdmate.tools.yaml_lint import lint_yaml
 from ctdmate.tools.reg_rag import RegulationRAGTool
 
@@ -72,3 +75,54 @@ def test_reg_rag_metrics_present():
     assert "metrics" in res
     assert "coverage" in res
     assert res["validated"] is True
+
+class _FakeSearchTool:
+    def __init__(self):
+        self.primed = []
+        self.lock = threading.Lock()
+    def prime_queries(self, queries):
+        self.primed.append(list(queries))
+    def _hits(self):
+        time.sleep(0.02)
+        return [{"content": "가이드라인", "metadata": {"source": "MFDS", "module": "M2.3"}, "score": 0.9}]
+    def search_by_module(self, query, module, k=5):
+        return self._hits()
+    def search(self, query, k=None):
+        return self._hits()
+    def vector_search(self, query, k=5, where=None):
+        return self._hits()
+
+class _CountingNormalizer:
+    def __init__(self):
+        self.active = self.peak = 0
+        self.lock = threading.Lock()
+    def normalize(self, text):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.02)
+        with self.lock:
+            self.active -= 1
+        return text.replace("TBD", "확정")
+
+def test_validate_excel_parallel_keeps_order_and_bounds_normalizer(tmp_path):
+    sheets = ["TM_5_M2_3_QOS", "TM_5_Phase1", "TM_5_Phase2", "TM_5_Phase3"]
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for name in sheets:
+        wb.create_sheet(name).append([f"{name} 내용입니다", "TBD"])
+    path = tmp_path / "ctd.xlsx"
+    wb.save(path)
+
+    reg = RegulationRAGTool(auto_normalize=False, enable_rag=False, workers=4)
+    reg.enable_rag = True
+    reg.mfds_rag, reg.glossary_rag, reg.combined_retriever = _FakeSearchTool(), _FakeSearchTool(), _FakeSearchTool()
+    reg.normalizer = _CountingNormalizer()
+
+    out = reg.validate_excel(str(path))
+    assert [r["sheet_name"] for r in out["results"]] == sheets
+    assert out["results"][1]["module"] == "M2.7"
+    assert all("확정" in r["normalized_content"] for r in out["results"])
+    assert reg.normalizer.peak == 1                      # CFG.NORMALIZE_MAX_CONCURRENCY 기본값
+    assert len(reg.mfds_rag.primed) == 1 and len(reg.mfds_rag.primed[0]) == 4
+    assert len(reg.combined_retriever.primed[0]) == 8    # ICH(500자) + 용어(300자) 쿼리
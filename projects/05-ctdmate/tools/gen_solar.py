@@ -1,8 +1,9 @@
 # ctdmate/tools/gen_solar.py
 from __future__ import annotations
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
-import os, json, time, re
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator
+import os, json, time, re, hashlib, threading
 
 # config
 try:
@@ -24,8 +25,28 @@ except Exception:
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
 except Exception:
     requests = None  # type: ignore
+    HTTPAdapter = None  # type: ignore
+
+# 프로세스 공용 HTTP 세션 (keep-alive 커넥션 풀 재사용)
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+def _http_session():
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            sess = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=CFG.SOLAR_POOL_SIZE)
+            sess.mount("https://", adapter)
+            sess.mount("http://", adapter)
+            _SESSION = sess
+        return _SESSION
+
+def _sha256(s: str) -> str:
+    return hashlib.sha256((s or "").encode("utf-8")).hexdigest()
 
 def _now_iso() -> str:
     return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
@@ -68,6 +89,27 @@ def _mk_references(cands: List[Dict[str, Any]], top_k: int = 6) -> List[Dict[str
             break
     return refs
 
+def _ref_id(ref: Dict[str, Any]) -> str:
+    # 프롬프트에 실제로 들어가는 근거의 식별자 (문서·페이지·문단 + 스니펫 해시)
+    return f"{ref.get('doc')}|{ref.get('page')}|{ref.get('para_id')}|{_sha256(ref.get('snippet') or '')[:12]}"
+
+def _iter_sse_deltas(resp) -> Iterator[str]:
+    # OpenAI 호환 SSE: data: {...choices[0].delta.content...} / data: [DONE]
+    resp.encoding = "utf-8"
+    for line in resp.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        try:
+            choice = (json.loads(data).get("choices") or [{}])[0]
+        except ValueError:
+            continue
+        delta = (choice.get("delta") or {}).get("content")
+        if delta:
+            yield delta
+
 def _cit_density(text: str) -> float:
     n = len(re.findall(r"\[CIT-\d+\]", text or ""))
     toks = max(1, len(text or "") // 4)
@@ -109,6 +151,11 @@ class SolarGenerator:
         self.glossary: Optional[GlossaryRAGTool] = None
         self.normalizer: Optional[TermNormalizer] = None
 
+        # 응답 캐시: (section, format, prompt 해시, 근거 id, model, temperature) → Solar 원문
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._chat_path: Optional[str] = None   # 성공한 엔드포인트 경로 기억
+
         if enable_rag:
             try:
                 self.mfds_rag = MFDSRAGTool()
@@ -124,8 +171,14 @@ class SolarGenerator:
             except Exception:
                 self.normalizer = None
 
+    def close(self) -> None:
+        # 공용 임베더 참조 반납
+        for tool in (self.mfds_rag, self.glossary):
+            if tool is not None:
+                tool.close()
+
     # --------- Upstage Chat ----------
-    def _solar_chat(self, messages: List[Dict[str, str]]) -> str:
+    def _chat_request(self, messages: List[Dict[str, str]], stream: bool):
         if requests is None:
             raise RuntimeError("requests not installed. pip install requests")
         api_key = CFG.UPSTAGE_API_KEY
@@ -133,26 +186,80 @@ class SolarGenerator:
             raise RuntimeError("UPSTAGE_API_KEY is not set")
 
         base = CFG.UPSTAGE_API_BASE.rstrip("/")
-        paths = [CFG.UPSTAGE_CHAT_PATH, "/solar/chat/completions"]
+        paths = [self._chat_path] if self._chat_path else list(dict.fromkeys([CFG.UPSTAGE_CHAT_PATH, "/solar/chat/completions"]))
         headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-        payload = {"model": self.model, "messages": messages, "temperature": self.temperature, "stream": False}
+        payload = {"model": self.model, "messages": messages, "temperature": self.temperature, "stream": stream}
 
         last_err = None
         for p in paths:
             try:
-                url = f"{base}{p}"
-                resp = requests.post(url, headers=headers, json=payload, timeout=90)
+                resp = _http_session().post(
+                    f"{base}{p}", headers=headers, json=payload, stream=stream,
+                    timeout=(CFG.SOLAR_CONNECT_TIMEOUT, CFG.SOLAR_READ_TIMEOUT),
+                )
                 if resp.status_code == 404:
+                    resp.close()
                     last_err = f"404 at {p}"
                     continue
                 resp.raise_for_status()
-                data = resp.json()
-                return data["choices"][0]["message"]["content"]
+                self._chat_path = p
+                return resp
             except Exception as e:
                 last_err = str(e)
                 continue
         raise RuntimeError(f"Solar chat API failed: {last_err}")
 
+    def _solar_chat(self, messages: List[Dict[str, str]]) -> str:
+        resp = self._chat_request(messages, stream=False)
+        return resp.json()["choices"][0]["message"]["content"]
+
+    def _solar_chat_stream(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        resp = self._chat_request(messages, stream=True)
+        try:
+            yield from _iter_sse_deltas(resp)
+        finally:
+            resp.close()
+
+    # --------- 응답 캐시 ----------
+    def _cache_key(self, section: str, want_yaml: bool, prompt: str, ctx: List[Dict[str, Any]]) -> str:
+        refs = _mk_references(ctx, top_k=self.max_refs)
+        return _sha256(json.dumps({
+            "section": section,
+            "format": "yaml" if want_yaml else "markdown",
+            "prompt": _sha256(prompt),
+            "refs": [_ref_id(r) for r in refs],
+            "model": self.model,
+            "temperature": self.temperature,
+        }, sort_keys=True))
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        with self._cache_lock:
+            text = self._cache.get(key)
+            if text is not None:
+                self._cache.move_to_end(key)
+                return text
+        if CFG.SOLAR_CACHE_DIR:
+            path = Path(CFG.SOLAR_CACHE_DIR) / f"{key}.txt"
+            if path.exists():
+                text = path.read_text(encoding="utf-8")
+                self._cache_put(key, text, persist=False)
+                return text
+        return None
+
+    def _cache_put(self, key: str, text: str, persist: bool = True) -> None:
+        if CFG.SOLAR_CACHE_SIZE > 0:
+            with self._cache_lock:
+                self._cache[key] = text
+                self._cache.move_to_end(key)
+                while len(self._cache) > CFG.SOLAR_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        if persist and CFG.SOLAR_CACHE_DIR:
+            d = Path(CFG.SOLAR_CACHE_DIR)
+            d.mkdir(parents=True, exist_ok=True)
+            tmp = d / f"{key}.{os.getpid()}.tmp"
+            tmp.write_text(text, encoding="utf-8")
+            tmp.replace(d / f"{key}.txt")
+
     # --------- RAG ----------
     def _retrieve(self, section: str, query: str, k: int = 6) -> List[Dict[str, Any]]:
         if not (self.enable_rag and self.mfds_rag):
@@ -235,24 +342,85 @@ class SolarGenerator:
         ]
 
     # --------- 생성 ----------
-    def generate(self, section: str, prompt: str, output_format: Optional[str] = None, csv_present: Optional[Any] = None) -> Dict[str, Any]:
+    def generate(
+        self,
+        section: str,
+        prompt: str,
+        output_format: Optional[str] = None,
+        csv_present: Optional[Any] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        섹션 생성. on_token 이 주어지면 Solar 스트리밍으로 토큰(원문 조각)을 도착 즉시 전달한다.
+        최종 text 는 정규화·펜스 보정을 거친 값이라 스트리밍 원문과 다를 수 있다.
+        """
+        result: Dict[str, Any] = {}
+        for ev in self.generate_stream(section, prompt, output_format, csv_present, stream=on_token is not None):
+            if ev["type"] == "token":
+                if on_token:
+                    on_token(ev["text"])
+            else:
+                result = ev["result"]
+        return result
+
+    def generate_stream(
+        self,
+        section: str,
+        prompt: str,
+        output_format: Optional[str] = None,
+        csv_present: Optional[Any] = None,
+        stream: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        이벤트 제너레이터: {"type": "token", "text": str}* → {"type": "result", "result": {...}}
+        캐시 히트면 원문 전체를 token 1건으로 즉시 보낸다.
+        """
         section = _normalize_section(section)
         want_yaml = (output_format or self.output_format).lower() == "yaml"
 
         ctx = self._retrieve(section, prompt, k=self.max_refs)
+        key = self._cache_key(section, want_yaml, prompt, ctx)
 
         offline_reason = None
-        try:
-            msgs = self._build_messages(section, prompt, ctx, want_yaml=want_yaml)
-            text = self._solar_chat(msgs)
-        except Exception as e:
-            offline_reason = str(e)
-            if want_yaml:
-                import yaml
-                text = "```yaml\n" + yaml.safe_dump({"NEED_INPUT": True, "References": []}, allow_unicode=True, sort_keys=False) + "\n```"
-            else:
-                text = f"### {section} Draft\n\n- NEED_INPUT\n\n## References\n- (none)"
+        text = self._cache_get(key)
+        cache_hit = text is not None
+        if cache_hit:
+            yield {"type": "token", "text": text}
+        else:
+            parts: List[str] = []
+            try:
+                msgs = self._build_messages(section, prompt, ctx, want_yaml=want_yaml)
+                if stream:
+                    for delta in self._solar_chat_stream(msgs):
+                        parts.append(delta)
+                        yield {"type": "token", "text": delta}
+                    text = "".join(parts)
+                else:
+                    text = self._solar_chat(msgs)
+                if text.strip():
+                    self._cache_put(key, text)
+            except Exception as e:
+                offline_reason = str(e)
+                if want_yaml:
+                    import yaml
+                    text = "```yaml\n" + yaml.safe_dump({"NEED_INPUT": True, "References": []}, allow_unicode=True, sort_keys=False) + "\n```"
+                else:
+                    text = f"### {section} Draft\n\n- NEED_INPUT\n\n## References\n- (none)"
+
+        yield {
+            "type": "result",
+            "result": self._finalize(section, want_yaml, ctx, text, offline_reason, csv_present) | {"cache_hit": cache_hit},
+        }
 
+    def _finalize(
+        self,
+        section: str,
+        want_yaml: bool,
+        ctx: List[Dict[str, Any]],
+        text: str,
+        offline_reason: Optional[str],
+        csv_present: Optional[Any],
+    ) -> Dict[str, Any]:
         text = text.strip()
 
         # 용어 정규화
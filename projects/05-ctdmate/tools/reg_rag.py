@@ -1,8 +1,10 @@
 # ctdmate/tools/reg_rag.py
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import re
+import threading
 import openpyxl
 
 # config
@@ -42,6 +44,8 @@ class RegulationRAGTool:
     """
     규제 검증·정규화·근거 반환.
     임계값 근거: CFG.COVERAGE_MIN, CFG.RAG_CONF_MIN, CFG.VIO_MAX, CFG.GENERATE_GATE
+    validate_excel: 시트별 검증을 workers 개 스레드로 병렬 수행, LLaMA 정규화 동시 실행 수는
+    CFG.NORMALIZE_MAX_CONCURRENCY 로 제한
     """
 
     def __init__(
@@ -51,12 +55,15 @@ class RegulationRAGTool:
         coverage_threshold: Optional[float] = None,
         enable_rag: bool = True,
         llama_client=None,
+        workers: Optional[int] = None,
     ):
         self.auto_normalize = auto_normalize
         self.max_violations = max_violations if max_violations is not None else CFG.VIO_MAX
         self.coverage_threshold = coverage_threshold if coverage_threshold is not None else CFG.COVERAGE_MIN
         self.enable_rag = enable_rag
         self.llama_client = llama_client
+        self.workers = max(1, int(workers or CFG.VALIDATE_WORKERS))
+        self._normalize_slots = threading.BoundedSemaphore(max(1, CFG.NORMALIZE_MAX_CONCURRENCY))
 
         self.mfds_rag: Optional[MFDSRAGTool] = None
         self.glossary_rag: Optional[GlossaryRAGTool] = None
@@ -82,13 +89,16 @@ class RegulationRAGTool:
             except Exception:
                 self.normalizer = None
 
+    def close(self) -> None:
+        # 공용 임베더 참조 반납
+        for tool in (self.mfds_rag, self.glossary_rag, self.combined_retriever):
+            if tool is not None:
+                tool.close()
+
     # -------- Excel 전체 검증 --------
     def validate_excel(self, excel_path: str, auto_fix: bool = True) -> Dict[str, Any]:
         wb = openpyxl.load_workbook(excel_path, data_only=True)
-        results: List[Dict[str, Any]] = []
-        total_violations = 0
-        total_coverage = 0.0
-
+        sheets: List[Tuple[str, str, str]] = []
         for sheet_name in wb.sheetnames:
             module = _normalize_section(SHEET_TO_MODULE.get(sheet_name, ""))
             if not module:
@@ -98,14 +108,27 @@ class RegulationRAGTool:
             content = self._extract_sheet_content(ws)
             if len(content) < 10:
                 continue
+            sheets.append((sheet_name, module, content))
+
+        # 모든 시트의 검색 쿼리를 먼저 배치 임베딩 → 시트별 검색은 쿼리 캐시 히트
+        self._prime_queries([content for _, _, content in sheets])
 
+        def _validate_sheet(item: Tuple[str, str, str]) -> Dict[str, Any]:
+            sheet_name, module, content = item
             r = self.validate_and_normalize(section=module, content=content, auto_fix=auto_fix)
             r["sheet_name"] = sheet_name
             r["module"] = module
-            results.append(r)
+            return r
 
-            total_violations += len(r["violations"])
-            total_coverage += r["coverage"]
+        n_workers = min(self.workers, len(sheets))
+        if n_workers <= 1:
+            results = [_validate_sheet(item) for item in sheets]
+        else:
+            with ThreadPoolExecutor(max_workers=n_workers) as pool:
+                results = list(pool.map(_validate_sheet, sheets))   # 시트 순서 유지
+
+        total_violations = sum(len(r["violations"]) for r in results)
+        total_coverage = sum(r["coverage"] for r in results)
 
         validated_count = len(results)
         pass_count = sum(1 for r in results if r["pass"])
@@ -120,6 +143,23 @@ class RegulationRAGTool:
             },
         }
 
+    def _prime_queries(self, contents: List[str]) -> None:
+        # validate_and_normalize 가 도구별로 던질 쿼리와 같은 문자열 (절단 길이 일치)
+        if not self.enable_rag or not contents:
+            return
+        plans = (
+            (self.mfds_rag, [c[:500] for c in contents]),
+            (self.combined_retriever, [c[:500] for c in contents] + [c[:300] for c in contents]),
+            (self.glossary_rag, [c[:120] for c in contents]),
+        )
+        for tool, queries in plans:
+            if tool is None:
+                continue
+            try:
+                tool.prime_queries(queries)
+            except Exception:
+                pass   # 실패 시 시트별 검색이 각자 임베딩
+
     def _extract_sheet_content(self, ws) -> str:
         lines = []
         for row in ws.iter_rows(values_only=True):
@@ -148,7 +188,8 @@ class RegulationRAGTool:
         normalized_content = content
         if auto_fix and violations and self.normalizer:
             try:
-                normalized_content = self._normalize_content(content, violations)
+                with self._normalize_slots:   # LLaMA 동시 호출 제한
+                    normalized_content = self._normalize_content(content, violations)
             except Exception:
                 normalized_content = content
 
@@ -1,12 +1,19 @@
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 import hashlib
+import tempfile
 import time
 import json
 import re
 import openpyxl
 
+try:
+    from ctdmate.app import config as CFG
+except Exception:
+    from ..app import config as CFG  # type: ignore
+
 # ===== 고정 설정 =====
 OUTPUT_MD_DIR = Path("./out/md")
 OUTPUT_RAG_DIR = Path("./out/rag")
@@ -14,6 +21,7 @@ SUPPORTED_EXTS = {".xlsx", ".pdf"}
 PDF_SPLIT_MODE = "page"        # PDF는 페이지 단위 파싱
 RAG_MAX_CHARS = 1600           # 헤딩-세그먼트 2차 분할 길이
 RAG_OVERLAP = 200
+PARSE_CACHE_DIR = Path(CFG.PARSE_CACHE_DIR)   # Upstage HTML 캐시 (파일 SHA-256 단위)
 
 # ========== 유틸 ==========
 def _ensure_dirs(*dirs: Path):
@@ -34,6 +42,13 @@ def _sha256(s: str | bytes) -> str:
 def _now_iso() -> str:
     return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
+def _file_sha256(p: Path) -> str:
+    h = hashlib.sha256()
+    with p.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
 def _approx_tokens(text: str) -> int:
     return max(1, int(len(text) / 4))
 
@@ -49,6 +64,27 @@ def _parse_with_upstage(path: Path, split: str):
     loader = UpstageDocumentParseLoader(str(path), split=split)
     return loader.load()
 
+def _load_pages_html(path: Path, split: str, use_cache: bool = True) -> List[str]:
+    """
+    Upstage 파싱 결과(페이지/시트별 HTML). 파일 내용 SHA-256 + split 으로 디스크 캐시 →
+    변경 없는 파일 재파싱은 원격 호출 없이 끝난다.
+    """
+    cache_path = PARSE_CACHE_DIR / f"{_file_sha256(path)}.{split}.json"
+    if use_cache and cache_path.exists():
+        try:
+            return json.loads(cache_path.read_text(encoding="utf-8"))
+        except Exception:
+            pass   # 손상된 캐시 → 다시 파싱
+    pages = [d.page_content or "" for d in _parse_with_upstage(path, split=split)]
+    if use_cache:
+        _ensure_dirs(PARSE_CACHE_DIR)
+        # 스레드/프로세스마다 고유한 임시 파일 → 동시 실행 시에도 반쯤 쓴 캐시를 읽지 않도록
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=PARSE_CACHE_DIR,
+                                         suffix=".tmp", delete=False) as f:
+            f.write(json.dumps(pages, ensure_ascii=False))
+        Path(f.name).replace(cache_path)
+    return pages
+
 # ========== Markdown → RAG 청크(헤딩 기반) ==========
 HEADING_RX = re.compile(r"(?m)^(#{1,6})\s+(.*)$")
 
@@ -123,105 +159,136 @@ def _ws_to_markdown(ws) -> str:
         md.append("| " + " | ".join(r) + " |")
     return "\n".join(md)
 
-def xlsx_to_sheet_chunks(source_path: str) -> list[dict]:
-    wb = openpyxl.load_workbook(source_path, data_only=True)
-    items = []
-    for idx, name in enumerate(wb.sheetnames):
-        ws = wb[name]
-        text = _ws_to_markdown(ws).strip()
-        if not text:
-            continue
-        chunk_id = f"{Path(source_path).stem}::sheet::{idx}"
-        items.append({
-            "id": _sha256(source_path + chunk_id + text)[:16],
-            "text": text,
-            "metadata": {
-                "source": source_path,
-                "file_name": Path(source_path).stem,
-                "sheet_name": name,
-                "sheet_index": idx,
-                "created_at": _now_iso(),
-                "char_len": len(text),
-                "approx_tokens": _approx_tokens(text),
+def iter_xlsx_sheet_chunks(source_path: str) -> Iterator[dict]:
+    wb = openpyxl.load_workbook(source_path, data_only=True, read_only=True)
+    try:
+        for idx, name in enumerate(wb.sheetnames):
+            ws = wb[name]
+            text = _ws_to_markdown(ws).strip()
+            if not text:
+                continue
+            chunk_id = f"{Path(source_path).stem}::sheet::{idx}"
+            yield {
+                "id": _sha256(source_path + chunk_id + text)[:16],
+                "text": text,
+                "metadata": {
+                    "source": source_path,
+                    "file_name": Path(source_path).stem,
+                    "sheet_name": name,
+                    "sheet_index": idx,
+                    "created_at": _now_iso(),
+                    "char_len": len(text),
+                    "approx_tokens": _approx_tokens(text),
+                }
             }
-        })
-    return items
+    finally:
+        wb.close()
+
+def xlsx_to_sheet_chunks(source_path: str) -> list[dict]:
+    return list(iter_xlsx_sheet_chunks(source_path))
 
 # ========== 메인 파이프라인 ==========
-def run(inputs: List[str]) -> dict:
+_WS_RX = re.compile(r"\s{2,}")
+
+def _write_chunk(f, item: dict) -> None:
+    # 표 파이프 보존. 줄바꿈만 공백화하고 다중 공백만 축소.
+    text = " ".join((item["text"] or "").splitlines())
+    item["text"] = _WS_RX.sub(" ", text).strip()
+    f.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+def _output_names(paths: List[Path]) -> List[str]:
+    """입력별 출력 파일 이름(확장자 제외). 다른 경로의 같은 stem 은 경로 해시를 붙여 구분 (동시 기록 방지)."""
+    by_stem: Dict[str, set] = {}
+    for p in paths:
+        by_stem.setdefault(p.stem, set()).add(str(p.resolve()))
+    names = []
+    for p in paths:
+        if len(by_stem[p.stem]) > 1:
+            names.append(f"{p.stem}-{hashlib.sha256(str(p.resolve()).encode('utf-8')).hexdigest()[:8]}")
+        else:
+            names.append(p.stem)
+    return names
+
+def _parse_one(src: Path, use_cache: bool = True, out_name: Optional[str] = None) -> Dict[str, Any]:
+    """파일 1개 → MD + JSONL. 페이지/청크는 만들어지는 대로 파일에 기록 (문서 전체를 메모리에 두지 않음)."""
+    _validate_input(src)
+    out_name = out_name or src.stem
+    md_path = OUTPUT_MD_DIR / f"{out_name}.md"
+    rag_path = OUTPUT_RAG_DIR / f"{out_name}.jsonl"
+    is_xlsx = src.suffix.lower() == ".xlsx"
+    # (A) 엑셀: JSONL은 로컬 "시트 1청크", MD는 Upstage 시트 단위 파싱
+    # (B) PDF: 페이지 단위 파싱 → MD → 헤딩 기반 청크
+    pages_html = _load_pages_html(src, split="sheet" if is_xlsx else PDF_SPLIT_MODE, use_cache=use_cache)
+
+    n_pages = n_chunks = 0
+    with md_path.open("w", encoding="utf-8") as md_f, rag_path.open("w", encoding="utf-8") as rag_f:
+        for i, html in enumerate(pages_html, 1):
+            md_page = _html_to_markdown(html)
+            if n_pages:
+                md_f.write("\n\n---\n\n")
+            md_f.write(md_page)
+            n_pages += 1
+            if is_xlsx:
+                continue
+            for item in chunk_markdown_for_rag(md=md_page, source_path=str(src), file_stem=src.stem, page_hint=i):
+                _write_chunk(rag_f, item)
+                n_chunks += 1
+        if is_xlsx:
+            for item in iter_xlsx_sheet_chunks(str(src)):
+                _write_chunk(rag_f, item)
+                n_chunks += 1
+
+    return {
+        "input": str(src),
+        "markdown": str(md_path),
+        "rag_jsonl": str(rag_path),
+        "pages": n_pages,
+        "chunks": n_chunks,
+    }
+
+def run(inputs: List[str], workers: Optional[int] = None, use_cache: bool = True) -> dict:
+    """
+    입력 파일들을 bounded 스레드 풀로 동시에 파싱 (원격 파싱 대기가 대부분이라 스레드로 충분).
+    결과/에러 순서는 입력 순서를 따른다. 같은 파일이 여러 번 주어지면 한 번만 파싱한다.
+    """
     _ensure_dirs(OUTPUT_MD_DIR, OUTPUT_RAG_DIR)
 
     results: List[Dict[str, Any]] = []
     errors: List[Dict[str, Any]] = []
+    if not inputs:
+        return {"ok": True, "results": results, "errors": errors}
 
-    for raw in inputs:
-        try:
-            src = Path(raw)
-            _validate_input(src)
-
-            md_pages: List[str] = []
-            rag_items: List[dict] = []
-
-            if src.suffix.lower() == ".xlsx":
-                # (A) 엑셀: JSONL은 "시트 1청크"
-                rag_items = xlsx_to_sheet_chunks(str(src))
-                # MD는 Upstage 파서로 시트 단위 파싱
-                docs = _parse_with_upstage(src, split="sheet")
-                for d in docs:
-                    md_pages.append(_html_to_markdown(d.page_content or ""))
-            else:
-                # (B) PDF: 페이지 단위 파싱 → MD → 헤딩 기반 청크
-                docs = _parse_with_upstage(src, split=PDF_SPLIT_MODE)
-                for i, d in enumerate(docs, 1):
-                    md_page = _html_to_markdown(d.page_content or "")
-                    md_pages.append(md_page)
-                    rag_items.extend(
-                        chunk_markdown_for_rag(
-                            md=md_page,
-                            source_path=str(src),
-                            file_stem=src.stem,
-                            page_hint=i
-                        )
-                    )
-
-            # MD 저장
-            merged_md = "\n\n---\n\n".join(md_pages) if md_pages else ""
-            md_path = OUTPUT_MD_DIR / f"{src.stem}.md"
-            md_path.write_text(merged_md, encoding="utf-8")
-
-            # JSONL 저장
-            rag_path = OUTPUT_RAG_DIR / f"{src.stem}.jsonl"
-            with rag_path.open("w", encoding="utf-8") as f:
-                for item in rag_items:
-                    # 표 파이프 보존. 줄바꿈만 공백화하고 다중 공백만 축소.
-                    text = " ".join((item["text"] or "").splitlines())
-                    text = re.sub(r"\s{2,}", " ", text)
-                    item["text"] = text.strip()
-                    f.write(json.dumps(item, ensure_ascii=False) + "\n")
-
-            results.append({
-                "input": str(src),
-                "markdown": str(md_path),
-                "rag_jsonl": str(rag_path),
-                "pages": len(md_pages),
-            })
-
-        except Exception as e:
-            errors.append({"input": raw, "error": str(e)})
+    n_workers = max(1, min(int(workers or CFG.PARSE_WORKERS), len(inputs)))
+    paths = [Path(raw) for raw in inputs]
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        by_path: Dict[str, Any] = {}
+        futures = []
+        for raw, p, name in zip(inputs, paths, _output_names(paths)):
+            key = str(p.resolve())
+            if key not in by_path:
+                by_path[key] = pool.submit(_parse_one, p, use_cache, name)
+            futures.append((raw, by_path[key]))
+        for raw, fut in futures:
+            try:
+                results.append(fut.result())
+            except Exception as e:
+                errors.append({"input": raw, "error": str(e)})
 
     return {"ok": len(errors) == 0, "results": results, "errors": errors}
 
 # ========== CLI ==========
 if __name__ == "__main__":
-    import argparse, os, json
+    import argparse, os
     parser = argparse.ArgumentParser(
         description="Parse .xlsx/.pdf to Markdown and JSONL (xlsx→sheet chunks, pdf→heading chunks)."
     )
     parser.add_argument("inputs", nargs="+", help="Paths to .xlsx or .pdf files")
+    parser.add_argument("--workers", type=int, default=CFG.PARSE_WORKERS, help="Files parsed concurrently")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the Upstage parse cache")
     args = parser.parse_args()
 
     if not os.environ.get("UPSTAGE_API_KEY"):
         raise SystemExit("❌ Set environment variable UPSTAGE_API_KEY first.")
 
-    res = run(args.inputs)
+    res = run(args.inputs, workers=args.workers, use_cache=not args.no_cache)
     print(json.dumps(res, ensure_ascii=False))
\ No newline at end of file